@@ -0,0 +1,572 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import chdir
+from tempfile import TemporaryDirectory
+from datetime import datetime
+from typing import Any, Callable
+from pathlib import Path
+from uuid import UUID, uuid4
+import multiprocessing
+import platform
+import math
+
+from gdm.distribution.components import DistributionVoltageSource
+from gdm.distribution import DistributionSystem
+from pydantic import BaseModel, Field
+from infrasys import Component
+from rich.console import Console
+from rich.table import Table
+from loguru import logger
+import numpy as np
+
+import ditto
+from ditto.readers.opendss.batch import (
+    add_time_series_owners,
+    get_time_series_owners,
+    copy_components,
+)
+from ditto.enumerations import OpenDSSFileTypes
+from ditto.profiling import Profiler, get_peak_rss_mb
+from ditto.readers.opendss.reader import Reader
+from ditto.writers.opendss.write import Writer
+from ditto.synthetic import generate_synthetic_model
+
+
+BENCHMARK_STAGES = ["read", "serialize", "deserialize", "write", "read_back"]
+
+ROUNDTRIP_STAGES = ["read", "write", "read_back"]
+
+DEFAULT_SCALING_COPIES = [2, 4, 8]
+
+
+class BenchmarkCase(BaseModel):
+    """A model to benchmark, optionally replicated to test scaling"""
+
+    name: str
+    reader: str = Field(description="Reader package name")
+    input_file: Path
+    copies: int = Field(1, description="Number of feeder replicas in the benchmarked system")
+    synthetic: bool = Field(
+        False,
+        description="Generate the replicated input with the synthetic model generator, so reading "
+        "the replicated model is benchmarked too",
+    )
+
+    @property
+    def scaling_name(self) -> str:
+        """Name shared by the cases of a scaling series"""
+        return f"{self.name}_synthetic" if self.synthetic else self.name
+
+    @property
+    def label(self) -> str:
+        return self.scaling_name if self.copies == 1 else f"{self.scaling_name}_x{self.copies}"
+
+
+class StageResult(BaseModel):
+    """Measurements of a benchmark stage"""
+
+    wall_time: float = Field(description="Wall time in seconds, best of the repeats")
+    cpu_time: float = Field(description="Process CPU time in seconds, best of the repeats")
+    peak_memory_mb: float | None = Field(
+        None,
+        description="Traced peak memory of the stage, or the growth of the process peak RSS if "
+        "memory is not traced",
+    )
+
+
+class CaseResult(BaseModel):
+    """Benchmark results of a single case"""
+
+    case: BenchmarkCase
+    stages: dict[str, StageResult] = {}
+    component_count: int = 0
+    errors: dict[str, str] = Field({}, description="Error messages of the failed stages")
+
+    @property
+    def roundtrip_time(self) -> float | None:
+        """Wall time of reading the model, writing it to OpenDSS and reading the written model"""
+
+        if not all(stage in self.stages for stage in ROUNDTRIP_STAGES[1:]):
+            return None
+        return sum(
+            self.stages[stage].wall_time for stage in ROUNDTRIP_STAGES if stage in self.stages
+        )
+
+
+class Regression(BaseModel):
+    """Benchmark metric that regressed compared to the baseline"""
+
+    case: str
+    stage: str
+    metric: str
+    baseline: float
+    value: float
+
+    @property
+    def ratio(self) -> float:
+        return self.value / self.baseline if self.baseline else math.inf
+
+
+class BenchmarkReport(BaseModel):
+    """Results of a benchmark run"""
+
+    ditto_version: str = ditto.__version__
+    python_version: str = platform.python_version()
+    platform: str = platform.platform()
+    created: datetime = Field(default_factory=datetime.now)
+    repeat: int = 1
+    trace_memory: bool = False
+    results: list[CaseResult] = []
+
+    def to_json(self, json_file: Path | str):
+        """Exports the report to a json file, e.g. to store it as a baseline
+
+        Args:
+            json_file (Path | str): Export path for the report
+        """
+        Path(json_file).write_text(self.model_dump_json(indent=2))
+
+    @classmethod
+    def from_json(cls, json_file: Path | str) -> "BenchmarkReport":
+        """Loads a report from a json file
+
+        Args:
+            json_file (Path | str): Path to the report
+
+        Returns:
+            BenchmarkReport: Loaded report
+        """
+        return cls.model_validate_json(Path(json_file).read_text())
+
+    def compare(
+        self,
+        baseline: "BenchmarkReport",
+        threshold: float = 0.25,
+        min_time_delta: float = 0.1,
+        min_memory_delta_mb: float = 10.0,
+    ) -> list[Regression]:
+        """Compares the results with a baseline report
+
+        A metric regresses if it exceeds the baseline by more than `threshold` (relative) and by
+        more than the minimum delta, so noise on very short stages is not reported.
+
+        Args:
+            baseline (BenchmarkReport): Baseline report
+            threshold (float, optional): Allowed relative increase. Defaults to 0.25.
+            min_time_delta (float, optional): Allowed wall time increase in seconds. Defaults to 0.1.
+            min_memory_delta_mb (float, optional): Allowed peak memory increase in MB. Defaults to 10.0.
+
+        Returns:
+            list[Regression]: Regressed metrics
+        """
+
+        baseline_results = {result.case.label: result for result in baseline.results}
+        regressions = []
+        for result in self.results:
+            baseline_result = baseline_results.get(result.case.label)
+            if baseline_result is None:
+                continue
+            for stage, stage_result in result.stages.items():
+                baseline_stage = baseline_result.stages.get(stage)
+                if baseline_stage is None:
+                    continue
+                for metric, min_delta in (
+                    ("wall_time", min_time_delta),
+                    ("peak_memory_mb", min_memory_delta_mb),
+                ):
+                    value = getattr(stage_result, metric)
+                    baseline_value = getattr(baseline_stage, metric)
+                    if value is None or baseline_value is None:
+                        continue
+                    if value - baseline_value > max(threshold * baseline_value, min_delta):
+                        regressions.append(
+                            Regression(
+                                case=result.case.label,
+                                stage=stage,
+                                metric=metric,
+                                baseline=baseline_value,
+                                value=value,
+                            )
+                        )
+        return regressions
+
+    def get_scaling_exponents(self) -> dict[tuple[str, str], float]:
+        """Returns the scaling exponent of every stage of the replicated cases
+
+        The exponent is the slope of a log-log fit of the wall time against the number of
+        replicas, 1 means linear scaling and larger values super-linear scaling.
+
+        Returns:
+            dict[tuple[str, str], float]: Exponents keyed by case name and stage
+        """
+
+        timings = {}
+        for result in self.results:
+            for stage, stage_result in result.stages.items():
+                timings.setdefault((result.case.scaling_name, stage), {})[result.case.copies] = (
+                    stage_result.wall_time
+                )
+
+        exponents = {}
+        for key, stage_timings in timings.items():
+            copies = [n for n, wall_time in stage_timings.items() if wall_time > 0]
+            if len(copies) < 2:
+                continue
+            slope, _ = np.polyfit(
+                np.log(copies), np.log([stage_timings[n] for n in copies]), deg=1
+            )
+            exponents[key] = float(slope)
+        return exponents
+
+    def to_table(self) -> Table:
+        """Returns the wall time and peak memory of every case and stage as a rich table"""
+
+        table = Table(title="Benchmark results")
+        table.add_column("Case", style="cyan", no_wrap=True)
+        table.add_column("Components", justify="right")
+        for stage in BENCHMARK_STAGES:
+            table.add_column(f"{stage} s / MB", justify="right", style="green")
+        table.add_column("Roundtrip s", justify="right", style="bright_magenta")
+
+        for result in self.results:
+            cells = []
+            for stage in BENCHMARK_STAGES:
+                stage_result = result.stages.get(stage)
+                if stage_result is None:
+                    cells.append("")
+                    continue
+                memory = (
+                    "-"
+                    if stage_result.peak_memory_mb is None
+                    else f"{stage_result.peak_memory_mb:.0f}"
+                )
+                cells.append(f"{stage_result.wall_time:.2f} / {memory}")
+            roundtrip_time = result.roundtrip_time
+            table.add_row(
+                f"{result.case.label} (failed)" if result.errors else result.case.label,
+                str(result.component_count),
+                *cells,
+                "" if roundtrip_time is None else f"{roundtrip_time:.2f}",
+            )
+        return table
+
+    def print(self, regressions: list[Regression] | None = None):
+        """Prints the results, scaling exponents and regressions to the console"""
+
+        console = Console()
+        console.print(self.to_table())
+        exponents = self.get_scaling_exponents()
+        if exponents:
+            table = Table(title="Scaling exponents (1 is linear)")
+            table.add_column("Case", style="cyan")
+            table.add_column("Stage")
+            table.add_column("Exponent", justify="right", style="bright_magenta")
+            for (name, stage), exponent in exponents.items():
+                table.add_row(name, stage, f"{exponent:.2f}")
+            console.print(table)
+        if regressions:
+            table = Table(title="Regressions")
+            table.add_column("Case", style="cyan")
+            table.add_column("Stage")
+            table.add_column("Metric")
+            table.add_column("Baseline", justify="right")
+            table.add_column("Value", justify="right")
+            table.add_column("Ratio", justify="right", style="bright_red")
+            for regression in regressions:
+                table.add_row(
+                    regression.case,
+                    regression.stage,
+                    regression.metric,
+                    f"{regression.baseline:.2f}",
+                    f"{regression.value:.2f}",
+                    f"{regression.ratio:.2f}",
+                )
+            console.print(table)
+
+
+def get_bundled_cases(data_directory: Path | str = Path("tests") / "data") -> list[BenchmarkCase]:
+    """Returns a benchmark case for every model bundled with the test data
+
+    Args:
+        data_directory (Path | str, optional): Test data folder. Defaults to tests/data.
+
+    Returns:
+        list[BenchmarkCase]: OpenDSS feeders and CIM models
+    """
+
+    # cases are run from a temporary working directory
+    data_directory = Path(data_directory).resolve()
+    cases = [
+        BenchmarkCase(name=master_file.parent.name, reader="opendss", input_file=master_file)
+        for master_file in sorted(
+            (data_directory / "opendss_circuit_models").glob(
+                f"*/{OpenDSSFileTypes.MASTER_FILE.value}"
+            )
+        )
+    ]
+    cases.extend(
+        BenchmarkCase(name=f"cim_{cim_file.stem}", reader="cim_iec_61968_13", input_file=cim_file)
+        for cim_file in sorted((data_directory / "cim_iec_61968_13").glob("*.[xX][mM][lL]"))
+    )
+    return cases
+
+
+def get_scaling_cases(
+    case: BenchmarkCase, copies: list[int] = DEFAULT_SCALING_COPIES, synthetic: bool = False
+) -> list[BenchmarkCase]:
+    """Returns replicated variants of a case
+
+    Args:
+        case (BenchmarkCase): Case to replicate
+        copies (list[int], optional): Numbers of replicas. Defaults to [2, 4, 8].
+        synthetic (bool, optional): Generate the replicated inputs with the synthetic model
+            generator instead of replicating the read system. Defaults to False.
+
+    Returns:
+        list[BenchmarkCase]: Replicated cases
+    """
+
+    return [case.model_copy(update={"copies": n, "synthetic": synthetic}) for n in copies]
+
+
+def _get_source_owned_components(
+    system: DistributionSystem, excluded: list[Component]
+) -> set[UUID]:
+    """Returns the uuids of the excluded components and of the components only referenced by
+    excluded ones"""
+
+    excluded_uuids = {component.uuid for component in excluded}
+    pending = list(excluded)
+    while pending:
+        for child in system.list_child_components(pending.pop()):
+            if child.uuid not in excluded_uuids and all(
+                parent.uuid in excluded_uuids for parent in system.list_parent_components(child)
+            ):
+                excluded_uuids.add(child.uuid)
+                pending.append(child)
+    return excluded_uuids
+
+
+def replicate_system(system: DistributionSystem, copies: int) -> DistributionSystem:
+    """Replicates the feeder of a system, the replicas are connected to the source bus
+
+    Every replica gets its own copy of all components, renamed with a `copy_<n>__` prefix,
+    except for the voltage source and the source bus which are shared. The result is a radial
+    system with `copies` parallel feeders, used to test how the readers and writers scale.
+
+    Args:
+        system (DistributionSystem): System with a single voltage source
+        copies (int): Number of feeders in the replicated system
+
+    Returns:
+        DistributionSystem: Replicated system
+    """
+
+    with TemporaryDirectory() as tmp_directory:
+        json_file = Path(tmp_directory) / "system.json"
+        system.to_json(json_file)
+        replicated_system = DistributionSystem.from_json(json_file)
+        source_bus = replicated_system.get_source_bus()
+
+        for index in range(1, copies):
+            replica = DistributionSystem.from_json(json_file)
+            replica_source_bus = replica.get_source_bus()
+            excluded_uuids = _get_source_owned_components(
+                replica,
+                [replica_source_bus, *replica.get_components(DistributionVoltageSource)],
+            )
+            components = [c for c in replica.iter_all_components() if c.uuid not in excluded_uuids]
+            time_series_owners = get_time_series_owners(replica, components)
+            # replicas are deserialized from the same file, they need their own identity
+            replicas = copy_components(
+                components,
+                lambda c: {
+                    "name": f"copy_{index}__{c.name}" if c.name else c.name,
+                    "uuid": uuid4(),
+                },
+                copies={id(replica_source_bus): source_bus},
+            )
+            for component in components:
+                if not replicated_system.has_component(replicas[id(component)]):
+                    replicated_system.add_component(replicas[id(component)])
+            add_time_series_owners(
+                replicated_system,
+                [
+                    (ts, features, [replicas[id(owner)] for owner in owners])
+                    for ts, features, owners in time_series_owners
+                ],
+            )
+    return replicated_system
+
+
+def _read_system(reader_name: str, input_file: Path) -> DistributionSystem:
+    if reader_name == "opendss":
+        return Reader(input_file).get_system()
+
+    from ditto.readers.cim_iec_61968_13.reader import Reader as CimReader
+
+    reader = CimReader(input_file)
+    reader.read()
+    return reader.get_system()
+
+
+def _run_stage(
+    profiler: Profiler, result: CaseResult, stage: str, function: Callable[[], Any]
+) -> tuple[Any, bool]:
+    """Runs and measures a benchmark stage, failures are recorded in the case result
+
+    Returns:
+        tuple[Any, bool]: Return value of the stage function and whether the stage succeeded
+    """
+
+    peak_rss_mb = get_peak_rss_mb()
+    try:
+        with profiler.stage(stage):
+            value = function()
+    except Exception as e:
+        result.errors[stage] = f"{e.__class__.__name__}: {e}"
+        return None, False
+
+    stage_profile = next(s for s in profiler.get_report().stages if s.name == stage)
+    if profiler.trace_memory:
+        peak_memory_mb = stage_profile.memory_peak_mb
+    elif stage_profile.peak_rss_mb is None or peak_rss_mb is None:
+        peak_memory_mb = None
+    else:
+        peak_memory_mb = stage_profile.peak_rss_mb - peak_rss_mb
+    result.stages[stage] = StageResult(
+        wall_time=stage_profile.wall_time,
+        cpu_time=stage_profile.cpu_time,
+        peak_memory_mb=peak_memory_mb,
+    )
+    return value, True
+
+
+def run_case(case: BenchmarkCase, trace_memory: bool = False) -> CaseResult:
+    """Runs the benchmark stages of a case in the current process
+
+    Replicated cases are built from the model read outside of the benchmark stages, synthetic cases
+    read an input model generated by tiling the seed feeder. The read back stage reads the written
+    model. Stages that depend on a failed stage are skipped.
+
+    Args:
+        case (BenchmarkCase): Case to run
+        trace_memory (bool, optional): Measure the traced peak memory of every stage instead of the
+            process peak RSS growth. Slows down the stages. Defaults to False.
+
+    Returns:
+        CaseResult: Stage measurements and error messages of the failed stages
+    """
+
+    result = CaseResult(case=case)
+    profiler = Profiler(case.label, trace_memory=trace_memory)
+    with TemporaryDirectory() as tmp_directory:
+        tmp_directory = Path(tmp_directory)
+        json_file = tmp_directory / "system.json"
+        output_path = tmp_directory / "opendss"
+        output_path.mkdir()
+        # Opendss changes the working directory and writes some outputs to it, both are
+        # confined to the case directory
+        with chdir(tmp_directory):
+            input_file = case.input_file
+            if case.synthetic and case.copies > 1:
+                input_file, generated = _run_stage(
+                    profiler,
+                    result,
+                    "generate",
+                    lambda: generate_synthetic_model(
+                        case.reader,
+                        case.input_file,
+                        tmp_directory / "synthetic",
+                        copies=case.copies,
+                    ),
+                )
+                if not generated:
+                    return result
+            if case.copies == 1 or case.synthetic:
+                system, read = _run_stage(
+                    profiler, result, "read", lambda: _read_system(case.reader, input_file)
+                )
+            else:
+                system, read = _run_stage(
+                    profiler,
+                    result,
+                    "replicate",
+                    lambda: replicate_system(
+                        _read_system(case.reader, case.input_file), case.copies
+                    ),
+                )
+            if not read:
+                return result
+            result.component_count = sum(1 for _ in system.iter_all_components())
+
+            _, serialized = _run_stage(
+                profiler, result, "serialize", lambda: system.to_json(json_file)
+            )
+            if serialized:
+                _run_stage(
+                    profiler,
+                    result,
+                    "deserialize",
+                    lambda: DistributionSystem.from_json(json_file),
+                )
+            _, written = _run_stage(
+                profiler,
+                result,
+                "write",
+                lambda: Writer(system).write(
+                    output_path, separate_substations=False, separate_feeders=False
+                ),
+            )
+            if written:
+                _run_stage(
+                    profiler,
+                    result,
+                    "read_back",
+                    lambda: Reader(output_path / OpenDSSFileTypes.MASTER_FILE.value).get_system(),
+                )
+    return result
+
+
+def run_benchmarks(
+    cases: list[BenchmarkCase], repeat: int = 1, trace_memory: bool = False
+) -> BenchmarkReport:
+    """Runs every case `repeat` times, each run in a fresh process
+
+    Fresh processes keep the peak RSS of the runs independent and start every run with a clean
+    OpenDSS engine. Wall and CPU times are the best of the repeats, memory the largest peak.
+
+    Args:
+        cases (list[BenchmarkCase]): Cases to run
+        repeat (int, optional): Number of runs per case. Defaults to 1.
+        trace_memory (bool, optional): Measure the traced peak memory of every stage. Defaults to False.
+
+    Returns:
+        BenchmarkReport: Benchmark results
+    """
+
+    report = BenchmarkReport(repeat=repeat, trace_memory=trace_memory)
+    for case in cases:
+        runs = []
+        for _ in range(repeat):
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                runs.append(executor.submit(run_case, case, trace_memory).result())
+
+        result = runs[0]
+        for run in runs[1:]:
+            result.errors.update(run.errors)
+            for stage, stage_result in run.stages.items():
+                best = result.stages.setdefault(stage, stage_result)
+                best.wall_time = min(best.wall_time, stage_result.wall_time)
+                best.cpu_time = min(best.cpu_time, stage_result.cpu_time)
+                if stage_result.peak_memory_mb is not None:
+                    best.peak_memory_mb = max(
+                        best.peak_memory_mb or 0, stage_result.peak_memory_mb
+                    )
+        for stage, error in result.errors.items():
+            logger.error(f"Benchmark {case.label} {stage} failed: {error}")
+        if not result.errors:
+            logger.info(f"Benchmark {case.label} done")
+        report.results.append(result)
+    return report
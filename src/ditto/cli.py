@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 import importlib
+import json
 import pkgutil
 from typing import Optional
 
@@ -31,6 +32,69 @@ def _import_writer(writer_name: str):
     return getattr(module, "Writer")
 
 
+def _get_cache_kwargs(cache_dir: Optional[Path], cache_max_size_mb: Optional[float]) -> dict:
+    if cache_dir is None:
+        return {}
+    return {"cache_directory": cache_dir, "cache_max_size_mb": cache_max_size_mb}
+
+
+def _report_profiles(
+    reader_instance, writer_instance, print_reports: bool, profile_output: Optional[Path]
+) -> None:
+    reports = [
+        instance.get_profile_report()
+        for instance in (reader_instance, writer_instance)
+        if hasattr(instance, "get_profile_report")
+    ]
+    if not reports:
+        logger.warning("The selected reader and writer do not support profiling")
+        return
+    if print_reports:
+        for report in reports:
+            report.print()
+    if profile_output:
+        logger.info(f"Exporting profiling reports to {profile_output}")
+        profile_output.write_text(
+            json.dumps([report.model_dump(mode="json") for report in reports], indent=2)
+        )
+
+
+def _get_reader_kwargs(
+    reader: str,
+    cache_dir: Optional[Path],
+    cache_max_size_mb: Optional[float],
+    profile: bool,
+    query_backend: Optional[str] = None,
+    query_workers: Optional[int] = None,
+) -> dict:
+    reader_kwargs = _get_cache_kwargs(cache_dir, cache_max_size_mb)
+    if reader_kwargs and reader != "opendss":
+        logger.error(f"Reader '{reader}' does not support the parse cache")
+        raise typer.Exit(code=2)
+    if (query_backend is not None or query_workers is not None) and reader != "cim_iec_61968_13":
+        logger.error(f"Reader '{reader}' does not support query backends or workers")
+        raise typer.Exit(code=2)
+    if query_backend is not None:
+        reader_kwargs["query_backend"] = query_backend
+    if query_workers is not None:
+        reader_kwargs["query_workers"] = query_workers
+    if profile and reader == "opendss":
+        reader_kwargs["trace_memory"] = True
+    return reader_kwargs
+
+
+def _get_writer_kwargs(writer: str, profile: bool, write_workers: Optional[int]) -> dict:
+    writer_kwargs = {}
+    if write_workers is not None and writer != "opendss":
+        logger.error(f"Writer '{writer}' does not support worker processes")
+        raise typer.Exit(code=2)
+    if write_workers is not None:
+        writer_kwargs["workers"] = write_workers
+    if profile and writer == "opendss":
+        writer_kwargs["trace_memory"] = True
+    return writer_kwargs
+
+
 @app.command("list-readers")
 def list_readers() -> None:
     """List available reader packages."""
@@ -78,6 +142,27 @@ def convert(
     save_gdm: Optional[Path] = typer.Option(
         None, help="Path to save intermediate GDM/DistributionSystem JSON"
     ),
+    cache_dir: Optional[Path] = typer.Option(
+        None, help="Directory of the parsed system cache (opendss reader only)"
+    ),
+    cache_max_size_mb: Optional[float] = typer.Option(
+        None, help="Maximum size of the parsed system cache in MB, least recently used first out"
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Print per-stage timing and memory profiles of the conversion"
+    ),
+    profile_output: Optional[Path] = typer.Option(
+        None, help="Path to save the profiling reports as JSON"
+    ),
+    write_workers: Optional[int] = typer.Option(
+        None, help="Worker processes mapping the components (opendss writer only)"
+    ),
+    query_backend: Optional[str] = typer.Option(
+        None, help="Query backend, sparql or columnar (cim_iec_61968_13 reader only)"
+    ),
+    query_workers: Optional[int] = typer.Option(
+        None, help="Worker processes running the reader queries (cim_iec_61968_13 reader only)"
+    ),
 ) -> None:
     """Convert from a reader to a writer and optionally save intermediate GDM JSON."""
     try:
@@ -106,8 +191,11 @@ def convert(
         logger.exception("Failed to import reader module.")
         raise typer.Exit(code=2)
 
+    reader_kwargs = _get_reader_kwargs(
+        reader, cache_dir, cache_max_size_mb, profile, query_backend, query_workers
+    )
     logger.info(f"Instantiating reader '{reader}' with input {input}")
-    reader_instance = ReaderClass(input)
+    reader_instance = ReaderClass(input, **reader_kwargs)
 
     if hasattr(reader_instance, "read") and callable(getattr(reader_instance, "read")):
         try:
@@ -128,13 +216,176 @@ def convert(
         logger.exception("Failed to import writer module.")
         raise typer.Exit(code=2)
 
-    writer_instance = WriterClass(system)
+    writer_kwargs = _get_writer_kwargs(writer, profile, write_workers)
+    writer_instance = WriterClass(system, **writer_kwargs)
     output.mkdir(parents=True, exist_ok=True)
     logger.info(f"Running writer '{writer}' -> output: {output}")
     writer_instance.write(output)
 
+    if profile or profile_output:
+        _report_profiles(reader_instance, writer_instance, profile, profile_output)
+
     logger.success("Conversion complete")
 
 
+@app.command("batch-read")
+def batch_read(
+    input: str = typer.Option(..., help="Glob pattern of the Opendss master files to read"),
+    output: Path = typer.Option(Path("."), help="Output folder for the feeder GDM JSON files"),
+    workers: Optional[int] = typer.Option(
+        None, help="Number of worker processes (default: number of CPUs)"
+    ),
+    merge: Optional[Path] = typer.Option(
+        None, help="Path to save a single GDM JSON with all feeders merged"
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None, help="Directory of the parsed system cache (opendss reader only)"
+    ),
+    cache_max_size_mb: Optional[float] = typer.Option(
+        None, help="Maximum size of the parsed system cache in MB, least recently used first out"
+    ),
+) -> None:
+    """Read multiple Opendss feeders in parallel and save their GDM JSON files."""
+    from ditto.readers.opendss.batch import BatchReader
+
+    try:
+        reader_instance = BatchReader(
+            input,
+            workers=workers,
+            export_directory=output,
+            **_get_cache_kwargs(cache_dir, cache_max_size_mb),
+        )
+    except FileNotFoundError:
+        logger.error(f"No Opendss master files match '{input}'")
+        raise typer.Exit(code=2)
+
+    for feeder_name, elapsed in reader_instance.timings.items():
+        status = "failed" if feeder_name in reader_instance.errors else "ok"
+        typer.echo(f"{feeder_name}\t{status}\t{elapsed:.2f}s")
+
+    if merge:
+        logger.info(f"Exporting merged GDM JSON to {merge}")
+        reader_instance.to_json(merge)
+
+    if reader_instance.errors:
+        raise typer.Exit(code=1)
+    logger.success("Batch read complete")
+
+
+@app.command("benchmark")
+def benchmark(
+    data_directory: Path = typer.Option(
+        Path("tests") / "data",
+        exists=True,
+        file_okay=False,
+        help="Test data folder with the bundled models",
+    ),
+    case: list[str] = typer.Option(
+        [], help="Name of a bundled case to run, repeat for more (default: all)"
+    ),
+    scale_case: Optional[list[str]] = typer.Option(
+        None,
+        help="Name of a bundled case to replicate for the scaling cases "
+        "(default: ieee13, none if --case is given)",
+    ),
+    copies: list[int] = typer.Option(
+        [2, 4, 8], help="Number of feeder replicas of the scaling cases, repeat for more"
+    ),
+    synthetic: bool = typer.Option(
+        False,
+        help="Generate the scaling case inputs by tiling the feeder instead of replicating the "
+        "read system, so reading is benchmarked too",
+    ),
+    repeat: int = typer.Option(1, help="Runs per case, the best time is kept"),
+    trace_memory: bool = typer.Option(
+        False, help="Trace the peak memory of every stage instead of the peak RSS growth"
+    ),
+    baseline: Optional[Path] = typer.Option(
+        None, exists=True, help="Baseline report to compare the results with"
+    ),
+    threshold: float = typer.Option(
+        0.25, help="Allowed relative increase of a metric compared to the baseline"
+    ),
+    output: Optional[Path] = typer.Option(
+        None, help="Path to save the report, e.g. as the next baseline"
+    ),
+) -> None:
+    """Benchmark the readers and writers on the bundled models and check for regressions."""
+    from ditto.benchmark import (
+        BenchmarkReport,
+        get_bundled_cases,
+        get_scaling_cases,
+        run_benchmarks,
+    )
+
+    if scale_case is None:
+        scale_case = [] if case else ["ieee13"]
+    bundled_cases = get_bundled_cases(data_directory)
+    cases = [c for c in bundled_cases if not case or c.name in case]
+    for bundled_case in bundled_cases:
+        if bundled_case.name in scale_case:
+            cases.extend(get_scaling_cases(bundled_case, copies, synthetic=synthetic))
+    if not cases:
+        logger.error(f"No benchmark cases selected. Available: {[c.name for c in bundled_cases]}")
+        raise typer.Exit(code=2)
+
+    report = run_benchmarks(cases, repeat=repeat, trace_memory=trace_memory)
+    regressions = []
+    if baseline:
+        regressions = report.compare(BenchmarkReport.from_json(baseline), threshold=threshold)
+    report.print(regressions)
+
+    if output:
+        logger.info(f"Exporting benchmark report to {output}")
+        report.to_json(output)
+    if regressions:
+        logger.error(f"{len(regressions)} benchmark metrics regressed")
+        raise typer.Exit(code=1)
+
+
+@app.command("generate")
+def generate(
+    reader: str = typer.Option(
+        ..., help="Reader package name of the seed feeder (opendss or cim_iec_61968_13)"
+    ),
+    input: Path = typer.Option(
+        ..., exists=True, dir_okay=False, help="OpenDSS master file or CIM XML file of the seed"
+    ),
+    output: Path = typer.Option(..., help="Output folder for the generated model"),
+    copies: Optional[int] = typer.Option(None, help="Number of tiles of the seed feeder"),
+    target_buses: Optional[int] = typer.Option(
+        None, help="Approximate number of buses, used if the number of copies is not set"
+    ),
+    seed: int = typer.Option(0, help="Random seed of the perturbations"),
+    perturbation: float = typer.Option(
+        0.1, help="Maximum relative change of the load powers and line lengths of the tiles"
+    ),
+) -> None:
+    """Generate a large synthetic model by tiling and perturbing a seed feeder."""
+    from ditto.synthetic import SYNTHETIC_READERS, generate_synthetic_model
+
+    if reader not in SYNTHETIC_READERS:
+        logger.error(f"Reader '{reader}' not supported. Available: {SYNTHETIC_READERS}")
+        raise typer.Exit(code=2)
+
+    if copies is None and target_buses is None:
+        logger.error("Either --copies or --target-buses is required")
+        raise typer.Exit(code=2)
+    try:
+        input_file = generate_synthetic_model(
+            reader,
+            input,
+            output,
+            copies=copies,
+            target_buses=target_buses,
+            seed=seed,
+            perturbation=perturbation,
+        )
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(code=2)
+    typer.echo(str(input_file))
+
+
 if __name__ == "__main__":
     app()
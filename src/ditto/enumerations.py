@@ -18,3 +18,22 @@ class OpenDSSFileTypes(str, Enum):
     SWITCH_FILE = "Switches.dss"
     FUSE_FILE = "Fuses.dss"
     REGULATOR_CONTROLLERS_FILE = "RegControllers.dss"
+
+
+class ProfileFormat(str, Enum):
+    TEXT = "text"
+    CSV = "csv"
+    SNG = "sng"
+    DBL = "dbl"
+
+
+class ValidationMode(str, Enum):
+    FULL = "full"
+    SAMPLED = "sampled"
+    DEFERRED = "deferred"
+    OFF = "off"
+
+
+class CimQueryBackend(str, Enum):
+    SPARQL = "sparql"
+    COLUMNAR = "columnar"
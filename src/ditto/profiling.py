@@ -0,0 +1,236 @@
+from dataclasses import dataclass, field
+from contextlib import contextmanager
+from typing import Iterator
+from pathlib import Path
+import tracemalloc
+import time
+import sys
+
+from pydantic import BaseModel, Field
+from rich.console import Console
+from rich.table import Table
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def get_peak_rss_mb() -> float | None:
+    """Returns the peak resident set size of the process in MB, None if not available"""
+
+    if resource is None:
+        return None
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    scale = 1e6 if sys.platform == "darwin" else 1e3
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+class StageProfile(BaseModel):
+    """Measurements of a single profiled stage"""
+
+    name: str
+    wall_time: float = Field(0.0, description="Wall time in seconds")
+    cpu_time: float = Field(0.0, description="Process CPU time in seconds")
+    calls: int = Field(0, description="Number of times the stage was entered")
+    count: int = Field(0, description="Number of elements processed by the stage")
+    memory_peak_mb: float | None = Field(
+        None, description="Peak traced memory above the memory in use when the stage started"
+    )
+    peak_rss_mb: float | None = Field(None, description="Process peak RSS when the stage ended")
+    stages: list["StageProfile"] = []
+
+
+class ProfileReport(BaseModel):
+    """Structured profiling report of a reader or writer run"""
+
+    name: str
+    trace_memory: bool = False
+    stages: list[StageProfile] = []
+
+    def to_json(self, json_file: Path | str):
+        """Exports the report to a json file
+
+        Args:
+            json_file (Path | str): Export path for the report
+        """
+        Path(json_file).write_text(self.model_dump_json(indent=2))
+
+    def to_table(self) -> Table:
+        """Returns the report as a rich table, child stages are indented below their parent"""
+
+        table = Table(title=f"{self.name} profile")
+        table.add_column("Stage", style="cyan", no_wrap=True)
+        table.add_column("Wall s", justify="right", style="green")
+        table.add_column("CPU s", justify="right", style="green")
+        table.add_column("Calls", justify="right")
+        table.add_column("Count", justify="right")
+        table.add_column("Mem MB", justify="right", style="bright_magenta")
+        table.add_column("RSS MB", justify="right", style="bright_magenta")
+
+        def add_rows(stages: list[StageProfile], depth: int):
+            for stage in stages:
+                table.add_row(
+                    "  " * depth + stage.name,
+                    f"{stage.wall_time:.3f}",
+                    f"{stage.cpu_time:.3f}",
+                    str(stage.calls),
+                    str(stage.count),
+                    "" if stage.memory_peak_mb is None else f"{stage.memory_peak_mb:.1f}",
+                    "" if stage.peak_rss_mb is None else f"{stage.peak_rss_mb:.1f}",
+                )
+                add_rows(stage.stages, depth + 1)
+
+        add_rows(self.stages, 0)
+        return table
+
+    def print(self):
+        """Prints the report table to the console"""
+        Console().print(self.to_table())
+
+
+@dataclass(slots=True)
+class _StageRecord:
+    """Mutable stage measurements, stages can be entered for every element of large models so
+    they are recorded without model validation and converted to `StageProfile` on demand"""
+
+    name: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    calls: int = 0
+    count: int = 0
+    memory_peak_mb: float | None = None
+    peak_rss_mb: float | None = None
+    stages: dict[str, "_StageRecord"] = field(default_factory=dict)
+
+    def get_stage(self, name: str) -> "_StageRecord":
+        """Returns the child stage with the given name, creating it if needed"""
+
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = _StageRecord(name)
+        return stage
+
+    def to_profile(self) -> StageProfile:
+        return StageProfile(
+            name=self.name,
+            wall_time=self.wall_time,
+            cpu_time=self.cpu_time,
+            calls=self.calls,
+            count=self.count,
+            memory_peak_mb=self.memory_peak_mb,
+            peak_rss_mb=self.peak_rss_mb,
+            stages=[stage.to_profile() for stage in self.stages.values()],
+        )
+
+
+class Profiler:
+    """Records wall time, CPU time, element counts and optionally traced memory of nested stages
+
+    Wall and CPU times are always recorded, they are cheap enough to keep on. Memory tracing
+    slows down allocation heavy code considerably and is only enabled on request. Entering a
+    stage with the name of an existing sibling accumulates into it.
+    """
+
+    def __init__(self, name: str, trace_memory: bool = False) -> None:
+        """
+        Args:
+            name (str): Report name
+            trace_memory (bool, optional): Trace the peak memory of every stage with tracemalloc. Defaults to False.
+        """
+        self.name = name
+        self.trace_memory = trace_memory
+        self._root = _StageRecord(name)
+        # open stages with the traced memory at their start and the highest traced peak so far
+        self._stack: list[list[_StageRecord | int]] = []
+        self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[_StageRecord]:
+        """Profiles the enclosed block as a child of the current stage
+
+        Args:
+            name (str): Stage name
+
+        Yields:
+            _StageRecord: Stage record, the block may update its `count`
+        """
+
+        parent = self._stack[-1][0] if self._stack else self._root
+        stage = parent.get_stage(name)
+        current_memory = 0
+        if self.trace_memory:
+            self._start_tracing()
+            current_memory, peak_memory = tracemalloc.get_traced_memory()
+            if self._stack:
+                # the parent peak is kept before the peak is reset for the child stage
+                self._stack[-1][2] = max(self._stack[-1][2], peak_memory)
+            tracemalloc.reset_peak()
+        self._stack.append([stage, current_memory, current_memory])
+
+        start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield stage
+        finally:
+            stage.wall_time += time.perf_counter() - start
+            stage.cpu_time += time.process_time() - cpu_start
+            stage.calls += 1
+            stage.peak_rss_mb = get_peak_rss_mb()
+            _, start_memory, peak_memory = self._stack.pop()
+            if self.trace_memory:
+                peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+                stage.memory_peak_mb = max(
+                    stage.memory_peak_mb or 0.0, (peak_memory - start_memory) / 1e6
+                )
+                if self._stack:
+                    self._stack[-1][2] = max(self._stack[-1][2], peak_memory)
+                else:
+                    self._stop_tracing()
+
+    def add_count(self, count: int):
+        """Adds to the element count of the current stage"""
+
+        if self._stack:
+            self._stack[-1][0].count += count
+
+    def add_stage(self, name: str, wall_time: float, cpu_time: float = 0.0, count: int = 0):
+        """Records a child stage of the current stage measured elsewhere, e.g. in a worker
+        process
+
+        Args:
+            name (str): Stage name
+            wall_time (float): Wall time in seconds
+            cpu_time (float, optional): CPU time in seconds. Defaults to 0.0.
+            count (int, optional): Number of processed elements. Defaults to 0.
+        """
+
+        parent = self._stack[-1][0] if self._stack else self._root
+        stage = parent.get_stage(name)
+        stage.wall_time += wall_time
+        stage.cpu_time += cpu_time
+        stage.calls += 1
+        stage.count += count
+
+    def get_report(self) -> ProfileReport:
+        """Returns the report of the recorded stages"""
+
+        return ProfileReport(
+            name=self.name,
+            trace_memory=self.trace_memory,
+            stages=[stage.to_profile() for stage in self._root.stages.values()],
+        )
+
+    def get_timings(self) -> dict[str, float]:
+        """Returns the wall time of the top level stages"""
+
+        return {stage.name: stage.wall_time for stage in self._root.stages.values()}
+
+    def _start_tracing(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def _stop_tracing(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
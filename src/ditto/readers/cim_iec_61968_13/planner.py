@@ -0,0 +1,118 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from typing import Callable
+import multiprocessing
+import time
+import sys
+
+from rdflib import Graph
+import pandas as pd
+
+from ditto.readers.cim_iec_61968_13.queries import SPARQL_QUERIES, get_namespaces, prepare_query
+from ditto.readers.cim_iec_61968_13.tables import CimTables
+from ditto.profiling import Profiler
+
+Query = Callable[[Graph | CimTables], pd.DataFrame]
+
+_worker_graph: Graph | CimTables | None = None
+
+
+def _initialize_query_worker(graph: Graph | CimTables):
+    """Keeps the graph of the worker process, the snapshot forked from the planner"""
+
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _time_query(query: Query, graph: Graph | CimTables) -> tuple[pd.DataFrame, float, float]:
+    start, cpu_start = time.perf_counter(), time.thread_time()
+    data = query(graph)
+    return data, time.perf_counter() - start, time.thread_time() - cpu_start
+
+
+def _run_query(query: Query) -> tuple[pd.DataFrame, float, float]:
+    return _time_query(query, _worker_graph)
+
+
+class QueryPlanner:
+    """Runs independent CIM reader queries on a graph or the columnar tables of a file
+
+    Every reader query is compiled once, with the namespace prefixes of the graph, before the
+    first query runs. The queries only read the graph and can run concurrently, with more than
+    one worker they run in forked processes sharing a copy-on-write snapshot of the graph and the
+    compiled queries on Linux. Fork is unsafe on macOS and not available on Windows, threads
+    reading the same graph are used there instead. rdflib evaluates queries in Python, so threads
+    mostly overlap the pandas work of the queries.
+
+    The wall time, CPU time and row count of every query are recorded as a stage of the profiler.
+    """
+
+    def __init__(
+        self,
+        graph: Graph | CimTables,
+        workers: int | None = None,
+        profiler: Profiler | None = None,
+    ) -> None:
+        """
+        Args:
+            graph (Graph | CimTables): Graph or tables of the CIM file, not modified by queries
+            workers (int | None, optional): Queries run concurrently, in forked processes on Linux
+                and in threads elsewhere. Queries run one after the other if None or 1.
+                Defaults to None.
+            profiler (Profiler | None, optional): Profiler recording the query latencies.
+                Defaults to a new profiler.
+        """
+        self.graph = graph
+        self.workers = workers
+        self.profiler = profiler or Profiler("cim queries")
+
+    def prepare(self):
+        """Compiles the reader queries for the namespaces of the graph"""
+
+        if isinstance(self.graph, Graph):
+            namespaces = get_namespaces(self.graph)
+        else:
+            namespaces = tuple(self.graph.namespaces.items())
+        for query in SPARQL_QUERIES.values():
+            prepare_query(query, namespaces)
+
+    def run(self, queries: dict[str, Query]) -> dict[str, pd.DataFrame]:
+        """Runs queries on the graph
+
+        Args:
+            queries (dict[str, Query]): Query functions keyed by name
+
+        Returns:
+            dict[str, pd.DataFrame]: Query results keyed by name, in the order of `queries`
+        """
+
+        self.prepare()
+        if self.workers is None or self.workers <= 1:
+            results = {}
+            for name, query in queries.items():
+                with self.profiler.stage(name) as stage:
+                    results[name] = query(self.graph)
+                    stage.count += len(results[name])
+            return results
+
+        with self._get_executor() as executor:
+            if isinstance(executor, ProcessPoolExecutor):
+                timed_results = executor.map(_run_query, queries.values())
+            else:
+                timed_results = executor.map(_time_query, queries.values(), repeat(self.graph))
+            results = {}
+            for name, (data, wall_time, cpu_time) in zip(queries, timed_results):
+                self.profiler.add_stage(name, wall_time, cpu_time, len(data))
+                results[name] = data
+        return results
+
+    def _get_executor(self) -> Executor:
+        if sys.platform != "linux":
+            return ThreadPoolExecutor(max_workers=self.workers)
+        # forked workers inherit the graph and the compiled queries without serializing them
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_initialize_query_worker,
+            initargs=(self.graph,),
+        )
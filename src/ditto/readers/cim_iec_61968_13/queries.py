@@ -1,5 +1,8 @@
-from functools import reduce
+from functools import lru_cache, reduce
+from typing import TYPE_CHECKING
 
+from rdflib.plugins.sparql.sparql import Query
+from rdflib.plugins.sparql import prepareQuery
 from rdflib.query import Result
 from loguru import logger
 from rdflib import Graph
@@ -7,13 +10,57 @@ import pandas as pd
 
 import numpy as np
 
+if TYPE_CHECKING:
+    from ditto.readers.cim_iec_61968_13.tables import CimTables
 
-def add_prefixes(query: str, graph: Graph) -> str:
-    prefixes = ""
-    for prefix_name, url in graph.namespaces():
-        prefix = f"PREFIX {prefix_name}: <{str(url)}>\n"
-        prefixes += prefix
-    return prefixes + query
+
+def get_namespaces(graph: Graph) -> tuple[tuple[str, str], ...]:
+    """Returns the namespace prefixes bound in a graph"""
+
+    return tuple((prefix, str(url)) for prefix, url in graph.namespaces())
+
+
+@lru_cache(maxsize=None)
+def prepare_query(query: str, namespaces: tuple[tuple[str, str], ...]) -> Query:
+    """Parses and compiles a SPARQL query once per set of namespace prefixes
+
+    Args:
+        query (str): SPARQL query without prefix declarations
+        namespaces (tuple[tuple[str, str], ...]): Prefixes and namespaces used by the query
+
+    Returns:
+        Query: Compiled query, can be run on any graph
+    """
+
+    return prepareQuery(query, initNs=dict(namespaces))
+
+
+def _clean_value(value: str) -> str:
+    """Returns the local name of URIs, e.g. `SinglePhaseKind.A` -> `A`"""
+
+    if "," in value:
+        values = value.split(",")
+        if "." in values[0]:
+            values = [v.split(".")[-1] for v in values]
+        return ",".join(values)
+    elif "." in value:
+        return value.split(".")[-1]
+    return value
+
+
+def _clean_values(values: pd.Series) -> pd.Series:
+    """Vectorized `_clean_value` of the values containing http"""
+
+    is_uri = values.str.contains("http", regex=False, na=False)
+    if not is_uri.any():
+        return values
+    uris = values[is_uri]
+    has_comma = uris.str.contains(",", regex=False)
+    cleaned = uris.str.rsplit(".", n=1).str[-1]
+    cleaned[has_comma] = uris[has_comma].map(_clean_value)
+    values = values.copy()
+    values[is_uri] = cleaned
+    return values
 
 
 def query_to_df(results: Result, columns: list[str]):
@@ -27,50 +74,70 @@ def query_to_df(results: Result, columns: list[str]):
                 new_value = value
 
             if isinstance(new_value, str) and "http" in new_value:
-                if "," in new_value:
-                    new_value = new_value.split(",")
-                    if "." in new_value[0]:
-                        new_value = [v.split(".")[-1] for v in new_value]
-                elif "." in new_value:
-                    new_value = new_value.split(".")[-1]
-                else:
-                    new_value = new_value
-                new_value = ",".join(new_value) if isinstance(new_value, list) else new_value
+                new_value = _clean_value(new_value)
 
             row_data[column] = new_value
         data.append(row_data)
-    data = pd.DataFrame(data)
+    data = pd.DataFrame(data, columns=columns)
     data = data.drop_duplicates()
 
     return data
 
 
-def query_line_codes(graph: Graph) -> pd.DataFrame:
-    columns = ["line_code", "phase_count", "r", "x", "b", "row", "column", "ampacity"]
+def select(graph: "Graph | CimTables", query: str, columns: list[str]) -> pd.DataFrame:
+    """Runs a select query on an RDF graph, or on the columnar tables of a CIM file
+
+    Both return a row per distinct solution with the projected variables renamed to `columns`.
+    Literals are returned as their values and URIs containing http as their local names, see
+    `query_to_df`. Table rows are cleaned column by column.
 
-    sparql_query_ac_line_segment = """
-    SELECT  ?line_code ?phase_count ?r ?x ?b ?row ?column ?ampacity
-    WHERE {
-        ?term rdf:type cim:Terminal .
-        ?term cim:Terminal.ConductingEquipment ?line .
-        ?term cim:ACDCTerminal.OperationalLimitSet ?oplimset .
-        ?line cim:ACLineSegment.PerLengthImpedance ?pu_phs_imp .
-        # ?pu_phs_imp rdf:type cim:PerLengthPhaseImpedance .
-        ?pu_phs_imp cim:IdentifiedObject.name ?line_code .
-        ?pu_phs_imp cim:PerLengthPhaseImpedance.conductorCount ?phase_count .
-        ?phase_imp_data rdf:type cim:PhaseImpedanceData .
-        ?phase_imp_data cim:PhaseImpedanceData.PhaseImpedance ?pu_phs_imp .
-        ?phase_imp_data cim:PhaseImpedanceData.r ?r .
-        ?phase_imp_data cim:PhaseImpedanceData.x ?x .
-        ?phase_imp_data cim:PhaseImpedanceData.b ?b .
-        ?phase_imp_data cim:PhaseImpedanceData.row ?row .
-        ?phase_imp_data cim:PhaseImpedanceData.column ?column .
-        ?curr_lim_set rdf:type cim:CurrentLimit .
-        ?curr_lim_set cim:OperationalLimit.OperationalLimitSet ?oplimset .
-        ?curr_lim_set cim:CurrentLimit.value ?ampacity .
-    }
+    Args:
+        graph (Graph | CimTables): Graph or tables of the CIM file
+        query (str): SPARQL select query, using the namespace prefixes of the file
+        columns (list[str]): Names of the projected variables
+
+    Returns:
+        pd.DataFrame: Query results
     """
-    data = query_to_df(graph.query(add_prefixes(sparql_query_ac_line_segment, graph)), columns)
+
+    if isinstance(graph, Graph):
+        prepared_query = prepare_query(query, get_namespaces(graph))
+        return query_to_df(graph.query(prepared_query), columns)
+    data = graph.select(query)
+    data.columns = columns
+    for column in columns:
+        data[column] = _clean_values(data[column])
+    return data.drop_duplicates()
+
+
+LINE_CODES_QUERY = """
+SELECT  ?line_code ?phase_count ?r ?x ?b ?row ?column ?ampacity
+WHERE {
+    ?term rdf:type cim:Terminal .
+    ?term cim:Terminal.ConductingEquipment ?line .
+    ?term cim:ACDCTerminal.OperationalLimitSet ?oplimset .
+    ?line cim:ACLineSegment.PerLengthImpedance ?pu_phs_imp .
+    # ?pu_phs_imp rdf:type cim:PerLengthPhaseImpedance .
+    ?pu_phs_imp cim:IdentifiedObject.name ?line_code .
+    ?pu_phs_imp cim:PerLengthPhaseImpedance.conductorCount ?phase_count .
+    ?phase_imp_data rdf:type cim:PhaseImpedanceData .
+    ?phase_imp_data cim:PhaseImpedanceData.PhaseImpedance ?pu_phs_imp .
+    ?phase_imp_data cim:PhaseImpedanceData.r ?r .
+    ?phase_imp_data cim:PhaseImpedanceData.x ?x .
+    ?phase_imp_data cim:PhaseImpedanceData.b ?b .
+    ?phase_imp_data cim:PhaseImpedanceData.row ?row .
+    ?phase_imp_data cim:PhaseImpedanceData.column ?column .
+    ?curr_lim_set rdf:type cim:CurrentLimit .
+    ?curr_lim_set cim:OperationalLimit.OperationalLimitSet ?oplimset .
+    ?curr_lim_set cim:CurrentLimit.value ?ampacity .
+}
+"""
+
+
+def query_line_codes(graph: "Graph | CimTables") -> pd.DataFrame:
+    columns = ["line_code", "phase_count", "r", "x", "b", "row", "column", "ampacity"]
+
+    data = select(graph, LINE_CODES_QUERY, columns)
 
     data_set = {}
     for line_code in data["line_code"].unique():
@@ -106,7 +173,26 @@ def query_line_codes(graph: Graph) -> pd.DataFrame:
     return pd.DataFrame(data_set).T
 
 
-def query_load_break_switches(graph: Graph) -> pd.DataFrame:
+LOAD_BREAK_SWITCHES_QUERY = """
+SELECT  ?switch_name ?capacity ?ratedCurrent ?normally_open ?is_open ?voltage ?node_name
+WHERE {
+    ?switch rdf:type cim:LoadBreakSwitch  .
+    ?switch cim:IdentifiedObject.name ?switch_name .
+    ?switch cim:ProtectedSwitch.breakingCapacity ?capacity .
+    ?switch cim:Switch.ratedCurrent ?ratedCurrent .
+    ?switch cim:Switch.normalOpen ?normally_open .
+    ?switch cim:Switch.open ?is_open .
+    ?switch cim:ConductingEquipment.BaseVoltage ?basevoltage .
+    ?basevoltage cim:BaseVoltage.nominalVoltage ?voltage .
+    ?term cim:Terminal.ConductingEquipment ?switch .
+    ?term cim:Terminal.ConnectivityNode ?node .
+    ?node cim:IdentifiedObject.name ?node_name .
+
+}
+"""
+
+
+def query_load_break_switches(graph: "Graph | CimTables") -> pd.DataFrame:
     columns = [
         "switch_name",
         "capacity",
@@ -117,24 +203,7 @@ def query_load_break_switches(graph: Graph) -> pd.DataFrame:
         "bus",
     ]
 
-    query = """
-    SELECT  ?switch_name ?capacity ?ratedCurrent ?normally_open ?is_open ?voltage ?node_name
-    WHERE {
-        ?switch rdf:type cim:LoadBreakSwitch  .
-        ?switch cim:IdentifiedObject.name ?switch_name .
-        ?switch cim:ProtectedSwitch.breakingCapacity ?capacity .
-        ?switch cim:Switch.ratedCurrent ?ratedCurrent .
-        ?switch cim:Switch.normalOpen ?normally_open .
-        ?switch cim:Switch.open ?is_open .
-        ?switch cim:ConductingEquipment.BaseVoltage ?basevoltage .
-        ?basevoltage cim:BaseVoltage.nominalVoltage ?voltage .
-        ?term cim:Terminal.ConductingEquipment ?switch .
-        ?term cim:Terminal.ConnectivityNode ?node .
-        ?node cim:IdentifiedObject.name ?node_name .
-
-    }
-    """
-    data = query_to_df(graph.query(add_prefixes(query, graph)), columns)
+    data = select(graph, LOAD_BREAK_SWITCHES_QUERY, columns)
     data_set = []
     for line_name in data["switch_name"].unique():
         filt_data = data[data["switch_name"] == line_name]
@@ -149,30 +218,32 @@ def query_load_break_switches(graph: Graph) -> pd.DataFrame:
     return data
 
 
-def query_line_segments(graph: Graph) -> pd.DataFrame:
+LINE_SEGMENTS_QUERY = """
+SELECT  ?line_name ?voltage ?length ?node_name ?phase_count ?line_code ?phase
+WHERE {
+    ?line rdf:type cim:ACLineSegment .
+    ?line cim:IdentifiedObject.name ?line_name .
+    ?line cim:ConductingEquipment.BaseVoltage ?basevoltage .
+    ?basevoltage cim:BaseVoltage.nominalVoltage ?voltage .
+    ?line cim:Conductor.length ?length .
+    ?line_phase cim:ACLineSegmentPhase.ACLineSegment ?line .
+    ?line_phase cim:ACLineSegmentPhase.phase ?phase .
+    ?term rdf:type cim:Terminal .
+    ?term cim:Terminal.ConductingEquipment ?line .
+    ?term cim:Terminal.ConnectivityNode ?node .
+    ?node cim:IdentifiedObject.name ?node_name .
+    ?line cim:ACLineSegment.PerLengthImpedance ?puimp .
+    ?puimp cim:PerLengthPhaseImpedance.conductorCount ?phase_count .
+    ?puimp cim:IdentifiedObject.name ?line_code .
+
+}
+"""
+
+
+def query_line_segments(graph: "Graph | CimTables") -> pd.DataFrame:
     columns = ["line", "voltage", "length", "bus", "phase_count", "line_code", "phase"]
 
-    query = """
-    SELECT  ?line_name ?voltage ?length ?node_name ?phase_count ?line_code ?phase
-    WHERE {
-        ?line rdf:type cim:ACLineSegment .
-        ?line cim:IdentifiedObject.name ?line_name .
-        ?line cim:ConductingEquipment.BaseVoltage ?basevoltage .
-        ?basevoltage cim:BaseVoltage.nominalVoltage ?voltage .
-        ?line cim:Conductor.length ?length .
-        ?line_phase cim:ACLineSegmentPhase.ACLineSegment ?line .
-        ?line_phase cim:ACLineSegmentPhase.phase ?phase .
-        ?term rdf:type cim:Terminal .
-        ?term cim:Terminal.ConductingEquipment ?line .
-        ?term cim:Terminal.ConnectivityNode ?node .
-        ?node cim:IdentifiedObject.name ?node_name .
-        ?line cim:ACLineSegment.PerLengthImpedance ?puimp .
-        ?puimp cim:PerLengthPhaseImpedance.conductorCount ?phase_count .
-        ?puimp cim:IdentifiedObject.name ?line_code .
-
-    }
-    """
-    data = query_to_df(graph.query(add_prefixes(query, graph)), columns)
+    data = select(graph, LINE_SEGMENTS_QUERY, columns)
 
     data_set = []
     for line_name in data["line"].unique():
@@ -195,20 +266,61 @@ def query_line_segments(graph: Graph) -> pd.DataFrame:
     return data_set
 
 
-def query_distribution_buses(graph: Graph) -> pd.DataFrame:
+LOCATIONS_QUERY = """
+SELECT  ?x ?y ?location_id
+WHERE {
+    ?point rdf:type cim:PositionPoint .
+    ?point cim:PositionPoint.xPosition ?x.
+    ?point cim:PositionPoint.yPosition ?y.
+    ?point cim:PositionPoint.Location ?location .
+    ?location cim:IdentifiedObject.mRID ?location_id .
+}
+"""
+
+
+DISTRIBUTION_BUSES_QUERY = """
+SELECT ?term_name ?node_name ?equip_name ?xfmr_voltage ?line_voltage ?reg_loc_id ?xfmr_loc_id ?line_loc_id
+WHERE {
+    ?node rdf:type cim:ConnectivityNode .
+    ?term cim:Terminal.ConnectivityNode ?node .
+    ?term cim:IdentifiedObject.name ?term_name .
+    ?term cim:Terminal.ConnectivityNode ?node .
+    ?node cim:IdentifiedObject.name ?node_name .
+    ?term cim:Terminal.ConductingEquipment ?equip .
+    ?equip cim:IdentifiedObject.name ?equip_name .
+
+    OPTIONAL {
+        ?xfmr cim:TransformerEnd.Terminal ?term.
+        ?xfmr cim:IdentifiedObject.name ?TransformerEnd.
+        ?xfmr cim:TransformerEnd.BaseVoltage ?xfmr_base_voltage .
+        ?xfmr_base_voltage cim:BaseVoltage.nominalVoltage ?xfmr_voltage .
+        ?xfmr_tank cim:TransformerTank.PowerTransformer ?equip .
+        ?xfmr_tank cim:PowerSystemResource.Location ?xfmr_location .
+        ?xfmr_location cim:IdentifiedObject.mRID ?xfmr_loc_id.
+    } .
+
+    OPTIONAL {
+        ?reg_control cim:RegulatingControl.Terminal ?term .
+        ?reg_control cim:PowerSystemResource.Location ?reg_location.
+        ?reg_location cim:IdentifiedObject.mRID ?reg_loc_id.
+    } .
+
+    OPTIONAL {
+        ?equip cim:PowerSystemResource.Location ?line_location .
+        ?line_location cim:IdentifiedObject.mRID ?line_loc_id .
+        ?equip cim:ConductingEquipment.BaseVoltage ?line_base_voltage .
+        ?line_base_voltage cim:BaseVoltage.nominalVoltage ?line_voltage .
+    }.
+
+}
+# GROUP BY ?equip_name ?TransformerEnd
+"""
+
+
+def query_distribution_buses(graph: "Graph | CimTables") -> pd.DataFrame:
     locations_columns = ["x", "y", "location_id"]
 
-    query_locations = """
-    SELECT  ?x ?y ?location_id
-    WHERE {
-        ?point rdf:type cim:PositionPoint .
-        ?point cim:PositionPoint.xPosition ?x.
-        ?point cim:PositionPoint.yPosition ?y.
-        ?point cim:PositionPoint.Location ?location .
-        ?location cim:IdentifiedObject.mRID ?location_id .
-    }
-    """
-    locations = query_to_df(graph.query(add_prefixes(query_locations, graph)), locations_columns)
+    locations = select(graph, LOCATIONS_QUERY, locations_columns)
     location_dict = {}
     for location in locations["location_id"].unique():
         loc = locations[locations["location_id"] == location]
@@ -226,44 +338,7 @@ def query_distribution_buses(graph: Graph) -> pd.DataFrame:
         "line_loc_id",
     ]
 
-    query = """
-    SELECT ?term_name ?node_name ?equip_name ?xfmr_voltage ?line_voltage ?reg_loc_id ?xfmr_loc_id ?line_loc_id
-    WHERE {
-        ?node rdf:type cim:ConnectivityNode .
-        ?term cim:Terminal.ConnectivityNode ?node .
-        ?term cim:IdentifiedObject.name ?term_name .
-        ?term cim:Terminal.ConnectivityNode ?node .
-        ?node cim:IdentifiedObject.name ?node_name .
-        ?term cim:Terminal.ConductingEquipment ?equip .
-        ?equip cim:IdentifiedObject.name ?equip_name .
-
-        OPTIONAL {
-            ?xfmr cim:TransformerEnd.Terminal ?term.
-            ?xfmr cim:IdentifiedObject.name ?TransformerEnd.
-            ?xfmr cim:TransformerEnd.BaseVoltage ?xfmr_base_voltage .
-            ?xfmr_base_voltage cim:BaseVoltage.nominalVoltage ?xfmr_voltage .
-            ?xfmr_tank cim:TransformerTank.PowerTransformer ?equip .
-            ?xfmr_tank cim:PowerSystemResource.Location ?xfmr_location .
-            ?xfmr_location cim:IdentifiedObject.mRID ?xfmr_loc_id.
-        } .
-
-        OPTIONAL {
-            ?reg_control cim:RegulatingControl.Terminal ?term .
-            ?reg_control cim:PowerSystemResource.Location ?reg_location.
-            ?reg_location cim:IdentifiedObject.mRID ?reg_loc_id.
-        } .
-
-        OPTIONAL {
-            ?equip cim:PowerSystemResource.Location ?line_location .
-            ?line_location cim:IdentifiedObject.mRID ?line_loc_id .
-            ?equip cim:ConductingEquipment.BaseVoltage ?line_base_voltage .
-            ?line_base_voltage cim:BaseVoltage.nominalVoltage ?line_voltage .
-        }.
-
-    }
-    # GROUP BY ?equip_name ?TransformerEnd
-    """
-    data = query_to_df(graph.query(add_prefixes(query, graph)), columns)
+    data = select(graph, DISTRIBUTION_BUSES_QUERY, columns)
     node_voltage_df = _get_bus_base_voltages(data)
     node_coordinates = _get_bus_coordinates(data, location_dict)
     final_data = pd.concat([node_coordinates, node_voltage_df], axis=1)
@@ -335,7 +410,64 @@ def _get_bus_base_voltages(data: pd.DataFrame) -> pd.DataFrame:
     return filt_data_final
 
 
-def query_distribution_regulators(graph: Graph) -> pd.DataFrame:
+DISTRIBUTION_REGULATORS_QUERY = """
+SELECT ?xfmr_name ?apparent_power ?rated_voltage ?per_resistance ?conn ?angle ?winding ?node_name
+    ?xfmr_end_name ?phases ?max_tap ?min_tap ?neutral_tap ?normal_tap ?dv ?current_tap
+    ?z_1_leakage ?z_0_leakage ?z_1_loadloss ?z_0_loadloss
+WHERE {
+    ?xfmr rdf:type cim:TransformerTank .
+    ?xfmr cim:TransformerTank.TransformerTankInfo ?xfmr_info .
+    ?xfmr cim:IdentifiedObject.name ?xfmr_name .
+
+    ?xfmr cim:TransformerTank.PowerTransformer ?pwr_xfmr .
+    ?xfmr_end rdf:type cim:TransformerEndInfo .
+
+    ?xfmr_end cim:TransformerEndInfo.TransformerTankInfo ?xfmr_info .
+    ?xfmr_end cim:TransformerEndInfo.ratedS ?apparent_power .
+    ?xfmr_end cim:TransformerEndInfo.ratedU ?rated_voltage .
+    ?xfmr_end cim:TransformerEndInfo.r ?per_resistance .
+    ?xfmr_end cim:TransformerEndInfo.connectionKind ?conn .
+    ?xfmr_end cim:TransformerEndInfo.phaseAngleClock ?angle .
+    ?xfmr_end cim:TransformerEndInfo.endNumber ?winding .
+    ?xfmr_end cim:IdentifiedObject.name ?xfmr_end_name .
+    ?term rdf:type cim:Terminal .
+    ?term cim:Terminal.ConductingEquipment ?pwr_xfmr .
+    ?term cim:Terminal.ConnectivityNode ?node .
+    ?node cim:IdentifiedObject.name ?node_name .
+
+
+    ?xfmr_tank_end rdf:type cim:TransformerTankEnd  .
+    ?xfmr_tank_end cim:TransformerTankEnd.TransformerTank ?xfmr .
+    OPTIONAL {
+        ?xfmr_tank_end cim:TransformerTankEnd.orderedPhases ?phases .
+    } .
+
+    OPTIONAL {
+        ?tap_chgr rdf:type  cim:RatioTapChanger .
+        ?tap_chgr cim:RatioTapChanger.TransformerEnd ?xfmr_tank_end .
+        ?tap_chgr cim:TapChanger.highStep ?max_tap .
+        ?tap_chgr cim:TapChanger.lowStep ?min_tap .
+        ?tap_chgr cim:TapChanger.neutralStep ?neutral_tap .
+        ?tap_chgr cim:TapChanger.normalStep ?normal_tap .
+        ?tap_chgr cim:RatioTapChanger.stepVoltageIncrement ?dv .
+        ?tap_chgr cim:TapChanger.step ?current_tap .
+    } .
+
+    OPTIONAL {
+        ?sc_test cim:ShortCircuitTest.EnergisedEnd ?xfmr_end .
+        ?sc_test cim:ShortCircuitTest.leakageImpedance ?z_1_leakage .
+        ?sc_test cim:ShortCircuitTest.leakageImpedanceZero ?z_0_leakage .
+        ?sc_test cim:ShortCircuitTest.loss ?z_1_loadloss .
+        ?sc_test cim:ShortCircuitTest.lossZero ?z_0_loadloss .
+    } .
+
+
+}
+
+"""
+
+
+def query_distribution_regulators(graph: "Graph | CimTables") -> pd.DataFrame:
     columns = [
         "xfmr",
         "apparent_power",
@@ -359,65 +491,32 @@ def query_distribution_regulators(graph: Graph) -> pd.DataFrame:
         "z_0_loadloss",
     ]
 
-    query = """
-    SELECT ?xfmr_name ?apparent_power ?rated_voltage ?per_resistance ?conn ?angle ?winding ?node_name
-        ?xfmr_end_name ?phases ?max_tap ?min_tap ?neutral_tap ?normal_tap ?dv ?current_tap
-        ?z_1_leakage ?z_0_leakage ?z_1_loadloss ?z_0_loadloss
-    WHERE {
-        ?xfmr rdf:type cim:TransformerTank .
-        ?xfmr cim:TransformerTank.TransformerTankInfo ?xfmr_info .
-        ?xfmr cim:IdentifiedObject.name ?xfmr_name .
-
-        ?xfmr cim:TransformerTank.PowerTransformer ?pwr_xfmr .
-        ?xfmr_end rdf:type cim:TransformerEndInfo .
-
-        ?xfmr_end cim:TransformerEndInfo.TransformerTankInfo ?xfmr_info .
-        ?xfmr_end cim:TransformerEndInfo.ratedS ?apparent_power .
-        ?xfmr_end cim:TransformerEndInfo.ratedU ?rated_voltage .
-        ?xfmr_end cim:TransformerEndInfo.r ?per_resistance .
-        ?xfmr_end cim:TransformerEndInfo.connectionKind ?conn .
-        ?xfmr_end cim:TransformerEndInfo.phaseAngleClock ?angle .
-        ?xfmr_end cim:TransformerEndInfo.endNumber ?winding .
-        ?xfmr_end cim:IdentifiedObject.name ?xfmr_end_name .
-        ?term rdf:type cim:Terminal .
-        ?term cim:Terminal.ConductingEquipment ?pwr_xfmr .
-        ?term cim:Terminal.ConnectivityNode ?node .
-        ?node cim:IdentifiedObject.name ?node_name .
-
-
-        ?xfmr_tank_end rdf:type cim:TransformerTankEnd  .
-        ?xfmr_tank_end cim:TransformerTankEnd.TransformerTank ?xfmr .
-        OPTIONAL {
-            ?xfmr_tank_end cim:TransformerTankEnd.orderedPhases ?phases .
-        } .
-
-        OPTIONAL {
-            ?tap_chgr rdf:type  cim:RatioTapChanger .
-            ?tap_chgr cim:RatioTapChanger.TransformerEnd ?xfmr_tank_end .
-            ?tap_chgr cim:TapChanger.highStep ?max_tap .
-            ?tap_chgr cim:TapChanger.lowStep ?min_tap .
-            ?tap_chgr cim:TapChanger.neutralStep ?neutral_tap .
-            ?tap_chgr cim:TapChanger.normalStep ?normal_tap .
-            ?tap_chgr cim:RatioTapChanger.stepVoltageIncrement ?dv .
-            ?tap_chgr cim:TapChanger.step ?current_tap .
-        } .
-
-        OPTIONAL {
-            ?sc_test cim:ShortCircuitTest.EnergisedEnd ?xfmr_end .
-            ?sc_test cim:ShortCircuitTest.leakageImpedance ?z_1_leakage .
-            ?sc_test cim:ShortCircuitTest.leakageImpedanceZero ?z_0_leakage .
-            ?sc_test cim:ShortCircuitTest.loss ?z_1_loadloss .
-            ?sc_test cim:ShortCircuitTest.lossZero ?z_0_loadloss .
-        } .
-
-
-    }
-
-    """
-    return query_to_df(graph.query(add_prefixes(query, graph)), columns)
-
-
-def query_power_transformers(graph: Graph) -> pd.DataFrame:
+    return select(graph, DISTRIBUTION_REGULATORS_QUERY, columns)
+
+
+POWER_TRANSFORMERS_QUERY = """
+SELECT  ?xfmr_name ?apparent_power ?rated_voltage ?vector_group ?per_resistance
+    ?conn ?angle ?winding ?node_name ?xfmr_end_name
+WHERE {
+    ?xfmr rdf:type cim:PowerTransformer .
+    ?xfmr cim:IdentifiedObject.name ?xfmr_name .
+    ?xfmr cim:PowerTransformer.vectorGroup ?vector_group .
+    ?xfmr_end cim:PowerTransformerEnd.PowerTransformer ?xfmr .
+    ?xfmr_end cim:PowerTransformerEnd.ratedS ?apparent_power .
+    ?xfmr_end cim:PowerTransformerEnd.ratedU ?rated_voltage .
+    ?xfmr_end cim:PowerTransformerEnd.r ?per_resistance .
+    ?xfmr_end cim:PowerTransformerEnd.connectionKind ?conn .
+    ?xfmr_end cim:PowerTransformerEnd.phaseAngleClock ?angle .
+    ?xfmr_end cim:TransformerEnd.endNumber ?winding .
+    ?xfmr_end cim:IdentifiedObject.name ?xfmr_end_name .
+    ?term cim:Terminal.ConductingEquipment ?xfmr .
+    ?term cim:Terminal.ConnectivityNode ?node .
+    ?node cim:IdentifiedObject.name ?node_name .
+}
+"""
+
+
+def query_power_transformers(graph: "Graph | CimTables") -> pd.DataFrame:
     columns = [
         "xfmr",
         "apparent_power",
@@ -431,54 +530,65 @@ def query_power_transformers(graph: Graph) -> pd.DataFrame:
         "xfmr_end",
     ]
 
-    query = """
-    SELECT  ?xfmr_name ?apparent_power ?rated_voltage ?vector_group ?per_resistance
-        ?conn ?angle ?winding ?node_name ?xfmr_end_name
-    WHERE {
-        ?xfmr rdf:type cim:PowerTransformer .
-        ?xfmr cim:IdentifiedObject.name ?xfmr_name .
-        ?xfmr cim:PowerTransformer.vectorGroup ?vector_group .
-        ?xfmr_end cim:PowerTransformerEnd.PowerTransformer ?xfmr .
-        ?xfmr_end cim:PowerTransformerEnd.ratedS ?apparent_power .
-        ?xfmr_end cim:PowerTransformerEnd.ratedU ?rated_voltage .
-        ?xfmr_end cim:PowerTransformerEnd.r ?per_resistance .
-        ?xfmr_end cim:PowerTransformerEnd.connectionKind ?conn .
-        ?xfmr_end cim:PowerTransformerEnd.phaseAngleClock ?angle .
-        ?xfmr_end cim:TransformerEnd.endNumber ?winding .
-        ?xfmr_end cim:IdentifiedObject.name ?xfmr_end_name .
-        ?term cim:Terminal.ConductingEquipment ?xfmr .
-        ?term cim:Terminal.ConnectivityNode ?node .
-        ?node cim:IdentifiedObject.name ?node_name .
-    }
-    """
-    return query_to_df(graph.query(add_prefixes(query, graph)), columns)
+    return select(graph, POWER_TRANSFORMERS_QUERY, columns)
+
+
+TRANSFORMER_WINDINGS_QUERY = """
+SELECT  ?winding_name ?r1 ?x1 ?r0 ?x0 ?xfmr_end_name_1 ?xfmr_end_name_2
+WHERE {
+    ?xfmr_imp rdf:type cim:TransformerMeshImpedance  .
+    ?xfmr_imp cim:IdentifiedObject.name ?winding_name .
+
+    ?xfmr_imp cim:TransformerMeshImpedance.r ?r1 .
+    ?xfmr_imp cim:TransformerMeshImpedance.x ?x1 .
+    ?xfmr_imp cim:TransformerMeshImpedance.r0 ?r0 .
+    ?xfmr_imp cim:TransformerMeshImpedance.x0 ?x0 .
+
+    ?xfmr_imp cim:TransformerMeshImpedance.FromTransformerEnd ?xfmr_end_1 .
+    ?xfmr_imp cim:TransformerMeshImpedance.ToTransformerEnd ?xfmr_end_2 .
 
+    ?xfmr_end_1 cim:IdentifiedObject.name ?xfmr_end_name_1 .
+    ?xfmr_end_2 cim:IdentifiedObject.name ?xfmr_end_name_2 .
+}
+"""
 
-def query_transformer_windings(graph: Graph) -> pd.DataFrame:
+
+def query_transformer_windings(graph: "Graph | CimTables") -> pd.DataFrame:
     columns = ["winding", "r1", "x1", "r0", "x0", "xfmr_end_1", "xfmr_end_2"]
 
-    query = """
-    SELECT  ?winding_name ?r1 ?x1 ?r0 ?x0 ?xfmr_end_name_1 ?xfmr_end_name_2
-    WHERE {
-        ?xfmr_imp rdf:type cim:TransformerMeshImpedance  .
-        ?xfmr_imp cim:IdentifiedObject.name ?winding_name .
+    return select(graph, TRANSFORMER_WINDINGS_QUERY, columns)
 
-        ?xfmr_imp cim:TransformerMeshImpedance.r ?r1 .
-        ?xfmr_imp cim:TransformerMeshImpedance.x ?x1 .
-        ?xfmr_imp cim:TransformerMeshImpedance.r0 ?r0 .
-        ?xfmr_imp cim:TransformerMeshImpedance.x0 ?x0 .
 
-        ?xfmr_imp cim:TransformerMeshImpedance.FromTransformerEnd ?xfmr_end_1 .
-        ?xfmr_imp cim:TransformerMeshImpedance.ToTransformerEnd ?xfmr_end_2 .
+CAPACITORS_QUERY = """
+SELECT  ?cap_name ?rated_voltage ?conn ?node_name ?b1 ?g1 ?b0 ?g0 ?phase ?steps
+WHERE {
+    ?cap rdf:type cim:LinearShuntCompensator  .
+    ?cap cim:IdentifiedObject.name ?cap_name .
+    ?cap cim:ShuntCompensator.phaseConnection ?conn .
+    ?cap cim:ConductingEquipment.BaseVoltage ?base_voltage .
+    ?base_voltage cim:BaseVoltage.nominalVoltage ?rated_voltage .
+    ?term rdf:type cim:Terminal .
+    ?term cim:Terminal.ConductingEquipment ?cap .
+    ?term cim:Terminal.ConnectivityNode ?node .
+    ?node cim:IdentifiedObject.name ?node_name .
+    ?cap cim:LinearShuntCompensator.bPerSection ?b1 .
+    ?cap cim:LinearShuntCompensator.gPerSection ?g1 .
+    ?cap cim:LinearShuntCompensator.b0PerSection ?b0 .
+    ?cap cim:LinearShuntCompensator.g0PerSection ?g0 .
+    ?cap cim:ShuntCompensator.sections ?steps .
 
-        ?xfmr_end_1 cim:IdentifiedObject.name ?xfmr_end_name_1 .
-        ?xfmr_end_2 cim:IdentifiedObject.name ?xfmr_end_name_2 .
-    }
-    """
-    return query_to_df(graph.query(add_prefixes(query, graph)), columns)
+    OPTIONAL {
+        ?phs_cap rdf:type cim:LinearShuntCompensatorPhase .
+        ?phs_cap cim:ShuntCompensatorPhase.ShuntCompensator ?cap .
+        ?phs_cap cim:ShuntCompensatorPhase.phase ?phase .
+    } .
+
+}
+
+"""
 
 
-def query_capacitors(graph: Graph) -> pd.DataFrame:
+def query_capacitors(graph: "Graph | CimTables") -> pd.DataFrame:
     columns = [
         "capacitor",
         "rated_voltage",
@@ -492,37 +602,34 @@ def query_capacitors(graph: Graph) -> pd.DataFrame:
         "steps",
     ]
 
-    query = """
-    SELECT  ?cap_name ?rated_voltage ?conn ?node_name ?b1 ?g1 ?b0 ?g0 ?phase ?steps
-    WHERE {
-        ?cap rdf:type cim:LinearShuntCompensator  .
-        ?cap cim:IdentifiedObject.name ?cap_name .
-        ?cap cim:ShuntCompensator.phaseConnection ?conn .
-        ?cap cim:ConductingEquipment.BaseVoltage ?base_voltage .
-        ?base_voltage cim:BaseVoltage.nominalVoltage ?rated_voltage .
-        ?term rdf:type cim:Terminal .
-        ?term cim:Terminal.ConductingEquipment ?cap .
-        ?term cim:Terminal.ConnectivityNode ?node .
-        ?node cim:IdentifiedObject.name ?node_name .
-        ?cap cim:LinearShuntCompensator.bPerSection ?b1 .
-        ?cap cim:LinearShuntCompensator.gPerSection ?g1 .
-        ?cap cim:LinearShuntCompensator.b0PerSection ?b0 .
-        ?cap cim:LinearShuntCompensator.g0PerSection ?g0 .
-        ?cap cim:ShuntCompensator.sections ?steps .
-
-        OPTIONAL {
-            ?phs_cap rdf:type cim:LinearShuntCompensatorPhase .
-            ?phs_cap cim:ShuntCompensatorPhase.ShuntCompensator ?cap .
-            ?phs_cap cim:ShuntCompensatorPhase.phase ?phase .
-        } .
-
-    }
+    return select(graph, CAPACITORS_QUERY, columns)
 
-    """
-    return query_to_df(graph.query(add_prefixes(query, graph)), columns)
 
+SOURCE_QUERY = """
+SELECT  ?src_name ?rated_voltage ?src_voltage ?src_angle ?r1 ?x1 ?r0 ?x0 ?node_name
+WHERE {
+    ?src rdf:type cim:EnergySource .
+    ?src cim:IdentifiedObject.name ?src_name .
+
+    ?src cim:EnergySource.nominalVoltage ?rated_voltage .
+    ?src cim:EnergySource.voltageMagnitude ?src_voltage .
+    ?src cim:EnergySource.voltageAngle ?src_angle .
+
+    ?src cim:EnergySource.r ?r1 .
+    ?src cim:EnergySource.x ?x1 .
+    ?src cim:EnergySource.r0 ?r0 .
+    ?src cim:EnergySource.x0 ?x0 .
 
-def query_source(graph: Graph) -> pd.DataFrame:
+    ?term rdf:type cim:Terminal .
+    ?term cim:Terminal.ConductingEquipment ?src .
+    ?term cim:Terminal.ConnectivityNode ?node .
+    ?node cim:IdentifiedObject.name ?node_name .
+}
+
+"""
+
+
+def query_source(graph: "Graph | CimTables") -> pd.DataFrame:
     columns = [
         "source",
         "rated_voltage",
@@ -535,32 +642,45 @@ def query_source(graph: Graph) -> pd.DataFrame:
         "bus",
     ]
 
-    query = """
-    SELECT  ?src_name ?rated_voltage ?src_voltage ?src_angle ?r1 ?x1 ?r0 ?x0 ?node_name
-    WHERE {
-        ?src rdf:type cim:EnergySource .
-        ?src cim:IdentifiedObject.name ?src_name .
-
-        ?src cim:EnergySource.nominalVoltage ?rated_voltage .
-        ?src cim:EnergySource.voltageMagnitude ?src_voltage .
-        ?src cim:EnergySource.voltageAngle ?src_angle .
-
-        ?src cim:EnergySource.r ?r1 .
-        ?src cim:EnergySource.x ?x1 .
-        ?src cim:EnergySource.r0 ?r0 .
-        ?src cim:EnergySource.x0 ?x0 .
-
-        ?term rdf:type cim:Terminal .
-        ?term cim:Terminal.ConductingEquipment ?src .
-        ?term cim:Terminal.ConnectivityNode ?node .
-        ?node cim:IdentifiedObject.name ?node_name .
-    }
-
-    """
-    return query_to_df(graph.query(add_prefixes(query, graph)), columns)
-
-
-def query_loads(graph: Graph) -> pd.DataFrame:
+    return select(graph, SOURCE_QUERY, columns)
+
+
+LOADS_QUERY = """
+SELECT  ?load_name ?p ?q ?rated_voltage ?is_grounded ?phase ?conn ?node_name ?z_p ?i_p ?p_p ?z_q ?i_q ?p_q ?p_exp ?q_exp
+WHERE {
+    ?load rdf:type cim:EnergyConsumer .
+    ?load cim:IdentifiedObject.name ?load_name .
+    ?load cim:EnergyConsumer.p ?p .
+    ?load cim:EnergyConsumer.q ?q .
+    ?load cim:EnergyConsumer.phaseConnection ?conn .
+    ?load cim:ConductingEquipment.BaseVoltage ?base_voltage .
+    ?base_voltage cim:BaseVoltage.nominalVoltage ?rated_voltage .
+    ?load cim:EnergyConsumer.grounded ?is_grounded .
+    OPTIONAL {
+        ?phs_load rdf:type cim:EnergyConsumerPhase .
+        ?phs_load cim:EnergyConsumerPhase.EnergyConsumer ?load .
+        ?phs_load cim:EnergyConsumerPhase.phase ?phase .
+    } .
+
+    ?term rdf:type cim:Terminal .
+    ?term cim:Terminal.ConductingEquipment ?load .
+    ?term cim:Terminal.ConnectivityNode ?node .
+    ?node cim:IdentifiedObject.name ?node_name .
+
+    ?load cim:EnergyConsumer.LoadResponse ?zip_params .
+    ?zip_params cim:LoadResponseCharacteristic.pConstantImpedance ?z_p .
+    ?zip_params cim:LoadResponseCharacteristic.pConstantCurrent ?i_p .
+    ?zip_params cim:LoadResponseCharacteristic.pConstantPower ?p_p .
+    ?zip_params cim:LoadResponseCharacteristic.qConstantImpedance ?z_q .
+    ?zip_params cim:LoadResponseCharacteristic.qConstantCurrent ?i_q .
+    ?zip_params cim:LoadResponseCharacteristic.qConstantPower ?p_q .
+    ?zip_params cim:LoadResponseCharacteristic.pVoltageExponent ?p_exp .
+    ?zip_params cim:LoadResponseCharacteristic.qVoltageExponent ?q_exp .
+}
+"""
+
+
+def query_loads(graph: "Graph | CimTables") -> pd.DataFrame:
     columns = [
         "load",
         "active power",
@@ -580,43 +700,43 @@ def query_loads(graph: Graph) -> pd.DataFrame:
         "q_exp",
     ]
 
-    query = """
-    SELECT  ?load_name ?p ?q ?rated_voltage ?is_grounded ?phase ?conn ?node_name ?z_p ?i_p ?p_p ?z_q ?i_q ?p_q ?p_exp ?q_exp
-    WHERE {
-        ?load rdf:type cim:EnergyConsumer .
-        ?load cim:IdentifiedObject.name ?load_name .
-        ?load cim:EnergyConsumer.p ?p .
-        ?load cim:EnergyConsumer.q ?q .
-        ?load cim:EnergyConsumer.phaseConnection ?conn .
-        ?load cim:ConductingEquipment.BaseVoltage ?base_voltage .
-        ?base_voltage cim:BaseVoltage.nominalVoltage ?rated_voltage .
-        ?load cim:EnergyConsumer.grounded ?is_grounded .
-        OPTIONAL {
-            ?phs_load rdf:type cim:EnergyConsumerPhase .
-            ?phs_load cim:EnergyConsumerPhase.EnergyConsumer ?load .
-            ?phs_load cim:EnergyConsumerPhase.phase ?phase .
-        } .
-
-        ?term rdf:type cim:Terminal .
-        ?term cim:Terminal.ConductingEquipment ?load .
-        ?term cim:Terminal.ConnectivityNode ?node .
-        ?node cim:IdentifiedObject.name ?node_name .
-
-        ?load cim:EnergyConsumer.LoadResponse ?zip_params .
-        ?zip_params cim:LoadResponseCharacteristic.pConstantImpedance ?z_p .
-        ?zip_params cim:LoadResponseCharacteristic.pConstantCurrent ?i_p .
-        ?zip_params cim:LoadResponseCharacteristic.pConstantPower ?p_p .
-        ?zip_params cim:LoadResponseCharacteristic.qConstantImpedance ?z_q .
-        ?zip_params cim:LoadResponseCharacteristic.qConstantCurrent ?i_q .
-        ?zip_params cim:LoadResponseCharacteristic.qConstantPower ?p_q .
-        ?zip_params cim:LoadResponseCharacteristic.pVoltageExponent ?p_exp .
-        ?zip_params cim:LoadResponseCharacteristic.qVoltageExponent ?q_exp .
-    }
-    """
-    return query_to_df(graph.query(add_prefixes(query, graph)), columns)
-
-
-def query_regulator_controllers(graph: Graph) -> pd.DataFrame:
+    return select(graph, LOADS_QUERY, columns)
+
+
+REGULATOR_CONTROLLERS_QUERY = """
+SELECT  ?regulator ?neutral_voltage ?initial_delay ?subsequent_delay ?ltc_flag ?enabled
+        ?pt_ratio ?ct_ratio ?ct_rating ?mode ?bus_name ?phase ?target ?deadband ?ldc ?line_drop_r
+        ?line_drop_x ?reversible ?max_voltage ?min_voltage
+WHERE {
+    ?tap_changer rdf:type cim:RatioTapChanger .
+    ?tap_changer cim:IdentifiedObject.name ?regulator .
+    ?tap_changer cim:TapChanger.neutralU ?neutral_voltage .
+    ?tap_changer cim:TapChanger.initialDelay ?initial_delay .
+    ?tap_changer cim:TapChanger.subsequentDelay ?subsequent_delay .
+    ?tap_changer cim:TapChanger.ltcFlag ?ltc_flag .
+    ?tap_changer cim:TapChanger.controlEnabled ?enabled .
+    ?tap_changer cim:TapChanger.ptRatio ?pt_ratio .
+    ?tap_changer cim:TapChanger.ctRatio ?ct_ratio .
+    ?tap_changer cim:TapChanger.ctRating ?ct_rating .
+    ?tap_changer cim:TapChanger.TapChangerControl ?controller.
+    ?controller cim:RegulatingControl.mode ?mode .
+    ?controller cim:RegulatingControl.Terminal ?term .
+    ?term cim:Terminal.ConnectivityNode ?bus .
+    ?bus cim:IdentifiedObject.name ?bus_name .
+    ?controller cim:RegulatingControl.monitoredPhase ?phase .
+    ?controller cim:RegulatingControl.targetValue ?target .
+    ?controller cim:RegulatingControl.targetDeadband ?deadband .
+    ?controller cim:TapChangerControl.lineDropCompensation ?ldc .
+    ?controller cim:TapChangerControl.lineDropR ?line_drop_r .
+    ?controller cim:TapChangerControl.lineDropX ?line_drop_x .
+    ?controller cim:TapChangerControl.reversible ?reversible .
+    ?controller cim:TapChangerControl.maxLimitVoltage ?max_voltage .
+    ?controller cim:TapChangerControl.minLimitVoltage ?min_voltage .
+}
+"""
+
+
+def query_regulator_controllers(graph: "Graph | CimTables") -> pd.DataFrame:
     columns = [
         "regulator",
         "neutral_voltage",
@@ -640,35 +760,20 @@ def query_regulator_controllers(graph: Graph) -> pd.DataFrame:
         "min_voltage",
     ]
 
-    query = """
-    SELECT  ?regulator ?neutral_voltage ?initial_delay ?subsequent_delay ?ltc_flag ?enabled
-            ?pt_ratio ?ct_ratio ?ct_rating ?mode ?bus_name ?phase ?target ?deadband ?ldc ?line_drop_r
-            ?line_drop_x ?reversible ?max_voltage ?min_voltage
-    WHERE {
-        ?tap_changer rdf:type cim:RatioTapChanger .
-        ?tap_changer cim:IdentifiedObject.name ?regulator .
-        ?tap_changer cim:TapChanger.neutralU ?neutral_voltage .
-        ?tap_changer cim:TapChanger.initialDelay ?initial_delay .
-        ?tap_changer cim:TapChanger.subsequentDelay ?subsequent_delay .
-        ?tap_changer cim:TapChanger.ltcFlag ?ltc_flag .
-        ?tap_changer cim:TapChanger.controlEnabled ?enabled .
-        ?tap_changer cim:TapChanger.ptRatio ?pt_ratio .
-        ?tap_changer cim:TapChanger.ctRatio ?ct_ratio .
-        ?tap_changer cim:TapChanger.ctRating ?ct_rating .
-        ?tap_changer cim:TapChanger.TapChangerControl ?controller.
-        ?controller cim:RegulatingControl.mode ?mode .
-        ?controller cim:RegulatingControl.Terminal ?term .
-        ?term cim:Terminal.ConnectivityNode ?bus .
-        ?bus cim:IdentifiedObject.name ?bus_name .
-        ?controller cim:RegulatingControl.monitoredPhase ?phase .
-        ?controller cim:RegulatingControl.targetValue ?target .
-        ?controller cim:RegulatingControl.targetDeadband ?deadband .
-        ?controller cim:TapChangerControl.lineDropCompensation ?ldc .
-        ?controller cim:TapChangerControl.lineDropR ?line_drop_r .
-        ?controller cim:TapChangerControl.lineDropX ?line_drop_x .
-        ?controller cim:TapChangerControl.reversible ?reversible .
-        ?controller cim:TapChangerControl.maxLimitVoltage ?max_voltage .
-        ?controller cim:TapChangerControl.minLimitVoltage ?min_voltage .
-    }
-    """
-    return query_to_df(graph.query(add_prefixes(query, graph)), columns)
+    return select(graph, REGULATOR_CONTROLLERS_QUERY, columns)
+
+
+SPARQL_QUERIES = {
+    "line_codes": LINE_CODES_QUERY,
+    "load_break_switches": LOAD_BREAK_SWITCHES_QUERY,
+    "line_segments": LINE_SEGMENTS_QUERY,
+    "locations": LOCATIONS_QUERY,
+    "distribution_buses": DISTRIBUTION_BUSES_QUERY,
+    "distribution_regulators": DISTRIBUTION_REGULATORS_QUERY,
+    "power_transformers": POWER_TRANSFORMERS_QUERY,
+    "transformer_windings": TRANSFORMER_WINDINGS_QUERY,
+    "capacitors": CAPACITORS_QUERY,
+    "source": SOURCE_QUERY,
+    "loads": LOADS_QUERY,
+    "regulator_controllers": REGULATOR_CONTROLLERS_QUERY,
+}
@@ -32,6 +32,10 @@ from ditto.readers.cim_iec_61968_13.queries import (
     query_source,
     query_loads,
 )
+from ditto.readers.cim_iec_61968_13.planner import QueryPlanner
+from ditto.readers.cim_iec_61968_13.tables import CimTables
+from ditto.profiling import Profiler, ProfileReport
+from ditto.enumerations import CimQueryBackend
 import ditto.readers.cim_iec_61968_13 as cim_mapper
 from ditto.readers.reader import AbstractReader
 
@@ -51,48 +55,76 @@ class Reader(AbstractReader):
         MatrixImpedanceSwitch,
     ]
 
-    def __init__(self, cim_file: str | Path):
+    def __init__(
+        self,
+        cim_file: str | Path,
+        streaming: bool = False,
+        query_backend: CimQueryBackend | str = CimQueryBackend.SPARQL,
+        query_workers: int | None = None,
+    ):
+        """Constructor for the CIM reader
+
+        Args:
+            cim_file (str | Path): Path to the CIM XML file
+            streaming (bool, optional): Stream the file into compact tables of the classes and
+                properties used by the queries and query a graph of those only, instead of
+                parsing every triple of the file. Defaults to False.
+            query_backend (CimQueryBackend | str, optional): `sparql` runs the queries on an
+                rdflib graph, `columnar` runs them as vectorized joins of the streamed tables,
+                which is much faster for large files. Defaults to CimQueryBackend.SPARQL.
+            query_workers (int | None, optional): Workers running the independent queries
+                concurrently, forked processes sharing a snapshot of the graph on Linux and
+                threads elsewhere. Queries run one after the other if None. Defaults to None.
+        """
         cim_file = Path(cim_file)
         assert cim_file.exists(), f"{cim_file} does not exist"
         self.system = DistributionSystem(auto_add_composed_components=True)
-        self.graph = Graph()
-        self.graph.parse(cim_file, format="xml")
+        self.query_workers = query_workers
+        self.profiler = Profiler("cim reader")
+        with self.profiler.stage("parse"):
+            if CimQueryBackend(query_backend) == CimQueryBackend.COLUMNAR:
+                self.graph = CimTables.from_xml(cim_file)
+            elif streaming:
+                self.graph = CimTables.from_xml(cim_file).to_graph()
+            else:
+                self.graph = Graph()
+                self.graph.parse(cim_file, format="xml")
 
     def read(self):
-        datasets: dict[DistributionComponentBase, pd.DataFrame] = {}
-        logger.debug("Querying for distribution buses...")
-        datasets[DistributionBus] = query_distribution_buses(self.graph)
-
-        logger.debug("Querying for AC line segments...")
-        datasets[MatrixImpedanceBranch] = query_line_segments(self.graph)
-
-        logger.debug("Querying for line codes...")
-        datasets[MatrixImpedanceBranchEquipment] = query_line_codes(self.graph)
-
-        logger.debug("Querying for loads...")
-        datasets[DistributionLoad] = query_loads(self.graph)
-
-        logger.debug("Querying for capacitors...")
-        datasets[DistributionCapacitor] = query_capacitors(self.graph)
-
-        logger.debug("Querying for transformers...")
-        xfmr_data = query_power_transformers(self.graph)
-        logger.debug("Querying for transformer windings...")
-        winding_data = query_transformer_windings(self.graph)
-        datasets[DistributionTransformer] = self._build_xfmr_dataset(xfmr_data, winding_data)
-
-        logger.debug("Querying for regulators...")
-        regulator_data = query_distribution_regulators(self.graph)
-        datasets[DistributionRegulator] = self._build_xfmr_dataset(regulator_data)
+        logger.debug("Querying for CIM components...")
+        planner = QueryPlanner(self.graph, self.query_workers, self.profiler)
+        with self.profiler.stage("queries"):
+            results = planner.run(
+                {
+                    "distribution_buses": query_distribution_buses,
+                    "line_segments": query_line_segments,
+                    "line_codes": query_line_codes,
+                    "loads": query_loads,
+                    "capacitors": query_capacitors,
+                    "power_transformers": query_power_transformers,
+                    "transformer_windings": query_transformer_windings,
+                    "distribution_regulators": query_distribution_regulators,
+                    "source": query_source,
+                    "regulator_controllers": query_regulator_controllers,
+                    "load_break_switches": query_load_break_switches,
+                }
+            )
 
-        logger.debug("Querying for sources...")
-        datasets[DistributionVoltageSource] = query_source(self.graph)
-
-        logger.debug("Querying for regulator controllers...")
-        datasets[RegulatorController] = query_regulator_controllers(self.graph)
-
-        logger.debug("Querying for load break switches...")
-        datasets[MatrixImpedanceSwitch] = query_load_break_switches(self.graph)
+        datasets: dict[DistributionComponentBase, pd.DataFrame] = {}
+        datasets[DistributionBus] = results["distribution_buses"]
+        datasets[MatrixImpedanceBranch] = results["line_segments"]
+        datasets[MatrixImpedanceBranchEquipment] = results["line_codes"]
+        datasets[DistributionLoad] = results["loads"]
+        datasets[DistributionCapacitor] = results["capacitors"]
+        datasets[DistributionTransformer] = self._build_xfmr_dataset(
+            results["power_transformers"], results["transformer_windings"]
+        )
+        datasets[DistributionRegulator] = self._build_xfmr_dataset(
+            results["distribution_regulators"]
+        )
+        datasets[DistributionVoltageSource] = results["source"]
+        datasets[RegulatorController] = results["regulator_controllers"]
+        datasets[MatrixImpedanceSwitch] = results["load_break_switches"]
 
         datasets[DistributionBus] = self._set_bus_phases(datasets)
 
@@ -117,85 +149,101 @@ class Reader(AbstractReader):
             self.system.add_components(*components)
         logger.info("System summary: ", self.system.info())
 
+    @property
+    def read_timings(self) -> dict[str, float]:
+        """Wall time in seconds of parsing the file and of the queries"""
+        return self.profiler.get_timings()
+
+    def get_profile_report(self) -> ProfileReport:
+        """Returns the profiling report of the read, with the wall time, CPU time and row count
+        of every query
+
+        Returns:
+            ProfileReport: Profiling report
+        """
+
+        return self.profiler.get_report()
+
     def _build_xfmr_dataset(
         self, xfmr_data: pd.DataFrame, winding_df: pd.DataFrame = pd.DataFrame()
     ) -> pd.DataFrame:
-        xfmrs = xfmr_data["xfmr"].unique()
-        xfms = []
-        for xfmr in xfmrs:
-            xfmr_df = xfmr_data[xfmr_data["xfmr"] == xfmr]
-            xfmr_df.pop("xfmr")
-            windings = xfmr_df.pop("winding").unique()
-            buses = xfmr_df.pop("bus").unique()
-            xfmr_df = xfmr_df.drop_duplicates()
-            wdgs = []
-            for winding, (_, winding_data) in zip(windings, xfmr_df.iterrows()):
-                winding_data.index = [f"wdg_{winding}_" + c for c in winding_data.index]
-                wdgs.append(winding_data)
-            wdgs = pd.concat(wdgs)
-            wdgs["bus_1"] = buses[0]
-            wdgs["bus_2"] = buses[1]
-            wdgs["xfmr"] = xfmr
-            for _, wdg_coupling_data in winding_df.iterrows():
-                xfmr_ends = {wdg_coupling_data["xfmr_end_1"], wdg_coupling_data["xfmr_end_2"]}
-                intersection = xfmr_ends.intersection(wdgs.to_list())
-                if intersection:
-                    wdgs["r0"] = wdg_coupling_data["r0"]
-                    wdgs["r1"] = wdg_coupling_data["r1"]
-                    wdgs["x0"] = wdg_coupling_data["x0"]
-                    wdgs["x1"] = wdg_coupling_data["x1"]
-                    wdgs["winding"] = wdg_coupling_data["winding"]
-            xfms.append(wdgs)
-
-        xfmr_dataset = pd.DataFrame(xfms)
-        return xfmr_dataset
+        # the distinct rows of a transformer, without its buses, are numbered in order and
+        # labeled with its distinct winding numbers in order of appearance
+        ends = xfmr_data.drop(columns=["winding", "bus"]).drop_duplicates()
+        ends["number"] = ends.groupby("xfmr").cumcount()
+        windings = xfmr_data[["xfmr", "winding"]].drop_duplicates()
+        windings["number"] = windings.groupby("xfmr").cumcount()
+        ends = ends.merge(windings, on=["xfmr", "number"])
+        buses = xfmr_data[["xfmr", "bus"]].drop_duplicates()
+        buses["number"] = buses.groupby("xfmr").cumcount()
+
+        end_columns = ends.columns.difference(["xfmr", "number", "winding"], sort=False)
+        xfmr_dataset = pd.concat(
+            [
+                ends.loc[ends["winding"] == winding, ["xfmr", *end_columns]]
+                .set_index("xfmr")
+                .add_prefix(f"wdg_{winding}_")
+                for winding in ends["winding"].unique()
+            ],
+            axis=1,
+        ).reindex(xfmr_data["xfmr"].unique())
+        for number, column in enumerate(["bus_1", "bus_2"]):
+            xfmr_dataset[column] = buses[buses["number"] == number].set_index("xfmr")["bus"]
+        xfmr_dataset["xfmr"] = xfmr_dataset.index
+
+        if not winding_df.empty:
+            # mesh impedances of the transformer ends, the last matching one is kept
+            couplings = winding_df.reset_index(drop=True)
+            coupled_ends = pd.concat([couplings["xfmr_end_1"], couplings["xfmr_end_2"]])
+            coupled_ends = pd.DataFrame(
+                {"xfmr_end": coupled_ends.values, "coupling": coupled_ends.index}
+            )
+            coupling = (
+                ends[["xfmr", "xfmr_end"]]
+                .merge(coupled_ends, on="xfmr_end")
+                .groupby("xfmr")["coupling"]
+                .max()
+            )
+            coupling_columns = ["r0", "r1", "x0", "x1", "winding"]
+            xfmr_dataset[coupling_columns] = couplings.loc[
+                coupling.values, coupling_columns
+            ].set_index(coupling.index)
+
+        return xfmr_dataset.reset_index(drop=True)
 
     def _set_bus_phases(
         self, df_dict: dict[DistributionComponentBase, pd.DataFrame]
     ) -> pd.DataFrame:
-        all_phases = []
         bus_df = df_dict.pop(DistributionBus)
-        for _, bus_data in bus_df.iterrows():
-            bus_name = bus_data["bus"]
-            phases = []
-
-            for df_type in df_dict:
-                df = df_dict[df_type]
-                bus_subset = {"bus", "bus_1", "bus_2"}
-                phase_subset = {"phase", "phases_1", "phases_2"}
-
-                bus_cols = bus_subset.intersection(df.columns)
-                phase_cols = phase_subset.intersection(df.columns)
-
-                if isinstance(df, pd.DataFrame) and len(bus_cols) and len(phase_cols):
-                    for bus_col in bus_subset:
-                        if bus_col in df.columns:
-                            filt_data = df[df[bus_col] == bus_name]
-                            if not filt_data.empty:
-                                for phase_col in phase_subset:
-                                    phase_list = filt_data.get(
-                                        phase_col, default=pd.Series()
-                                    ).to_list()
-                                    phase_list = [
-                                        phase.replace(",", "").replace("N", "")
-                                        for phase in phase_list
-                                        if phase is not None
-                                    ]
-                                    phase_list = [
-                                        list(phase) for phase in phase_list if len(phase) >= 1
-                                    ]
-                                    for ph_lst in phase_list:
-                                        phases.extend(ph_lst)
-
-            phases = set(phases)
-            phases = phases.difference({None})
-            phases = [phase for phase in list(phases) if len(phase) == 1]
-            phases = sorted(phases)
-            if not phases:
-                phases = ["A", "B", "C"]
-            all_phases.append(",".join(phases))
-
-        bus_df["phase"] = all_phases
+        bus_columns = ["bus", "bus_1", "bus_2"]
+        phase_columns = ["phase", "phases_1", "phases_2"]
+
+        # every phase column of a row counts for each bus the row is connected to
+        bus_phases = []
+        for df in df_dict.values():
+            bus_cols = [column for column in bus_columns if column in df.columns]
+            phase_cols = [column for column in phase_columns if column in df.columns]
+            if bus_cols and phase_cols:
+                bus_phases.append(
+                    df[bus_cols + phase_cols]
+                    .melt(id_vars=phase_cols, value_vars=bus_cols, value_name="bus_name")
+                    .melt(id_vars="bus_name", value_vars=phase_cols, value_name="phases")
+                    .loc[:, ["bus_name", "phases"]]
+                )
+
+        phases = pd.Series(dtype=object)
+        if bus_phases:
+            bus_phases = pd.concat(bus_phases, ignore_index=True).dropna()
+            bus_phases["phases"] = (
+                bus_phases["phases"].str.replace(",", "").str.replace("N", "").map(list)
+            )
+            bus_phases = bus_phases.explode("phases").dropna().drop_duplicates()
+            phases = (
+                bus_phases.sort_values(["bus_name", "phases"])
+                .groupby("bus_name", sort=False)["phases"]
+                .agg(",".join)
+            )
+        bus_df["phase"] = bus_df["bus"].map(phases).fillna("A,B,C")
         return bus_df
 
     def get_system(self) -> DistributionSystem:
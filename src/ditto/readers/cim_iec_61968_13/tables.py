@@ -0,0 +1,388 @@
+from typing import Iterable, Iterator
+from urllib.parse import urljoin
+from pathlib import Path
+import xml.etree.ElementTree as ET
+import sys
+import re
+
+from rdflib.plugins.sparql.parserutils import CompValue
+from rdflib import Graph, Literal, URIRef, Variable
+from rdflib.namespace import RDF
+from loguru import logger
+import pandas as pd
+
+from ditto.readers.cim_iec_61968_13.queries import SPARQL_QUERIES, prepare_query
+
+RDF_NAMESPACE = str(RDF)
+RDF_ABOUT = f"{{{RDF_NAMESPACE}}}about"
+RDF_ID = f"{{{RDF_NAMESPACE}}}ID"
+RDF_RESOURCE = f"{{{RDF_NAMESPACE}}}resource"
+XML_BASE = "{http://www.w3.org/XML/1998/namespace}base"
+CIM_PREFIX = "cim"
+POSITION_COLUMN = "position"
+
+_CLASS_PATTERN = re.compile(r"rdf:type\s+cim:(\w+)")
+_PROPERTY_PATTERN = re.compile(r"cim:(\w+\.\w+)")
+
+
+def get_query_terms(queries: Iterable[str]) -> tuple[frozenset[str], frozenset[str]]:
+    """Returns the CIM classes matched by `rdf:type` patterns and the CIM properties used by
+    SPARQL queries, commented out patterns included
+
+    Args:
+        queries (Iterable[str]): SPARQL queries using the `cim` prefix
+
+    Returns:
+        tuple[frozenset[str], frozenset[str]]: Class names and property names, e.g. `Terminal`
+            and `Terminal.ConnectivityNode`
+    """
+
+    classes, properties = set(), set()
+    for query in queries:
+        classes.update(_CLASS_PATTERN.findall(query))
+        properties.update(_PROPERTY_PATTERN.findall(query))
+    return frozenset(classes), frozenset(properties)
+
+
+QUERY_CLASSES, QUERY_PROPERTIES = get_query_terms(SPARQL_QUERIES.values())
+
+
+def _split_tag(tag: str) -> tuple[str, str]:
+    namespace, _, local_name = tag[1:].partition("}")
+    return namespace, local_name
+
+
+def _iter_objects(cim_file: Path, namespaces: dict[str, str]) -> Iterator[tuple[str, ET.Element]]:
+    """Yields the base URI and the element of every object (child of the root element) of an
+    RDF/XML file once parsed, the element is cleared after it is consumed. Namespaces are added
+    to `namespaces` as they are declared."""
+
+    base, root, depth = cim_file.absolute().as_uri(), None, 0
+    for event, item in ET.iterparse(cim_file, events=("start-ns", "start", "end")):
+        if event == "start-ns":
+            namespaces.setdefault(*item)
+        elif event == "start":
+            if root is None:
+                root = item
+                base = item.get(XML_BASE, base)
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 1:
+                yield base, item
+                root.clear()
+
+
+def _get_subject(element: ET.Element, base: str) -> str | None:
+    about = element.get(RDF_ABOUT)
+    if about is not None:
+        return sys.intern(urljoin(base, about))
+    rdf_id = element.get(RDF_ID)
+    return None if rdf_id is None else sys.intern(f"{base}#{rdf_id}")
+
+
+def _get_rows(
+    element: ET.Element,
+    base: str,
+    cim_namespace: str,
+    properties: set[str],
+    references: set[str],
+) -> list[dict[str, str]]:
+    """Returns the kept property values of an object, repeated properties are moved to
+    additional rows. Properties holding references are added to `references`."""
+
+    rows = [{}]
+    for child in element:
+        namespace, property_name = _split_tag(child.tag)
+        if namespace != cim_namespace or property_name not in properties:
+            continue
+        resource = child.get(RDF_RESOURCE)
+        if resource is None:
+            value = child.text or ""
+        else:
+            value = sys.intern(urljoin(base, resource))
+            references.add(property_name)
+        row = next((row for row in rows if property_name not in row), None)
+        if row is None:
+            row = {}
+            rows.append(row)
+        row[property_name] = value
+    return rows
+
+
+def _join(left: pd.DataFrame, right: pd.DataFrame, how: str) -> pd.DataFrame:
+    """Joins solutions on their shared variables, cross joins solutions without shared variables"""
+
+    on = [column for column in right.columns if column in left.columns]
+    if not on:
+        if how == "left" and right.empty:
+            return left.assign(**{column: None for column in right.columns})
+        return left.merge(right, how="cross")
+    if left[on].isna().any(axis=None) or right[on].isna().any(axis=None):
+        msg = "Joins on variables unbound by an OPTIONAL pattern are not supported"
+        raise NotImplementedError(msg)
+    return left.merge(right, on=on, how=how)
+
+
+def _get_variables(triple: tuple) -> set[str]:
+    return {str(term) for term in triple if isinstance(term, Variable)}
+
+
+class _ClassTable:
+    """Column lists of the objects of a class, missing values are None"""
+
+    def __init__(self) -> None:
+        self.subjects: list[str] = []
+        self.columns: dict[str, list] = {POSITION_COLUMN: []}
+
+    def append(self, subject: str, position: int, row: dict[str, str]):
+        index = len(self.subjects)
+        self.subjects.append(subject)
+        self.columns[POSITION_COLUMN].append(position)
+        for property_name, value in row.items():
+            column = self.columns.setdefault(property_name, [])
+            column.extend([None] * (index - len(column)))
+            column.append(value)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        for column in self.columns.values():
+            column.extend([None] * (len(self.subjects) - len(column)))
+        index = pd.Index(self.subjects, name="subject")
+        table = pd.DataFrame(self.columns, index=index, dtype=object)
+        return table.astype({POSITION_COLUMN: int})
+
+
+class CimTables:
+    """Compact per-class tables of the objects of a CIM RDF/XML file
+
+    Files are read with an incremental XML parser, each object is indexed and released as soon as
+    it is parsed. Only the properties in `properties` are kept, objects are kept if their class is
+    in `classes` or they have one of the kept properties. Memory is bounded by the kept data
+    rather than by the triple count of the file, the defaults keep the classes and properties used
+    by the reader queries.
+
+    Every class has a table indexed by the object URIs with one column of string values per kept
+    property, and a `position` column with the position of the object in the file. References
+    hold the URI of the referenced object, resolved like RDF/XML parsers do, and are listed in
+    `references`. An object repeating a property gets an additional row with the repeated values.
+    Literal datatypes and objects without URIs (blank nodes) are not kept.
+    """
+
+    def __init__(
+        self,
+        tables: dict[str, pd.DataFrame],
+        references: set[str],
+        namespaces: dict[str, str],
+    ) -> None:
+        """
+        Args:
+            tables (dict[str, pd.DataFrame]): Object tables keyed by class name
+            references (set[str]): Properties holding object references
+            namespaces (dict[str, str]): Namespaces of the file keyed by prefix, `cim` included
+        """
+        self.tables = tables
+        self.references = references
+        self.namespaces = namespaces
+        self._properties: dict[str, pd.DataFrame] = {}
+
+    @property
+    def cim_namespace(self) -> str:
+        return self.namespaces[CIM_PREFIX]
+
+    @classmethod
+    def from_xml(
+        cls,
+        cim_file: Path | str,
+        classes: Iterable[str] = QUERY_CLASSES,
+        properties: Iterable[str] = QUERY_PROPERTIES,
+    ) -> "CimTables":
+        """Streams a CIM RDF/XML file into per-class tables
+
+        Args:
+            cim_file (Path | str): Path to the CIM XML file
+            classes (Iterable[str], optional): Classes kept without kept properties.
+                Defaults to the classes matched by the reader queries.
+            properties (Iterable[str], optional): Properties kept. Defaults to the properties
+                used by the reader queries.
+
+        Returns:
+            CimTables: Tables of the kept objects
+        """
+
+        cim_file = Path(cim_file)
+        classes, properties = set(classes), set(properties)
+        namespaces, class_tables, references = {}, {}, set()
+        object_count, kept_count = 0, 0
+        for base, element in _iter_objects(cim_file, namespaces):
+            object_count += 1
+            cim_namespace = namespaces.get(CIM_PREFIX)
+            namespace, class_name = _split_tag(element.tag)
+            subject = _get_subject(element, base)
+            if subject is None or namespace != cim_namespace:
+                continue
+            rows = _get_rows(element, base, cim_namespace, properties, references)
+            if class_name not in classes and not rows[0]:
+                continue
+            kept_count += 1
+            table = class_tables.setdefault(class_name, _ClassTable())
+            for row in rows:
+                table.append(subject, object_count, row)
+
+        if CIM_PREFIX not in namespaces:
+            msg = f"{cim_file} does not declare the `{CIM_PREFIX}` namespace"
+            raise ValueError(msg)
+        tables = {name: table.to_dataframe() for name, table in class_tables.items()}
+        logger.debug(
+            f"Indexed {kept_count} of {object_count} objects "
+            f"in {len(tables)} class tables from {cim_file}"
+        )
+        return cls(tables, references, namespaces)
+
+    def to_graph(self) -> Graph:
+        """Returns an RDF graph of the kept objects, with the namespaces of the file bound
+
+        Returns:
+            Graph: Graph of the type and kept property triples of the kept objects
+        """
+
+        triples = []
+        for class_name, table in self.tables.items():
+            subjects = [URIRef(subject) for subject in table.index]
+            positions = table[POSITION_COLUMN].tolist()
+            class_uri = URIRef(self.cim_namespace + class_name)
+            triples.extend((p, -1, s, RDF.type, class_uri) for p, s in zip(positions, subjects))
+            properties = table.drop(columns=POSITION_COLUMN)
+            for column, (property_name, values) in enumerate(properties.items()):
+                predicate = URIRef(self.cim_namespace + property_name)
+                to_term = URIRef if property_name in self.references else Literal
+                triples.extend(
+                    (p, column, s, predicate, to_term(v))
+                    for p, s, v in zip(positions, subjects, values)
+                    if v is not None
+                )
+        # Triples are added in file order, queries return rows in the order of a full parse
+        triples.sort(key=lambda triple: triple[:2])
+
+        graph = Graph()
+        for prefix, namespace in self.namespaces.items():
+            graph.bind(prefix, namespace)
+        graph.addN((s, p, o, graph) for _, _, s, p, o in triples)
+        return graph
+
+    def get_objects(self, class_name: str) -> pd.Index:
+        """Returns the URIs of the objects of a class, in file order
+
+        Args:
+            class_name (str): CIM class name, e.g. `Terminal`
+
+        Returns:
+            pd.Index: Object URIs
+        """
+
+        if class_name not in self.tables:
+            return pd.Index([], dtype=object)
+        return self.tables[class_name].index.unique()
+
+    def get_property(self, property_name: str) -> pd.DataFrame:
+        """Returns the `subject` and `value` of every kept value of a property, of objects of
+        any class, in file order
+
+        Args:
+            property_name (str): CIM property name, e.g. `Terminal.ConnectivityNode`
+
+        Returns:
+            pd.DataFrame: Object URIs and their string values or referenced URIs
+        """
+
+        if property_name not in self._properties:
+            values = [
+                table[[POSITION_COLUMN, property_name]].dropna()
+                for table in self.tables.values()
+                if property_name in table.columns
+            ]
+            values = (
+                pd.concat(values)
+                if values
+                else pd.DataFrame(columns=[POSITION_COLUMN, property_name])
+            )
+            values = values.sort_values(POSITION_COLUMN, kind="stable")
+            self._properties[property_name] = pd.DataFrame(
+                {"subject": values.index.to_numpy(), "value": values[property_name].to_numpy()},
+                dtype=object,
+            )
+        return self._properties[property_name]
+
+    def select(self, query: str) -> pd.DataFrame:
+        """Runs a SPARQL select query as joins of the tables
+
+        Queries are parsed by rdflib, basic graph patterns of `rdf:type` and CIM property
+        patterns, joins and OPTIONAL patterns without filters are supported. Every triple pattern
+        is matched by a vectorized lookup of the class or property and joined to the solutions
+        on the shared variables, patterns sharing a variable with the solutions first. Only the
+        kept classes and properties are matched.
+
+        Args:
+            query (str): SPARQL select query, using the namespace prefixes of the file
+
+        Returns:
+            pd.DataFrame: A row per solution with a column per projected variable, values are
+                strings or URIs, None if unbound
+        """
+
+        algebra = prepare_query(query, tuple(self.namespaces.items())).algebra
+        if algebra.name != "SelectQuery" or algebra.p.name != "Project":
+            msg = "Only select queries are supported by the columnar tables"
+            raise NotImplementedError(msg)
+        data = self._evaluate(algebra.p.p)
+        variables = [str(variable) for variable in algebra.p.PV]
+        data = data.reindex(columns=variables).reset_index(drop=True).astype(object)
+        return data.where(data.notna(), None)
+
+    def _evaluate(self, pattern: CompValue) -> pd.DataFrame:
+        if pattern.name == "BGP":
+            return self._match_triples(pattern.triples)
+        if pattern.name == "Join":
+            return _join(self._evaluate(pattern.p1), self._evaluate(pattern.p2), "inner")
+        if pattern.name == "LeftJoin" and pattern.expr.name == "TrueFilter":
+            return _join(self._evaluate(pattern.p1), self._evaluate(pattern.p2), "left")
+        msg = f"{pattern.name} patterns are not supported by the columnar tables"
+        raise NotImplementedError(msg)
+
+    def _match_triples(self, triples: list[tuple]) -> pd.DataFrame:
+        pending, data = list(triples), None
+        while pending:
+            bound = set() if data is None else set(data.columns)
+            index = next(
+                (i for i, triple in enumerate(pending) if bound & _get_variables(triple)), 0
+            )
+            solutions = self._match_triple(pending.pop(index))
+            data = solutions if data is None else _join(data, solutions, "inner")
+        return data if data is not None else pd.DataFrame(index=[0])
+
+    def _match_triple(self, triple: tuple) -> pd.DataFrame:
+        subject, predicate, value = triple
+        if predicate == RDF.type:
+            if isinstance(value, Variable):
+                msg = "Variable classes are not supported by the columnar tables"
+                raise NotImplementedError(msg)
+            class_name = self._get_local_name(value)
+            data = pd.DataFrame({"subject": self.get_objects(class_name)}, dtype=object)
+            terms = {"subject": subject}
+        else:
+            data = self.get_property(self._get_local_name(predicate))
+            terms = {"subject": subject, "value": value}
+            if subject == value:
+                data = data[data["subject"] == data["value"]]
+                terms.pop("value")
+
+        for column, term in terms.items():
+            if not isinstance(term, Variable):
+                data = data[data[column] == str(term)]
+        variables = {c: str(term) for c, term in terms.items() if isinstance(term, Variable)}
+        return data[list(variables)].rename(columns=variables)
+
+    def _get_local_name(self, uri: URIRef) -> str:
+        if not uri.startswith(self.cim_namespace):
+            msg = f"{uri} is not in the CIM namespace {self.cim_namespace}"
+            raise NotImplementedError(msg)
+        return uri.removeprefix(self.cim_namespace)
@@ -0,0 +1,286 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from tempfile import TemporaryDirectory
+from pathlib import Path
+from typing import Any, Callable
+import multiprocessing
+import glob
+import time
+
+from gdm.distribution import DistributionSystem
+from infrasys import Component
+from loguru import logger
+
+from ditto.readers.opendss.components.loadshapes import TIME_SERIES_BATCH_SIZE
+from ditto.readers.reader import AbstractReader
+
+
+def read_feeder(master_file: Path, json_file: Path, reader_kwargs: dict) -> dict:
+    """Reads a single OpenDSS feeder and serializes the system to disk. Used as the worker
+    function of the batch reader, every worker process runs its own OpenDSS engine.
+
+    Args:
+        master_file (Path): Path to the Opendss master file
+        json_file (Path): Export path for the GDM model
+        reader_kwargs (dict): Keyword arguments passed to the OpenDSS reader
+
+    Returns:
+        dict: master file, json file, read time in seconds and error message (None on success)
+    """
+
+    from ditto.readers.opendss.reader import Reader
+
+    start = time.perf_counter()
+    try:
+        Reader(master_file, **reader_kwargs).to_json(json_file)
+        error = None
+    except Exception as e:
+        error = f"{e.__class__.__name__}: {e}"
+    return {
+        "master_file": master_file,
+        "json_file": json_file,
+        "elapsed": time.perf_counter() - start,
+        "error": error,
+    }
+
+
+def merge_systems(systems: dict[str, DistributionSystem]) -> DistributionSystem:
+    """Merges feeder systems into a single system
+
+    Components are moved to the merged system, named components whose type and name are
+    already used in the merged system are copied as `<feeder name>__<component name>` together
+    with the components of their feeder. Time series are copied with their features.
+
+    Args:
+        systems (dict[str, DistributionSystem]): mapping of feeder names to systems
+
+    Returns:
+        DistributionSystem: merged system
+    """
+
+    merged_system = DistributionSystem(auto_add_composed_components=True)
+    for feeder_name, system in systems.items():
+        components = list(system.iter_all_components())
+        names = {}
+        for component in components:
+            if component.name and merged_system.list_components_by_name(
+                type(component), component.name
+            ):
+                logger.debug(f"Renaming {component.label} from feeder {feeder_name}")
+                names[id(component)] = f"{feeder_name}__{component.name}"
+        time_series_owners = get_time_series_owners(system, components)
+        if names:
+            copies = copy_components(
+                components, lambda c: {"name": names[id(c)]} if id(c) in names else {}
+            )
+            components = [copies[id(component)] for component in components]
+            time_series_owners = [
+                (ts, features, [copies[id(owner)] for owner in owners])
+                for ts, features, owners in time_series_owners
+            ]
+        for component in components:
+            if not merged_system.has_component(component):
+                merged_system.add_component(component)
+        add_time_series_owners(merged_system, time_series_owners)
+    return merged_system
+
+
+def copy_components(
+    components: list[Component],
+    get_updates: Callable[[Component], dict[str, Any]],
+    copies: dict[int, Component] | None = None,
+) -> dict[int, Component]:
+    """Copies components with updated fields before they are added to another system. Names and
+    uuids are frozen because systems index components by them, so components are copied with
+    `model_copy` instead of being modified. References between the components, in fields or
+    lists, are replaced by references to the copies.
+
+    Args:
+        components (list[Component]): Components to copy
+        get_updates (Callable[[Component], dict[str, Any]]): Returns the updated fields of the
+            copy of a component
+        copies (dict[int, Component], optional): Replacements of referenced components by id of
+            the original, extended with the copies. Defaults to None.
+
+    Returns:
+        dict[int, Component]: Copies by id of the original component
+    """
+
+    copies = {} if copies is None else copies
+
+    def copy(component: Component) -> Component:
+        if id(component) not in copies:
+            updates = get_updates(component)
+            for field_name in type(component).model_fields:
+                value = getattr(component, field_name, None)
+                if isinstance(value, Component):
+                    updates[field_name] = copy(value)
+                elif isinstance(value, list) and any(isinstance(v, Component) for v in value):
+                    updates[field_name] = [
+                        copy(v) if isinstance(v, Component) else v for v in value
+                    ]
+            copies[id(component)] = component.model_copy(update=updates)
+        return copies[id(component)]
+
+    for component in components:
+        copy(component)
+    return copies
+
+
+def get_time_series_owners(
+    system: DistributionSystem, components: list[Component]
+) -> list[tuple[Any, dict, list[Component]]]:
+    """Returns the time series of the passed components with their features and owners, each
+    series is read once"""
+
+    owners = {}
+    time_series = {}
+    for component in components:
+        for metadata in system.list_time_series_metadata(component):
+            key = (metadata.time_series_uuid, metadata.name, tuple(metadata.features.items()))
+            if key not in time_series:
+                time_series[key] = system.get_time_series(
+                    component, name=metadata.name, **metadata.features
+                )
+            owners.setdefault(key, []).append(component)
+    return [(ts, dict(key[2]), owners[key]) for key, ts in time_series.items()]
+
+
+def add_time_series_owners(
+    system: DistributionSystem, time_series_owners: list[tuple[Any, dict, list[Component]]]
+):
+    """Adds time series returned by `get_time_series_owners` to a system"""
+
+    for ts, features, owners in time_series_owners:
+        for i in range(0, len(owners), TIME_SERIES_BATCH_SIZE):
+            system.add_time_series(ts, *owners[i : i + TIME_SERIES_BATCH_SIZE], **features)
+
+
+def _get_feeder_names(master_files: list[Path]) -> list[str]:
+    """Returns unique feeder names, the master file folder name suffixed with an index on clashes"""
+
+    names = []
+    for master_file in master_files:
+        name = master_file.parent.name or master_file.stem
+        unique_name, index = name, 1
+        while unique_name in names:
+            unique_name = f"{name}_{index}"
+            index += 1
+        names.append(unique_name)
+    return names
+
+
+class BatchReader(AbstractReader):
+    """Class interface to read multiple Opendss feeders in parallel"""
+
+    def __init__(
+        self,
+        master_files: list[Path] | str,
+        workers: int | None = None,
+        export_directory: Path | None = None,
+        **reader_kwargs,
+    ) -> None:
+        """Constructor for the batch Opendss reader
+
+        Args:
+            master_files (list[Path] | str): List of Opendss master files or a glob pattern
+            workers (int | None, optional): Number of worker processes. Defaults to the number of CPUs.
+            export_directory (Path | None, optional): Directory for the serialized feeder systems.
+                A temporary directory is used if None. Defaults to None.
+            reader_kwargs: Keyword arguments passed to the Opendss reader of every feeder
+        """
+
+        if isinstance(master_files, str):
+            master_files = sorted(glob.glob(master_files, recursive=True))
+        self.master_files = [Path(master_file) for master_file in master_files]
+        if not self.master_files:
+            msg = "No Opendss master files to read"
+            raise FileNotFoundError(msg)
+
+        self.workers = workers
+        self.reader_kwargs = reader_kwargs
+        self.feeder_names = _get_feeder_names(self.master_files)
+        self.systems: dict[str, DistributionSystem] = {}
+        self.timings: dict[str, float] = {}
+        self.errors: dict[str, str] = {}
+        self.system = None
+
+        if export_directory is None:
+            with TemporaryDirectory() as tmp_directory:
+                self._read(Path(tmp_directory))
+        else:
+            export_directory = Path(export_directory)
+            export_directory.mkdir(parents=True, exist_ok=True)
+            self._read(export_directory)
+
+    def _read(self, export_directory: Path):
+        """Reads every feeder in its own worker process and loads the serialized systems"""
+
+        start = time.perf_counter()
+        n_feeders = len(self.master_files)
+        results = {}
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    read_feeder,
+                    master_file,
+                    export_directory / f"{feeder_name}.json",
+                    self.reader_kwargs,
+                ): feeder_name
+                for feeder_name, master_file in zip(self.feeder_names, self.master_files)
+            }
+            for i, future in enumerate(as_completed(futures), start=1):
+                feeder_name = futures[future]
+                result = future.result()
+                results[feeder_name] = result
+                self.timings[feeder_name] = result["elapsed"]
+                status = "failed" if result["error"] else "read"
+                logger.info(
+                    f"[{i}/{n_feeders}] {feeder_name} {status} in {result['elapsed']:.2f}s "
+                    f"({result['master_file']})"
+                )
+
+        for feeder_name in self.feeder_names:
+            result = results[feeder_name]
+            if result["error"]:
+                self.errors[feeder_name] = result["error"]
+                logger.error(f"Failed to read {result['master_file']}: {result['error']}")
+            else:
+                self.systems[feeder_name] = DistributionSystem.from_json(result["json_file"])
+
+        logger.info(
+            f"Read {len(self.systems)}/{n_feeders} feeders in {time.perf_counter() - start:.2f}s"
+        )
+
+    def get_systems(self) -> dict[str, DistributionSystem]:
+        """Returns the feeder systems
+
+        Returns:
+            dict[str, DistributionSystem]: mapping of feeder names to DistributionSystem
+        """
+
+        return self.systems
+
+    def get_system(self) -> DistributionSystem:
+        """Returns a single DistributionSystem with all feeders merged. The feeder systems are
+        released once merged.
+
+        Returns:
+            DistributionSystem: Instance of DistributionSystem
+        """
+
+        if self.system is None:
+            self.system = merge_systems(self.systems)
+            self.systems = {}
+        return self.system
+
+    def to_json(self, json_file: Path | str):
+        """Exports the merged system to a json file
+
+        Args:
+            json_file (Path | str): Export path for the GDM model
+        """
+        self.get_system()
+        super().to_json(json_file)
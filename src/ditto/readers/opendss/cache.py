@@ -0,0 +1,222 @@
+from importlib.metadata import version
+from typing import Iterator
+from tempfile import mkdtemp
+from pathlib import Path
+import hashlib
+import shutil
+import shlex
+import json
+import os
+import re
+
+from gdm.distribution import DistributionSystem
+from loguru import logger
+
+import ditto
+
+
+SYSTEM_FILENAME = "system.json"
+
+INCLUDE_COMMANDS = {"redirect", "compile", "buscoords", "latlongcoords"}
+
+FILE_PROPERTY_PATTERN = re.compile(
+    r"\b(?:file|sngfile|dblfile|csvfile)\s*=\s*(\"[^\"]+\"|'[^']+'|[^\s\)\]]+)", re.IGNORECASE
+)
+
+
+def _strip_comment(line: str) -> str:
+    """Removes inline `!` and `//` comments from an Opendss command line"""
+
+    for marker in ("!", "//"):
+        index = line.find(marker)
+        if index >= 0:
+            line = line[:index]
+    return line.strip()
+
+
+def _parse_path(value: str) -> str:
+    """Removes quotes and enclosing brackets from a file name in an Opendss command"""
+
+    return value.strip().strip("()[]{}").strip("\"'")
+
+
+def _iter_command_lines(dss_file: Path) -> Iterator[str]:
+    """Yields the non empty command lines of an Opendss script without comments"""
+
+    block_comment = False
+    for line in dss_file.read_text(errors="replace").splitlines():
+        line = line.strip()
+        if block_comment:
+            block_comment = not line.startswith("*/")
+        elif line.startswith("/*"):
+            block_comment = "*/" not in line
+        elif line := _strip_comment(line):
+            yield line
+
+
+def get_input_files(master_file: Path) -> list[Path]:
+    """Returns the master file and every file it redirects to, compiles or loads data from
+
+    Files are found by scanning the Opendss scripts, without running them. Relative paths are
+    resolved the way Opendss does, from the folder of the script that references them; a
+    `compile` command also changes the folder for the rest of the script.
+
+    Args:
+        master_file (Path): Path to the Opendss master file
+
+    Returns:
+        list[Path]: Resolved input files in the order they are referenced
+    """
+
+    input_files = {}
+
+    def scan(dss_file: Path):
+        dss_file = dss_file.resolve()
+        if dss_file in input_files:
+            return
+        input_files[dss_file] = None
+        if not dss_file.exists():
+            return
+
+        current_directory = dss_file.parent
+        for line in _iter_command_lines(dss_file):
+            try:
+                tokens = shlex.split(line, posix=True)
+            except ValueError:
+                tokens = line.split()
+            command = tokens[0].lower()
+            if command in INCLUDE_COMMANDS and len(tokens) > 1:
+                included_file = current_directory / _parse_path(tokens[1])
+                if command in ("redirect", "compile"):
+                    scan(included_file)
+                    if command == "compile":
+                        current_directory = included_file.resolve().parent
+                else:
+                    input_files.setdefault(included_file.resolve(), None)
+            for match in FILE_PROPERTY_PATTERN.finditer(line):
+                input_files.setdefault(
+                    (current_directory / _parse_path(match.group(1))).resolve(), None
+                )
+
+    scan(Path(master_file))
+    return list(input_files)
+
+
+def compute_input_fingerprint(master_file: Path, reader_options: dict | None = None) -> str:
+    """Returns a content fingerprint of an Opendss model
+
+    The fingerprint covers the content of every input file, the ditto and GDM versions and the
+    reader options that change the parsed system. Missing input files are part of the fingerprint,
+    so creating them invalidates cached systems.
+
+    Args:
+        master_file (Path): Path to the Opendss master file
+        reader_options (dict | None, optional): Reader options that affect the parsed system. Defaults to None.
+
+    Returns:
+        str: Hex digest used as the cache key
+    """
+
+    master_file = Path(master_file).resolve()
+    digest = hashlib.sha256()
+    digest.update(f"ditto={ditto.__version__};gdm={version('grid-data-models')}".encode())
+    digest.update(json.dumps(reader_options or {}, sort_keys=True, default=str).encode())
+    for input_file in get_input_files(master_file):
+        digest.update(os.path.relpath(input_file, master_file.parent).encode())
+        if input_file.is_file():
+            digest.update(hashlib.sha256(input_file.read_bytes()).digest())
+        else:
+            digest.update(b"missing")
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """On-disk cache of parsed systems with size based LRU eviction
+
+    Each entry is a folder named after the cache key holding the serialized system and its time
+    series. Reading an entry refreshes its modification time, entries with the oldest time are
+    evicted first once the cache grows beyond its maximum size.
+    """
+
+    def __init__(self, cache_directory: Path, max_size_mb: float | None = None) -> None:
+        """
+        Args:
+            cache_directory (Path): Folder holding the cache entries
+            max_size_mb (float | None, optional): Maximum cache size in MB, unbounded if None. Defaults to None.
+        """
+        self.cache_directory = Path(cache_directory)
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+        self.max_size_mb = max_size_mb
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_directory / key
+
+    def get(self, key: str, **system_kwargs) -> DistributionSystem | None:
+        """Returns the cached system for the key, None on a cache miss
+
+        Args:
+            key (str): Cache key
+            system_kwargs: Keyword arguments passed to `DistributionSystem.from_json`
+
+        Returns:
+            DistributionSystem | None: Cached system
+        """
+
+        system_file = self._entry_path(key) / SYSTEM_FILENAME
+        if not system_file.exists():
+            return None
+        os.utime(self._entry_path(key))
+        logger.debug(f"Loading cached system from {system_file}")
+        return DistributionSystem.from_json(system_file, **system_kwargs)
+
+    def put(self, key: str, system: DistributionSystem):
+        """Serializes the system to the cache and evicts least recently used entries
+
+        Args:
+            key (str): Cache key
+            system (DistributionSystem): System to cache
+        """
+
+        entry_path = self._entry_path(key)
+        # entries are written to a staging folder first so readers never see partial entries
+        staging_directory = Path(mkdtemp(dir=self.cache_directory, prefix=".staging_"))
+        try:
+            system.to_json(staging_directory / SYSTEM_FILENAME, overwrite=True)
+            shutil.rmtree(entry_path, ignore_errors=True)
+            os.replace(staging_directory, entry_path)
+        except Exception:
+            shutil.rmtree(staging_directory, ignore_errors=True)
+            raise
+        logger.debug(f"Cached system in {entry_path}")
+        self.evict()
+
+    def size_mb(self) -> float:
+        """Returns the size of the cache entries in MB"""
+
+        return sum(self._get_entry_size(entry) for entry in self._get_entries()) / 1e6
+
+    def evict(self):
+        """Removes least recently used entries until the cache fits in its maximum size"""
+
+        if self.max_size_mb is None:
+            return
+        entries = sorted(self._get_entries(), key=lambda entry: entry.stat().st_mtime)
+        sizes = {entry: self._get_entry_size(entry) for entry in entries}
+        total_size = sum(sizes.values())
+        for entry in entries:
+            if total_size <= self.max_size_mb * 1e6:
+                break
+            logger.debug(f"Evicting cached system {entry.name}")
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= sizes[entry]
+
+    def _get_entries(self) -> list[Path]:
+        return [
+            entry
+            for entry in self.cache_directory.iterdir()
+            if entry.is_dir() and not entry.name.startswith(".")
+        ]
+
+    @staticmethod
+    def _get_entry_size(entry: Path) -> int:
+        return sum(f.stat().st_size for f in entry.rglob("*") if f.is_file())
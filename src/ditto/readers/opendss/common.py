@@ -1,11 +1,19 @@
-from enum import IntEnum
+from enum import Enum, IntEnum
 from typing import Any
-import ast
+import hashlib
+import weakref
+import math
+import json
 
 from gdm.distribution.components import DistributionVoltageSource
+from opendssdirect.enums import DSSJSONFlags
 from gdm.distribution.enums import Phase
 from infrasys import Component, System
+from pydantic import BaseModel
 import opendssdirect as odd
+import numpy as np
+import pandas as pd
+import pint
 
 
 PHASE_MAPPER = {
@@ -18,6 +26,8 @@ PHASE_MAPPER = {
 
 UNIT_MAPPER = {0: "m", 1: "mi", 2: "kft", 3: "km", 4: "m", 5: "ft", 6: "in", 7: "cm"}
 
+CLASS_EXPORT_FLAGS = DSSJSONFlags.Full | DSSJSONFlags.LowercaseKeys
+
 
 class LoadTypes(IntEnum):
     """Load types represented in Ditto"""
@@ -30,6 +40,108 @@ class LoadTypes(IntEnum):
     ZIP = 8
 
 
+class ModelFingerprint:
+    """Structural digest of infrasys components used for catalog deduplication
+
+    The digest is computed directly from field values (quantity magnitudes and units,
+    enum values, nested component digests) rather than from a serialized model, excluding
+    the key fields at every nesting level. Float values, scalars and arrays alike, are
+    rounded to 12 significant digits first, so models whose values only differ by round-off
+    noise get the same digest. Digests are blake2b hashes of the field values, stable across
+    processes and runs. Digests are cached per instance, keyed by object identity, and
+    dropped when the instance is garbage collected. Models are expected not to be mutated
+    once they have been fingerprinted.
+    """
+
+    def __init__(self, key_names: list[str] = ["name", "uuid"]):
+        """
+        Args:
+            key_names (list[str], optional): Fields excluded from the digest. Defaults to ["name", "uuid"].
+        """
+        self.key_names = frozenset(key_names)
+        self._cache: dict[int, tuple[weakref.ref, int]] = {}
+
+    def __call__(self, model: BaseModel) -> int:
+        """Return the digest of the passed model
+
+        Args:
+            model (BaseModel): Instance of a derived infrasys Component model
+
+        Returns:
+            int: model digest
+        """
+        model_id = id(model)
+        if model_id in self._cache:
+            return self._cache[model_id][1]
+        values = (
+            type(model).__name__,
+            tuple(
+                self._digest_value(getattr(model, field_name))
+                for field_name in type(model).model_fields
+                if field_name not in self.key_names
+            ),
+        )
+        digest = int.from_bytes(
+            hashlib.blake2b(repr(values).encode(), digest_size=8).digest(), "little"
+        )
+        try:
+            ref = weakref.ref(model, lambda _, key=model_id: self._cache.pop(key, None))
+        except TypeError:
+            return digest
+        self._cache[model_id] = (ref, digest)
+        return digest
+
+    def _digest_value(self, value: Any) -> Any:
+        if isinstance(value, BaseModel):
+            return self(value)
+        if isinstance(value, pint.Quantity):
+            return (self._digest_value(value.magnitude), str(value.units))
+        if isinstance(value, np.ndarray):
+            if np.issubdtype(value.dtype, np.floating):
+                value = _round_significant(value)
+            return (value.shape, tuple(value.ravel().tolist()))
+        if isinstance(value, Enum):
+            return value.value
+        if isinstance(value, float):
+            return _round_significant_float(value)
+        if isinstance(value, (list, tuple)):
+            return tuple(self._digest_value(item) for item in value)
+        if isinstance(value, dict):
+            return tuple(
+                (key, self._digest_value(item))
+                for key, item in value.items()
+                if key not in self.key_names
+            )
+        if isinstance(value, (set, frozenset)):
+            # sorted, the iteration order of sets of strings changes between processes
+            return tuple(sorted((self._digest_value(item) for item in value), key=repr))
+        return value
+
+    def clear(self):
+        """Drop all cached digests"""
+        self._cache.clear()
+
+
+def _round_significant(values: np.ndarray, digits: int = 12) -> np.ndarray:
+    """Round an array to significant digits so round-off noise does not split equipment"""
+    scale = np.zeros_like(values)
+    nonzero = np.isfinite(values) & (values != 0)
+    scale[nonzero] = 10.0 ** (digits - 1 - np.floor(np.log10(np.abs(values[nonzero]))))
+    rounded = values.copy()
+    rounded[nonzero] = np.round(values[nonzero] * scale[nonzero]) / scale[nonzero]
+    return rounded + 0.0
+
+
+def _round_significant_float(value: float, digits: int = 12) -> float:
+    """Round a float to significant digits, see `_round_significant`"""
+    if value == 0 or not math.isfinite(value):
+        return float(value) + 0.0
+    return round(float(value), digits - 1 - math.floor(math.log10(abs(value)))) + 0.0
+
+
+_FINGERPRINTS: dict[frozenset[str], ModelFingerprint] = {}
+
+
 def hash_model(model: Component, key_names: list[str] = ["name", "uuid"]) -> int:
     """Return hash of the passed model
 
@@ -40,11 +152,10 @@ def hash_model(model: Component, key_names: list[str] = ["name", "uuid"]) -> int
     Returns:
         int: model hash
     """
-    model_dict = (
-        model.model_dump()
-    )  # TODO: exclude={"name"} seems not to work  well with list of objects
-    cleaned_model = remove_keys_from_dict(model_dict, key_names)
-    return hash(str(cleaned_model))
+    keys = frozenset(key_names)
+    if keys not in _FINGERPRINTS:
+        _FINGERPRINTS[keys] = ModelFingerprint(key_names)
+    return _FINGERPRINTS[keys](model)
 
 
 def remove_keys_from_dict(model_dict: dict, key_names: list[str] = ["name", "uuid"]) -> dict:
@@ -103,28 +214,47 @@ def get_equipment_from_catalog(
             return model
 
 
-def query_model_data(model_type: str, model_name: str, property: str, dtype: type) -> Any:
-    """query OpenDSS model property
+def query_class_data(model_type: str) -> pd.DataFrame:
+    """Bulk query all properties for every element of an OpenDSS class
+
+    The active class is exported in a single call to the engine instead of issuing one
+    `? class.name.property` text command per property per element.
 
     Args:
-        model_type (str): OpenDSS model type
-        model_name (str): OpenDSS model name
-        property (str): OpenDSS model property
-        dtype (type): data type e.g. str, float
+        model_type (str): OpenDSS model type e.g. Transformer, WireData
 
     Returns:
-        Any: OpenDSS model property value
+        pd.DataFrame: OpenDSS model properties (lower case) indexed by the element name
     """
-    command = f"? {model_type}.{model_name}.{property}"
-    odd.Text.Command(command)
-    result = odd.Text.Result()
-    if result == "Property Unknown":
-        return None
-    if dtype is list:
-        result = result.replace("[ ", "[").replace(" ", ",")
-        return ast.literal_eval(result)
-    else:
-        return dtype(result)
+    odd.Circuit.SetActiveClass(model_type)
+    records = json.loads(odd.ActiveClass.ToJSON(CLASS_EXPORT_FLAGS))
+    data = pd.DataFrame(records, dtype=object)
+    if not data.empty:
+        data.index = data.pop("Name").str.lower()
+    return data
+
+
+def build_component_index(
+    system: System, component_types: list[type[Component]]
+) -> dict[str, Component]:
+    """Builds a name to component mapping for by-name lookups
+
+    Components are indexed in the order of the passed types, so when names collide across
+    types the component of the first type is kept.
+
+    Args:
+        system (System): Instance of an Infrasys System
+        component_types (list[type[Component]]): Component types to index
+
+    Returns:
+        dict[str, Component]: mapping of component name to component
+    """
+
+    index = {}
+    for component_type in component_types:
+        for component in system.get_components(component_type):
+            index.setdefault(component.name, component)
+    return index
 
 
 def get_source_bus(system: System) -> str:
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from uuid import uuid4
 from enum import Enum
 
@@ -37,7 +38,8 @@ import numpy as np
 
 from ditto.readers.opendss.common import (
     get_equipment_from_catalog,
-    query_model_data,
+    build_component_index,
+    query_class_data,
     PHASE_MAPPER,
     UNIT_MAPPER,
     hash_model,
@@ -49,13 +51,33 @@ class MatrixBranchTypes(str, Enum):
     LINE = "Lines"
 
 
+@dataclass(slots=True)
+class ProtectionDevices:
+    """Protection devices mapped to the lines they monitor"""
+
+    fuses: dict[str, dict]
+    reclosers: dict[str, dict | None]
+
+
+def get_protection_devices() -> ProtectionDevices:
+    """Returns the fuses and reclosers in the OpenDSS model, parsed once per read
+
+    Returns:
+        ProtectionDevices: fuses and reclosers mapped to the monitored line names
+    """
+    return ProtectionDevices(fuses=get_fuses(), reclosers=get_reclosers())
+
+
 def get_geometry_branch_equipments(
     system: System,
+    conductor_index: dict[str, BareConductorEquipment | ConcentricCableEquipment] | None = None,
 ) -> tuple[list[GeometryBranchEquipment], dict[str, int]]:
     """Helper function that return a list of GeometryBranchEquipment objects
 
     Args:
         system (System): Instance of System
+        conductor_index (dict[str, BareConductorEquipment | ConcentricCableEquipment] | None, optional):
+            mapping of wire names to conductor equipment. Built from the system if None. Defaults to None.
 
     Returns:
         list[GeometryBranchEquipment]: list of GeometryBranchEquipment objects
@@ -64,38 +86,23 @@ def get_geometry_branch_equipments(
 
     logger.debug("parsing geometry branch equipment...")
 
+    if conductor_index is None:
+        conductor_index = build_component_index(
+            system, [BareConductorEquipment, ConcentricCableEquipment]
+        )
     mapped_geometry = {}
     geometry_branch_equipment_catalog = {}
+    geometry_data = query_class_data("LineGeometry").to_dict(orient="index")
     flag = odd.LineGeometries.First()
 
     while flag > 0:
         geometry_name = odd.LineGeometries.Name().lower()
-        x_coordinates = []
-        y_coordinates = []
         units = UNIT_MAPPER[odd.LineGeometries.Units()[0].value]
-        odd.Text.Command(f"? LineGeometry.{geometry_name}.wires")
-        wires = odd.Text.Result().strip("[]").split(", ")
+        wires = [wire.split(".", 1)[-1].lower() for wire in geometry_data[geometry_name]["wires"]]
+        x_coordinates = geometry_data[geometry_name]["x"]
+        y_coordinates = geometry_data[geometry_name]["h"]
         model_name = odd.Element.Name().lower().split(".")[1]
-        conductor_elements = []
-
-        for i, wire in enumerate(wires):
-            odd.Text.Command(f"LineGeometry.{geometry_name}.cond={i + 1}")
-            odd.Text.Command(f"? LineGeometry.{geometry_name}.h")
-            y_coordinates.append(float(odd.Text.Result()))
-            odd.Text.Command(f"? LineGeometry.{geometry_name}.x")
-            x_coordinates.append(float(odd.Text.Result()))
-
-            equipments = list(
-                system.get_components(BareConductorEquipment, filter_func=lambda x: x.name == wire)
-            )
-            if not equipments:
-                equipments = list(
-                    system.get_components(
-                        ConcentricCableEquipment, filter_func=lambda x: x.name == wire
-                    )
-                )
-            equipment = equipments[0]
-            conductor_elements.append(equipment)
+        conductor_elements = [conductor_index[wire] for wire in wires]
 
         geometry_branch_equipment = GeometryBranchEquipment.model_construct(
             name=model_name,
@@ -181,19 +188,31 @@ def _build_distribution_switch_controller():
     return None
 
 
-def get_matrix_branch_equipments() -> (
-    tuple[dict[int, MatrixImpedanceBranchEquipment], dict[int, ThermalLimitSet]]
-):
+def get_matrix_branch_equipments(
+    protection_devices: ProtectionDevices | None = None,
+) -> tuple[
+    dict[int, MatrixImpedanceBranchEquipment],
+    dict[int, ThermalLimitSet],
+    dict[str, MatrixImpedanceBranchEquipment],
+]:
     """Function to return list of all MatrixImpedanceBranchEquipment in Opendss model.
 
+    Args:
+        protection_devices (ProtectionDevices | None, optional): fuses and reclosers in the model.
+            Parsed from the model if None. Defaults to None.
+
     Returns:
         dict[int, MatrixImpedanceBranchEquipment]: mapping of model hash to MatrixImpedanceBranchEquipment instance
         dict[int, ThermalLimitSet]: mapping of model hash to ThermalLimitSet instance
+        dict[str, MatrixImpedanceBranchEquipment]: mapping of line names to MatrixImpedanceBranchEquipment instance
     """
 
     logger.debug("parsing matrix branch equipment...")
-    reclosers = get_reclosers()
-    fuses = get_fuses()
+    if protection_devices is None:
+        protection_devices = get_protection_devices()
+    reclosers = protection_devices.reclosers
+    fuses = protection_devices.fuses
+    line_equipments = {}
     matrix_branch_equipments_catalog = {
         MatrixImpedanceRecloserEquipment.__name__: {},
         MatrixImpedanceSwitchEquipment.__name__: {},
@@ -227,7 +246,7 @@ def get_matrix_branch_equipments() -> (
                     model_type = MatrixImpedanceSwitchEquipment
                 else:
                     model_type = MatrixImpedanceBranchEquipment
-                _build_matrix_branch(
+                equipment = _build_matrix_branch(
                     odd_model_type,
                     matrix_branch_equipments_catalog,
                     thermal_limit_catalog,
@@ -235,8 +254,10 @@ def get_matrix_branch_equipments() -> (
                     fuse,
                     recloser,
                 )
+                if odd_model_type == MatrixBranchTypes.LINE.value:
+                    line_equipments[odd.Lines.Name().lower()] = equipment
             flag = module.Next()
-    return matrix_branch_equipments_catalog, thermal_limit_catalog
+    return matrix_branch_equipments_catalog, thermal_limit_catalog, line_equipments
 
 
 def get_branches(
@@ -245,6 +266,8 @@ def get_branches(
     geometry_branch_equipment_catalog: dict,
     matrix_branch_equipments_catalog: dict,
     thermal_limit_catalog: dict,
+    line_equipments: dict[str, MatrixImpedanceBranchEquipment] | None = None,
+    protection_devices: ProtectionDevices | None = None,
 ) -> tuple[list[MatrixImpedanceBranch | GeometryBranch]]:
     """Method to build a model branches
 
@@ -254,14 +277,20 @@ def get_branches(
         geometry_branch_equipment_catalog (dict): mapping of model hash to GeometryBranchEquipment instance
         matrix_branch_equipments_catalog (dict): mapping of model hash to MatrixImpedanceBranchEquipment instance
         thermal_limit_catalog (dict): mapping of model hash to ThermalLimitSet instance
+        line_equipments (dict[str, MatrixImpedanceBranchEquipment] | None, optional): mapping of line names
+            to equipment built in the equipment pass. Missing lines are built from the model. Defaults to None.
+        protection_devices (ProtectionDevices | None, optional): fuses and reclosers in the model.
+            Parsed from the model if None. Defaults to None.
 
     Returns:
         tuple[list[MatrixImpedanceBranch | GeometryBranch]]: Returns a list of system branches
     """
 
     logger.debug("parsing branch components...")
-    reclosers = get_reclosers()
-    fuses = get_fuses()
+    protection_devices = protection_devices or get_protection_devices()
+    line_equipments = line_equipments or {}
+    reclosers = protection_devices.reclosers
+    fuses = protection_devices.fuses
     branches = []
     flag = odd.Lines.First()
     while flag > 0:
@@ -314,7 +343,7 @@ def get_branches(
             else:
                 equipment_class = MatrixImpedanceBranchEquipment
                 model_class = MatrixImpedanceBranch
-            equipment = _build_matrix_branch(
+            equipment = line_equipments.get(odd.Lines.Name().lower()) or _build_matrix_branch(
                 MatrixBranchTypes.LINE.value,
                 matrix_branch_equipments_catalog,
                 thermal_limit_catalog,
@@ -322,9 +351,6 @@ def get_branches(
                 fuse,
                 recloser,
             )
-            equipment = get_equipment_from_catalog(
-                equipment, matrix_branch_equipments_catalog, equipment_class.__name__
-            )
             model_dict = {
                 "name": odd.Lines.Name().lower(),
                 "buses": [
@@ -354,17 +380,12 @@ def get_tcc_curves() -> dict[str, TimeCurrentCurve]:
         dict[str, TimeCurrentCurve]: mapped TimeCurrentCurve objects
     """
     curves = {}
-    odd.Circuit.SetActiveClass("tcc_curve")
-    flag = odd.ActiveClass.First()
-    while flag:
-        element_type, element_name = odd.Element.Name().split(".")
-        c_array = query_model_data(element_type, element_name, "c_array", list)
-        t_array = query_model_data(element_type, element_name, "t_array", list)
+    curve_data = query_class_data("TCC_Curve").to_dict(orient="index")
+    for element_name, element_data in curve_data.items():
         curves[element_name] = TimeCurrentCurve(
-            curve_x=Current(c_array, "ampere"),
-            curve_y=Time(t_array, "second"),
+            curve_x=Current(element_data["c_array"], "ampere"),
+            curve_y=Time(element_data["t_array"], "second"),
         )
-        flag = odd.ActiveClass.Next()
     return curves
 
 
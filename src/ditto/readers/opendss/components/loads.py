@@ -14,7 +14,7 @@ from infrasys.system import System
 import opendssdirect as odd
 from loguru import logger
 
-from ditto.readers.opendss.components.loadshapes import build_profiles, ObjectsWithProfile
+from ditto.readers.opendss.components.loadshapes import attach_profiles, ObjectsWithProfile
 from ditto.readers.opendss.common import PHASE_MAPPER, LoadTypes
 
 
@@ -82,11 +82,15 @@ def _build_load_equipment() -> tuple[LoadEquipment, list[str], str, list[str]]:
 #     """
 
 
-def get_loads(system: System) -> list[DistributionLoad]:
+def get_loads(
+    system: System, profile_catalog: dict | None = None, stream_time_series: bool = False
+) -> list[DistributionLoad]:
     """Function to return list of DistributionLoad in Opendss model.
 
     Args:
         system (System): Instance of System
+        profile_catalog (dict | None, optional): profile catalog shared with other component types. Defaults to None.
+        stream_time_series (bool, optional): release profiles once stored in the time series storage. Defaults to False.
 
     Returns:
         List[DistributionLoad]: List of DistributionLoad objects
@@ -94,7 +98,8 @@ def get_loads(system: System) -> list[DistributionLoad]:
 
     logger.debug("parsing load components...")
 
-    profile_catalog = {}
+    profile_catalog = {} if profile_catalog is None else profile_catalog
+    profile_components = {}
     loads = []
     flag = odd.Loads.First()
     while flag > 0:
@@ -102,26 +107,22 @@ def get_loads(system: System) -> list[DistributionLoad]:
         LoadEquipment, buses, nodes = _build_load_equipment()
         bus1 = buses[0].split(".")[0]
         profile_names = [odd.Loads.Daily(), odd.Loads.Yearly(), odd.Loads.Duty()]
-        profiles = build_profiles(profile_names, ObjectsWithProfile.LOAD, profile_catalog)
         distribution_load = DistributionLoad.model_construct(
             name=load_name,
             bus=system.get_component(DistributionBus, bus1),
             phases=[PHASE_MAPPER[el] for el in nodes],
             equipment=LoadEquipment,
         )
-        for profile_name in profile_names:
-            if profile_name in profiles:
-                for profile_type, ts_profile in profiles[profile_name].items():
-                    system.add_time_series(
-                        ts_profile["data"],
-                        distribution_load,
-                        profile_type=profile_type,
-                        profile_name=profile_name,
-                        use_actual=ts_profile["use_actual"],
-                    )
-                    logger.debug(
-                        f"Adding timeseries profile '{profile_name} / {profile_type}' to load '{load_name}'"
-                    )
+        for profile_name in dict.fromkeys(profile_names):
+            if profile_name:
+                profile_components.setdefault(profile_name, []).append(distribution_load)
         loads.append(distribution_load)
         flag = odd.Loads.Next()
+    attach_profiles(
+        system,
+        profile_components,
+        ObjectsWithProfile.LOAD,
+        profile_catalog,
+        stream_time_series,
+    )
     return loads
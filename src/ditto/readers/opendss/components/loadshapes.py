@@ -9,9 +9,11 @@ from infrasys.normalization import NormalizationMax, NormalizationByValue
 from gdm.quantities import ActivePower, ReactivePower, Irradiance
 from infrasys.time_series_models import SingleTimeSeries
 from infrasys.base_quantity import BaseQuantity
+from infrasys import Component, System
 from pydantic import BaseModel
 import opendssdirect as odd
 from loguru import logger
+import numpy as np
 
 
 class ObjectsWithProfile(Enum):
@@ -48,6 +50,8 @@ class ProfileMap(BaseModel):
         arbitrary_types_allowed = True
 
 
+INITIAL_TIME = datetime(year=2020, month=1, day=1)
+
 profile_type_to_base_type_map = {
     ProfileTypes.P_MULT: ProfileBases.P_BASE,
     ProfileTypes.Q_MULT: ProfileBases.Q_BASE,
@@ -84,58 +88,135 @@ model_type_to_profile_type_map = {
 }
 
 
+LOADSHAPE_DATA = "loadshape_data"
+# components per add_time_series call, the metadata store query grows with the number of components
+TIME_SERIES_BATCH_SIZE = 250
+
+
+def _get_loadshape_data(
+    profile_name: str, profile_type: ProfileTypes, loadshape_catalog: dict[str, dict]
+) -> dict:
+    """Reads the multipliers and settings of a LoadShape from the OpenDSS engine once
+
+    Args:
+        profile_name (str): name of the LoadShape
+        profile_type (ProfileTypes): multiplier to read
+        loadshape_catalog (dict[str, dict]): raw LoadShape data shared by all component types
+
+    Returns:
+        dict: multiplier array, base value, normalization flag, resolution and use_actual flag
+    """
+
+    key = (profile_name, profile_type)
+    if key not in loadshape_catalog:
+        profile_base = profile_type_to_base_type_map[profile_type]
+        odd.LoadShape.Name(profile_name)
+        loadshape_catalog[key] = {
+            "data": np.asarray(getattr(odd.LoadShape, profile_type.value)(), dtype=float),
+            "base": getattr(odd.LoadShape, profile_base.value)(),
+            "normalize": odd.LoadShape.Normalize(),
+            "resolution": timedelta(seconds=odd.LoadShape.SInterval()),
+            "use_actual": odd.LoadShape.UseActual(),
+        }
+    return loadshape_catalog[key]
+
+
 def build_profiles(
-    profile_names: list[str], component_type: ObjectsWithProfile, profile_catalog: dict[str,]
+    profile_names: list[str],
+    component_type: ObjectsWithProfile,
+    profile_catalog: dict[str,],
+    cache_loadshapes: bool = True,
 ) -> dict[str, dict[str, SingleTimeSeries]]:
     """Function to return dictionary of SingleTimeSeries objects representing load shapes in the Opendss model.
 
+    The catalog can be shared by all component types. LoadShape multipliers are read from the
+    engine once and reused for every component type referencing the same LoadShape.
+
     Args:
         profile_names (list[str]): list of profile names
         component_type (ObjectsWithProfile): type of component
         profile_catalog (dict[str,]): dictionary name mapping to  SingleTimeSeries objects in the
                                       following convention:
-                                      dict[profile_name, dict[profile_type, SingleTimeSeries]]
+                                      dict[component_type, dict[profile_name, dict[profile_type, SingleTimeSeries]]]
+        cache_loadshapes (bool, optional): keep LoadShape multipliers in the catalog for other component types. Defaults to True.
 
     Returns:
-        dict[str, dict[str, SingleTimeSeries]]: updated profile catalog is returned
+        dict[str, dict[str, SingleTimeSeries]]: updated profile catalog for the component type is returned
     """
 
     logger.debug("parsing timeseries components...")
+    component_profiles = profile_catalog.setdefault(component_type, {})
+    loadshape_catalog = profile_catalog.setdefault(LOADSHAPE_DATA, {}) if cache_loadshapes else {}
     for profile_name in profile_names:
-        if profile_name and profile_name not in profile_catalog:
+        if profile_name and profile_name not in component_profiles:
             profiles = {}
-            odd.LoadShape.Name(profile_name)
             for profile in model_type_to_profile_type_map[component_type]:
                 profile_type = profile.profile_type
-                profile_base = profile_type_to_base_type_map[profile_type]
-                profile_func = getattr(odd.LoadShape, profile_type.value)
-                base_func = getattr(odd.LoadShape, profile_base.value)
-                data = profile_func()
+                loadshape = _get_loadshape_data(profile_name, profile_type, loadshape_catalog)
+                data = loadshape["data"]
                 if len(data) > 1:
                     if profile.quantity:
                         data = profile.quantity(data, profile.units)
-                    length = odd.LoadShape.Npts()
-                    initial_time = datetime(year=2020, month=1, day=1)
-                    resolution = odd.LoadShape.SInterval()
-                    time_array = [
-                        initial_time + timedelta(seconds=i * resolution) for i in range(length)
-                    ]
-                    variable_name = profile.variable
-
-                    if odd.LoadShape.Normalize() and base_func():
-                        normalization = NormalizationByValue(value=base_func())
-                    elif odd.LoadShape.Normalize() and not base_func():
+
+                    if loadshape["normalize"] and loadshape["base"]:
+                        normalization = NormalizationByValue(value=loadshape["base"])
+                    elif loadshape["normalize"] and not loadshape["base"]:
                         normalization = NormalizationMax()
                     else:
                         normalization = None
 
-                    ts = SingleTimeSeries.from_time_array(
-                        data, variable_name, time_array, normalization=normalization
+                    ts = SingleTimeSeries.from_array(
+                        data,
+                        profile.variable,
+                        INITIAL_TIME,
+                        loadshape["resolution"],
+                        normalization=normalization,
                     )
                     profiles[profile_type.value] = {
                         "data": ts,
-                        "use_actual": odd.LoadShape.UseActual(),
+                        "use_actual": loadshape["use_actual"],
                     }
-            profile_catalog[profile_name] = profiles
+            component_profiles[profile_name] = profiles
+
+    return component_profiles
+
+
+def attach_profiles(
+    system: System,
+    profile_components: dict[str, list[Component]],
+    component_type: ObjectsWithProfile,
+    profile_catalog: dict[str,],
+    stream_time_series: bool = False,
+):
+    """Function to add LoadShape profiles to the components referencing them.
+
+    Each profile is added to the system time series storage once for all components referencing it.
+    When streaming, LoadShape data is not cached and profiles are dropped from the catalog as soon as
+    they are stored, so a single profile is held in memory at a time.
+
+    Args:
+        system (System): Instance of System
+        profile_components (dict[str, list[Component]]): mapping of profile names to components
+        component_type (ObjectsWithProfile): type of component
+        profile_catalog (dict[str,]): profile catalog, see `build_profiles`
+        stream_time_series (bool, optional): release profiles once stored. Defaults to False.
+    """
 
-    return profile_catalog
+    for profile_name, components in profile_components.items():
+        profiles = build_profiles(
+            [profile_name], component_type, profile_catalog, not stream_time_series
+        )
+        for profile_type, ts_profile in profiles.get(profile_name, {}).items():
+            for i in range(0, len(components), TIME_SERIES_BATCH_SIZE):
+                system.add_time_series(
+                    ts_profile["data"],
+                    *components[i : i + TIME_SERIES_BATCH_SIZE],
+                    profile_type=profile_type,
+                    profile_name=profile_name,
+                    use_actual=ts_profile["use_actual"],
+                )
+            logger.debug(
+                f"Adding timeseries profile '{profile_name} / {profile_type}' to {len(components)} components"
+            )
+        if stream_time_series:
+            profiles.pop(profile_name, None)
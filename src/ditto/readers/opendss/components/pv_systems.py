@@ -1,3 +1,4 @@
+from typing import Any
 from uuid import uuid4
 
 from gdm.distribution.enums import VoltageTypes
@@ -19,16 +20,22 @@ from infrasys.system import System
 import opendssdirect as odd
 from loguru import logger
 
-from ditto.readers.opendss.common import PHASE_MAPPER, get_equipment_from_catalog
-from ditto.readers.opendss.components.loadshapes import build_profiles, ObjectsWithProfile
+from ditto.readers.opendss.common import (
+    get_equipment_from_catalog,
+    query_class_data,
+    PHASE_MAPPER,
+)
+from ditto.readers.opendss.components.loadshapes import attach_profiles, ObjectsWithProfile
 
 
 def _build_pv_equipment(
+    pv_data: dict[str, Any],
     solar_equipment_catalog: dict[int, SolarEquipment],
 ) -> tuple[SolarEquipment, list[str], str, list[str]]:
     """Helper function to build a SolarEquipment instance
 
     Args:
+        pv_data (dict[str, Any]): mapping of Opendss property names to values for the pvsystem
         solar_equipment_catalog (dict[int, SolarEquipment]): mapping of model hash to SolarEquipment instance
 
     Returns:
@@ -38,12 +45,6 @@ def _build_pv_equipment(
     """
 
     logger.debug("parsing pvsystem equipment...")
-    pv_name = odd.PVsystems.Name()
-
-    def query(ppty):
-        odd.Text.Command(f"? pvsystem.{pv_name}.{ppty}")
-        return odd.Text.Result()
-
     equipment_uuid = uuid4()
     buses = odd.CktElement.BusNames()
     num_phase = odd.CktElement.NumPhases()
@@ -61,20 +62,24 @@ def _build_pv_equipment(
     solar_equipment = SolarEquipment.model_construct(
         name=str(equipment_uuid),
         rated_power=ActivePower(kw_dc, "kilova"),
-        resistance=float(query(r"%r")),
-        reactance=float(query(r"%x")),
-        rated_voltage=Voltage(float(query(r"kv")), "kilovolt"),
+        resistance=pv_data["%r"],
+        reactance=pv_data["%x"],
+        rated_voltage=Voltage(pv_data["kv"], "kilovolt"),
         voltage_type=voltage_type,
     )
     solar_equipment = get_equipment_from_catalog(solar_equipment, solar_equipment_catalog)
     return solar_equipment, buses, nodes
 
 
-def get_pvsystems(system: System) -> list[DistributionSolar]:
+def get_pvsystems(
+    system: System, profile_catalog: dict | None = None, stream_time_series: bool = False
+) -> list[DistributionSolar]:
     """Function to return list of DistributionSolar in Opendss model.
 
     Args:
         system (System): Instance of System
+        profile_catalog (dict | None, optional): profile catalog shared with other component types. Defaults to None.
+        stream_time_series (bool, optional): release profiles once stored in the time series storage. Defaults to False.
 
     Returns:
         List[DistributionSolar]: List of DistributionSolar objects
@@ -82,18 +87,17 @@ def get_pvsystems(system: System) -> list[DistributionSolar]:
 
     logger.debug("parsing pvsystem components...")
     solar_equipment_catalog = {}
-    profile_catalog = {}
+    profile_catalog = {} if profile_catalog is None else profile_catalog
+    profile_components = {}
     pv_systems = []
+    pv_data = query_class_data("PVSystem").to_dict(orient="index")
     flag = odd.PVsystems.First()
     while flag > 0:
         logger.debug(f"building pvsystem {odd.PVsystems.Name()}...")
         solar_name = odd.PVsystems.Name().lower()
-
-        def query(ppty):
-            odd.Text.Command(f"? pvsystem.{solar_name}.{ppty}")
-            return odd.Text.Result()
-
-        solar_equipment, buses, nodes = _build_pv_equipment(solar_equipment_catalog)
+        solar_equipment, buses, nodes = _build_pv_equipment(
+            pv_data[solar_name], solar_equipment_catalog
+        )
         bus1 = buses[0].split(".")[0]
         distribution_solar = DistributionSolar.model_construct(
             name=solar_name,
@@ -108,29 +112,24 @@ def get_pvsystems(system: System) -> list[DistributionSolar]:
                 rise_limit=None,
                 fall_limit=None,
                 eff_curve=None,
-                cutout_percent=float(query(r"%cutout")),
-                cutin_percent=float(query(r"%cutin")),
-                dc_to_ac_efficiency=float(query(r"%pmpp")),
+                cutout_percent=pv_data[solar_name]["%cutout"],
+                cutin_percent=pv_data[solar_name]["%cutin"],
+                dc_to_ac_efficiency=pv_data[solar_name]["%pmpp"],
             ),
             controller=None,
             equipment=solar_equipment,
         )
         profile_names = [odd.PVsystems.daily(), odd.PVsystems.yearly(), odd.PVsystems.duty()]
-        profiles = build_profiles(profile_names, ObjectsWithProfile.PV_SYSTEM, profile_catalog)
-
-        for profile_name in profile_names:
-            if profile_name in profiles:
-                for profile_type, ts_data in profiles[profile_name].items():
-                    system.add_time_series(
-                        ts_data["data"],
-                        distribution_solar,
-                        profile_type=profile_type,
-                        profile_name=profile_name,
-                        use_actual=ts_data["use_actual"],
-                    )
-                    logger.debug(
-                        f"Adding timeseries profile '{profile_name} / {profile_type}' to solar '{solar_name}'"
-                    )
+        for profile_name in dict.fromkeys(profile_names):
+            if profile_name:
+                profile_components.setdefault(profile_name, []).append(distribution_solar)
         pv_systems.append(distribution_solar)
         flag = odd.PVsystems.Next()
+    attach_profiles(
+        system,
+        profile_components,
+        ObjectsWithProfile.PV_SYSTEM,
+        profile_catalog,
+        stream_time_series,
+    )
     return pv_systems
@@ -1,3 +1,4 @@
+from typing import Any
 from uuid import uuid4
 
 from gdm.distribution.equipment import PhaseVoltageSourceEquipment, VoltageSourceEquipment
@@ -13,17 +14,23 @@ import opendssdirect as odd
 from infrasys import System
 from loguru import logger
 
-from ditto.readers.opendss.common import PHASE_MAPPER, get_equipment_from_catalog
-from ditto.readers.opendss.components.loadshapes import build_profiles, ObjectsWithProfile
+from ditto.readers.opendss.common import (
+    get_equipment_from_catalog,
+    query_class_data,
+    PHASE_MAPPER,
+)
+from ditto.readers.opendss.components.loadshapes import attach_profiles, ObjectsWithProfile
 
 
 def _build_voltage_source_equipment(
+    source_data: dict[str, Any],
     phase_voltage_source_equipment_catalog: dict[int, PhaseVoltageSourceEquipment],
     voltage_source_equipment_catalog: dict[int, VoltageSourceEquipment],
 ) -> tuple[VoltageSourceEquipment, list[str], str, list[str]]:
     """Helper function to build a VoltageSourceEquipment instance
 
     Args:
+        source_data (dict[str, Any]): mapping of Opendss property names to values for the vsource
         phase_voltage_source_equipment_catalog (dict[int, PhaseVoltageSourceEquipment]): mapping of model hash to PhaseVoltageSourceEquipment instance
         voltage_source_equipment_catalog (dict[int, VoltageSourceEquipment]): mapping of model hash to VoltageSourceEquipment instance
 
@@ -43,12 +50,7 @@ def _build_voltage_source_equipment(
     angle = odd.Vsources.AngleDeg()
     angles = [Angle(angle + i * (360.0 / num_phase), "degree") for i in range(num_phase)]
     phase_slacks = []
-    phase_src_properties = {}
-
-    for ppty in ["r0", "r1", "x0", "x1"]:
-        command_str = f"? vsource.{soure_name}.{ppty}"
-        odd.Text.Command(command_str)
-        phase_src_properties[ppty] = float(odd.Text.Result())
+    phase_src_properties = {ppty: source_data[ppty] for ppty in ["r0", "r1", "x0", "x1"]}
 
     for node, angle in zip(nodes, angles):
         voltage = Voltage(odd.Vsources.BasekV() * odd.Vsources.PU(), "kilovolt")
@@ -77,11 +79,15 @@ def _build_voltage_source_equipment(
     return slack_equipment, buses, soure_name, nodes
 
 
-def get_voltage_sources(system: System) -> list[DistributionVoltageSource]:
+def get_voltage_sources(
+    system: System, profile_catalog: dict | None = None, stream_time_series: bool = False
+) -> list[DistributionVoltageSource]:
     """Function to return list of all voltage sources in Opendss model.
 
     Args:
         system (System): Instance of System
+        profile_catalog (dict | None, optional): profile catalog shared with other component types. Defaults to None.
+        stream_time_series (bool, optional): release profiles once stored in the time series storage. Defaults to False.
 
     Returns:
         list[DistributionVoltageSource]: List of DistributionVoltageSource objects
@@ -90,21 +96,21 @@ def get_voltage_sources(system: System) -> list[DistributionVoltageSource]:
     logger.debug("parsing voltage sources components...")
     phase_voltage_source_equipment_catalog = {}
     voltage_source_equipment_catalog = {}
-    profile_catalog = {}
+    profile_catalog = {} if profile_catalog is None else profile_catalog
+    profile_components = {}
     voltage_sources = []
+    source_data = query_class_data("Vsource").to_dict(orient="index")
     flag = odd.Vsources.First()
     while flag:
         equipment, buses, soure_name, nodes = _build_voltage_source_equipment(
-            phase_voltage_source_equipment_catalog, voltage_source_equipment_catalog
+            source_data[odd.Vsources.Name().lower()],
+            phase_voltage_source_equipment_catalog,
+            voltage_source_equipment_catalog,
         )
         bus1 = buses[0].split(".")[0]
-
-        def query(property: str):
-            odd.Text.Command(f"? vsource.{soure_name}.{property}")
-            return odd.Text.Result()
-
-        profile_names = [query("yearly"), query("daily"), query("duty")]
-        profiles = build_profiles(profile_names, ObjectsWithProfile.SOURCE, profile_catalog)
+        profile_names = [
+            source_data[soure_name][ppty] or "" for ppty in ["yearly", "daily", "duty"]
+        ]
         voltage_source = DistributionVoltageSource.model_construct(
             name=soure_name,
             bus=system.get_component(DistributionBus, bus1),
@@ -112,19 +118,16 @@ def get_voltage_sources(system: System) -> list[DistributionVoltageSource]:
             equipment=equipment,
         )
 
-        for profile_name in profile_names:
-            if profile_name in profiles:
-                for profile_type, ts_profile in profiles[profile_name].items():
-                    system.add_time_series(
-                        ts_profile,
-                        voltage_source,
-                        profile_type=profile_type,
-                        profile_name=profile_name,
-                    )
-                    logger.debug(
-                        f"Adding timeseries profile '{profile_name} / {profile_type}' to voltage source '{soure_name}'"
-                    )
-
+        for profile_name in dict.fromkeys(profile_names):
+            if profile_name:
+                profile_components.setdefault(profile_name, []).append(voltage_source)
         voltage_sources.append(voltage_source)
         flag = odd.Vsources.Next()
+    attach_profiles(
+        system,
+        profile_components,
+        ObjectsWithProfile.SOURCE,
+        profile_catalog,
+        stream_time_series,
+    )
     return voltage_sources
@@ -1,5 +1,4 @@
 from collections import Counter
-from ast import literal_eval
 from typing import Any
 from uuid import uuid4
 from enum import Enum
@@ -23,7 +22,11 @@ from infrasys.system import System
 import opendssdirect as odd
 from loguru import logger
 
-from ditto.readers.opendss.common import PHASE_MAPPER, get_equipment_from_catalog
+from ditto.readers.opendss.common import (
+    get_equipment_from_catalog,
+    query_class_data,
+    PHASE_MAPPER,
+)
 
 SEQUENCE_PAIRS = [SequencePair(1, 2), SequencePair(1, 3), SequencePair(2, 3)]
 
@@ -35,6 +38,8 @@ class XfmrModelTypes(str, Enum):
 
 def _build_xfmr_equipment(
     model_type: str,
+    model_name: str,
+    model_data: dict[str, Any],
     distribution_transformer_equipment_catalog: dict[int, DistributionTransformerEquipment],
     winding_equipment_catalog: dict[int, WindingEquipment],
 ) -> tuple[DistributionTransformerEquipment, list[DistributionBus], list[Phase]]:
@@ -42,6 +47,8 @@ def _build_xfmr_equipment(
 
     Args:
         model_type (str): Opendss model type e.g. Transformer, XfmrCode
+        model_name (str): Opendss model name
+        model_data (dict[str, Any]): mapping of Opendss property names to values for the model
         distribution_transformer_equipment_catalog (dict[int, DistributionTransformerEquipment]): mapping of model hash to DistributionTransformerEquipment instance
         winding_equipment_catalog (dict[int, WindingEquipment]): mapping of model hash to WindingEquipment instance
 
@@ -51,70 +58,37 @@ def _build_xfmr_equipment(
         list[Phase]: List of Phase
     """
 
-    model_name = odd.Element.Name().lower().split(".")[1]
     if model_type == XfmrModelTypes.XFMRCODE.value:
         equipment_uuid = model_name
     else:
         equipment_uuid = str(uuid4())
 
-    def query(property: str, dtype: type):
-        command = f"? {model_type}.{model_name}.{property}"
-        odd.Text.Command(command)
-        result = odd.Text.Result()
-
-        if result is None:
-            if dtype in [float, int]:
-                return 0
-            elif dtype is str:
-                return ""
-            else:
-                return None
-        else:
-            if dtype is list:
-                return literal_eval(result)
-            else:
-                return dtype(result)
-
-    def set_ppty(property: str, value: Any):
-        return odd.Command(f"{model_type}.{model_name}.{property}={value}")
-
-    all_reactances = [
-        query("xhl", float),
-        query("xht", float),
-        query("xlt", float),
-    ]
-
-    number_windings = query("windings", int)
+    all_reactances = [model_data["xhl"], model_data["xht"], model_data["xlt"]]
+
+    number_windings = len(model_data["kvs"])
+    num_phase = model_data["phases"]
     wdg_nom_voltages = []
     windings = []
 
     for wdg_index in range(number_windings):
-        set_ppty("Wdg", wdg_index + 1)
-        num_phase = query("phases", int)
-        if query("conn", str).lower() == "delta":
-            rated_voltage = query("kv", float) / 1.732
-        else:
-            rated_voltage = query("kv", float) / 1.732 if num_phase == 3 else query("kv", float)
+        is_delta = model_data["conns"][wdg_index].lower() == "delta"
+        rated_voltage = model_data["kvs"][wdg_index]
+        if is_delta or num_phase == 3:
+            rated_voltage = rated_voltage / 1.732
         wdg_nom_voltages.append(rated_voltage)
-        min_tap_pu = query("mintap", float)
-        max_tap_pu = query("maxtap", float)
-        num_taps = query("numtaps", int)
-        taps = query("taps", list)
-        tap = [taps[wdg_index]] * num_phase
+        tap = [model_data["taps"][wdg_index]] * num_phase
         winding = WindingEquipment.model_construct(
-            rated_power=ApparentPower(query("kva", float), "kilova"),
+            rated_power=ApparentPower(model_data["kvas"][wdg_index], "kilova"),
             num_phases=num_phase,
-            connection_type=ConnectionType.DELTA
-            if query("conn", str).lower() == "delta"
-            else ConnectionType.STAR,
+            connection_type=ConnectionType.DELTA if is_delta else ConnectionType.STAR,
             rated_voltage=Voltage(rated_voltage, "kilovolt"),
-            resistance=query("%r", float),
+            resistance=model_data["%rs"][wdg_index],
             is_grounded=False,  # TODO: Should be moved to the transformer model. Only known once the transformer is installed
             voltage_type=VoltageTypes.LINE_TO_GROUND,
             tap_positions=tap,
-            total_taps=num_taps,
-            min_tap_pu=min_tap_pu,
-            max_tap_pu=max_tap_pu,
+            total_taps=model_data["numtaps"][wdg_index],
+            min_tap_pu=model_data["mintap"][wdg_index],
+            max_tap_pu=model_data["maxtap"][wdg_index],
         )
         winding = get_equipment_from_catalog(winding, winding_equipment_catalog)
         windings.append(winding)
@@ -124,8 +98,8 @@ def _build_xfmr_equipment(
 
     dist_transformer = DistributionTransformerEquipment.model_construct(
         name=equipment_uuid,
-        pct_no_load_loss=query(r"%noloadloss", float),
-        pct_full_load_loss=query(r"%loadloss", float),
+        pct_no_load_loss=model_data["%noloadloss"],
+        pct_full_load_loss=model_data["%loadloss"],
         windings=windings,
         coupling_sequences=coupling_sequences,
         winding_reactances=reactances,
@@ -151,15 +125,15 @@ def get_transformer_equipments(system: System) -> list[DistributionTransformerEq
     winding_equipment_catalog = {}
     odd_model_types = [v.value for v in XfmrModelTypes]
     for odd_model_type in odd_model_types:
-        odd.Circuit.SetActiveClass(odd_model_type)
-        flag = odd.ActiveClass.First()
-        while flag > 0:
+        model_data = query_class_data(odd_model_type).to_dict(orient="index")
+        for model_name, data in model_data.items():
             _build_xfmr_equipment(
                 odd_model_type,
+                model_name,
+                data,
                 distribution_transformer_equipment_catalog,
                 winding_equipment_catalog,
             )
-            flag = odd.ActiveClass.Next()
     return distribution_transformer_equipment_catalog, winding_equipment_catalog
 
 
@@ -182,9 +156,11 @@ def get_transformers(
     logger.debug("parsing transformer components...")
 
     transformers = []
+    transformer_data = query_class_data(XfmrModelTypes.TRANSFORMERS.value).to_dict(orient="index")
     flag = odd.Transformers.First()
     while flag > 0:
         logger.debug(f"building transformer {odd.Transformers.Name()}")
+        transformer_name = odd.Transformers.Name().lower()
         bus_names = odd.CktElement.BusNames()
         buses = []
         phases = []
@@ -196,11 +172,13 @@ def get_transformers(
             buses.append(system.get_component(DistributionBus, bus_name_clean))
         xfmr_equipment = _build_xfmr_equipment(
             XfmrModelTypes.TRANSFORMERS.value,
+            transformer_name,
+            transformer_data[transformer_name],
             distribution_transformer_equipment_catalog,
             winding_equipment_catalog,
         )
         transformer = DistributionTransformer.model_construct(
-            name=odd.Transformers.Name().lower(),
+            name=transformer_name,
             buses=buses,
             winding_phases=phases,
             equipment=xfmr_equipment,
@@ -9,6 +9,7 @@ from gdm.distribution.components import (
     DistributionBus,
 )
 from networkx import Graph, DiGraph
+from collections import defaultdict, deque
 
 import networkx as nx
 
@@ -25,6 +26,9 @@ def dfs_multidigraph(G: nx.MultiGraph, source: str) -> nx.MultiDiGraph:
 def update_split_phase_nodes(graph: Graph, system: DistributionSystem) -> DistributionSystem:
     """Return the system with corrected split phase representation
 
+    Every node downstream of a center tapped transformer is labeled with that transformer
+    in a single traversal, after which bus, branch and component phases are fixed in one pass.
+
     Args:
         graph (Graph):  Graph representation of the dirtribution model
         system (DistributionSystem): Instance of an gdm DistributionSystem
@@ -37,8 +41,38 @@ def update_split_phase_nodes(graph: Graph, system: DistributionSystem) -> Distri
     assert len(set(source_buses)) == 1, "Source bus should be singular"
     tree = dfs_multidigraph(graph, source=source_buses[0])
     split_phase_transformers = _get_split_phase_transformers(system)
+    if not split_phase_transformers:
+        return
+
+    lv_buses = {}
+    mapped_split_phases = {}
     for transformer in split_phase_transformers:
-        _get_split_phase_sub_graph(transformer, tree, system)
+        hv_xfmr_bus, lv_xfmr_bus = _get_transformer_buses(transformer, tree)
+        lv_buses[transformer.name] = lv_xfmr_bus
+        mapped_split_phases[transformer.name] = _get_mapped_split_phases(transformer)
+
+    node_labels = _label_split_phase_nodes(tree, lv_buses)
+    bus_components = _get_bus_connected_components(system)
+    for node, transformer_name in node_labels.items():
+        bus = system.get_component(DistributionBus, node)
+        bus.phases = _mapped_phases(mapped_split_phases[transformer_name], bus.phases)
+        for component in bus_components.get(node, []):
+            component.phases = [
+                mapped_split_phases[transformer_name][phase] for phase in component.phases
+            ]
+
+    for u, v, data in tree.edges(data=True):
+        if u in node_labels and node_labels[u] == node_labels.get(v):
+            model: DistributionBranchBase = system.get_component(data["type"], data["name"])
+            assert issubclass(
+                model.__class__, DistributionBranchBase
+            ), f"Unsupported model type {model.__class__.__name__}"
+            model.phases = _mapped_phases(mapped_split_phases[node_labels[u]], model.phases)
+
+    for transformer in split_phase_transformers:
+        _fix_transformer_phases(
+            mapped_split_phases[transformer.name], transformer, transformer.winding_phases[1:]
+        )
 
 
 def _get_split_phase_transformers(system: DistributionSystem) -> list[DistributionTransformer]:
@@ -58,18 +92,15 @@ def _get_split_phase_transformers(system: DistributionSystem) -> list[Distributi
     return list(split_phase_transformers)
 
 
-def _get_split_phase_sub_graph(
-    xfmr: DistributionTransformer, graph: DiGraph, system: DistributionSystem
-) -> Graph:
-    """returns the subgraph for a given distribution transformer
+def _get_transformer_buses(xfmr: DistributionTransformer, graph: DiGraph) -> tuple[str, str]:
+    """returns the HV and LV bus names for a given distribution transformer
 
     Args:
         xfmr(DistributionTransformer): instance of DistributionTransformer
         graph (DiGraph): Graph representation of the dirtribution model
-        system (DistributionSystem): Instance of an gdm DistributionSystem
 
     Returns:
-        Graph: subgraph for a given distribution transformer
+        tuple[str, str]: HV and LV bus names
     """
 
     xfmr_buses = list(
@@ -77,77 +108,73 @@ def _get_split_phase_sub_graph(
     )
     hv_xfmr_bus = max(xfmr_buses, key=lambda x: x[1])[0]
     lv_xfmr_bus = min(xfmr_buses, key=lambda x: x[1])[0]
-    xfmr.pprint()
-    xfmr_info = graph[hv_xfmr_bus][lv_xfmr_bus]
-
-    for k in xfmr_info:
-        assert (
-            xfmr_info[k]["type"] == DistributionTransformer
-        ), f"Unsupported model type {xfmr_info[k]['type']}"
-        model_type = xfmr_info[k]["type"]
-        xfmr_model = system.get_component(model_type, xfmr_info[k]["name"])
-
-        filter_nodes = []
-        for node, sucessors in nx.bfs_successors(graph, lv_xfmr_bus):
-            filter_nodes.append(node)
-            filter_nodes.extend(sucessors)
-
-        descendants = set(filter_nodes)
-        subgraph = graph.subgraph(descendants)
-        _get_components_in_subgraph(hv_xfmr_bus, xfmr_model, subgraph, system)
-        return
+    for data in graph[hv_xfmr_bus][lv_xfmr_bus].values():
+        assert data["type"] == DistributionTransformer, f"Unsupported model type {data['type']}"
+    return hv_xfmr_bus, lv_xfmr_bus
 
 
-def _get_components_in_subgraph(
-    hv_xfmr_bus: str,
-    xfmr_model: DistributionTransformer,
-    subgraph: Graph,
-    system: DistributionSystem,
-):
-    """fixes the split phase representation for the system
+def _get_mapped_split_phases(xfmr_model: DistributionTransformer) -> dict[Phase, Phase]:
+    """returns the mapping of A,B,C phases to S1/S2 phases for a split phase transformer
 
     Args:
-        hv_xfmr_bus (str): bus name for the distribution transformer (HV side)
         xfmr_model (DistributionTransformer): instance of DistributionTransformer
-        subgraph (Graph): subgraph (downstream) of a split phase dirtribution transformer
-        system (DistributionSystem): Instance of an gdm DistributionSystem
 
+    Returns:
+        dict[Phase, Phase]: mapping A,B,C phase to S1/S2 phase
     """
 
     secondary_wdg_phases = xfmr_model.winding_phases[1:]
-    xfmr_phases_filtered = []
     split_phases = [Phase.S1, Phase.S2]
     xfmr_phases_filtered = [
         phase for phase_lists in secondary_wdg_phases for phase in phase_lists if phase != Phase.N
     ]
-    mapped_split_phases = {k: v for k, v in zip(xfmr_phases_filtered, split_phases)}
-    _fix_bus_phases(hv_xfmr_bus, mapped_split_phases, subgraph, system)
-    _fix_transformer_phases(mapped_split_phases, xfmr_model, secondary_wdg_phases)
-    _fix_component_phases(mapped_split_phases, subgraph, system)
+    return {k: v for k, v in zip(xfmr_phases_filtered, split_phases)}
 
 
-def _fix_bus_phases(
-    hv_xfmr_bus: str, mapped_split_phases: dict, subgraph: Graph, system: DistributionSystem
-):
-    """method fixes phasing for distribution buses downstream of split phase transformers
+def _label_split_phase_nodes(graph: DiGraph, lv_buses: dict[str, str]) -> dict[str, str]:
+    """labels every node downstream of a split phase transformer with the transformer name
+
+    Args:
+        graph (DiGraph): Graph representation of the dirtribution model
+        lv_buses (dict[str, str]): mapping of split phase transformer names to LV bus names
+
+    Returns:
+        dict[str, str]: mapping of bus names to the governing split phase transformer name
+    """
+
+    node_labels = {}
+    queue = deque()
+    for transformer_name, lv_bus in lv_buses.items():
+        if lv_bus not in node_labels:
+            node_labels[lv_bus] = transformer_name
+            queue.append(lv_bus)
+    while queue:
+        node = queue.popleft()
+        for successor in graph.successors(node):
+            if successor not in node_labels:
+                node_labels[successor] = node_labels[node]
+                queue.append(successor)
+    return node_labels
+
+
+def _get_bus_connected_components(
+    system: DistributionSystem,
+) -> dict[str, list[DistributionLoad | DistributionCapacitor | DistributionSolar]]:
+    """returns a mapping of bus names to the loads, capacitors and PV systems connected to them
 
     Args:
-        hv_xfmr_bus (str): bus name for the distribution transformer (HV side)
-        mapped_split_phases (dict):  mapping A,B,C phase to S1/S2 phase
-        subgraph (Graph): subgraph (downstream) of a split phase dirtribution transformer
         system (DistributionSystem): Instance of an gdm DistributionSystem
+
+    Returns:
+        dict[str, list[DistributionLoad | DistributionCapacitor | DistributionSolar]]: bus to component adjacency
     """
-    for u in subgraph.nodes():
-        if u != hv_xfmr_bus:
-            bus = system.get_component(DistributionBus, u)
-            bus.phases = _mapped_phases(mapped_split_phases, bus.phases)
 
-    for _, _, data in subgraph.edges(data=True):
-        model: DistributionBranchBase = system.get_component(data["type"], data["name"])
-        assert issubclass(
-            model.__class__, DistributionBranchBase
-        ), f"Unsupported model type {model.__class__.__name__}"
-        model.phases = _mapped_phases(mapped_split_phases, model.phases)
+    bus_components = defaultdict(list)
+    component_types = [DistributionLoad, DistributionCapacitor, DistributionSolar]
+    for component_type in component_types:
+        for component in system.get_components(component_type):
+            bus_components[component.bus.name].append(component)
+    return bus_components
 
 
 def _mapped_phases(mapped_split_phases, phases):
@@ -185,18 +212,3 @@ def _fix_transformer_phases(
         )
         wdg_phases.append(new_phases)
     xfmr_model.winding_phases = wdg_phases
-
-
-def _fix_component_phases(mapped_split_phases: dict, subgraph: Graph, system: DistributionSystem):
-    """method fixes phasing for components downstream of split phase transformers
-
-    Args:
-        mapped_split_phases (dict): mapping A,B,C phase to S1/S2 phase
-        subgraph (Graph): subgraph (downstream) of a split phase dirtribution transformer
-        system (DistributionSystem): Instance of an gdm DistributionSystem
-    """
-    component_types = [DistributionLoad, DistributionCapacitor, DistributionSolar]
-    for node in subgraph.nodes():
-        for component_type in component_types:
-            for component in system.get_bus_connected_components(node, component_type) or []:
-                component.phases = [mapped_split_phases[phase] for phase in component.phases]
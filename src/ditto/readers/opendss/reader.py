@@ -1,14 +1,21 @@
+from concurrent.futures import ProcessPoolExecutor
+from collections import defaultdict
 from pathlib import Path
+import multiprocessing
 
+from gdm.distribution.equipment import BareConductorEquipment, ConcentricCableEquipment
 from gdm.distribution.common import SequencePair
 from gdm.distribution import DistributionSystem
 
+from infrasys.time_series_models import TimeSeriesStorageType
+from infrasys.base_quantity import ureg
 from pydantic import ValidationError
 from rich.console import Console
 from infrasys import Component
 from rich.table import Table
 import opendssdirect as odd
 from loguru import logger
+import pint
 
 from ditto.readers.opendss.components.conductors import get_conductors_equipment
 from ditto.readers.opendss.components.cables import get_cables_equipment
@@ -16,6 +23,8 @@ from ditto.readers.opendss.components.sources import get_voltage_sources
 from ditto.readers.opendss.components.capacitors import get_capacitors
 from ditto.readers.opendss.graph_utils import update_split_phase_nodes
 from ditto.readers.opendss.components.pv_systems import get_pvsystems
+from ditto.readers.opendss.cache import ParseCache, compute_input_fingerprint
+from ditto.readers.opendss.common import build_component_index
 from ditto.readers.opendss.components.buses import get_buses
 from ditto.readers.opendss.components.loads import get_loads
 from ditto.readers.opendss.components.transformers import (
@@ -25,58 +34,219 @@ from ditto.readers.opendss.components.transformers import (
 from ditto.readers.opendss.components.branches import (
     get_geometry_branch_equipments,
     get_matrix_branch_equipments,
+    get_protection_devices,
     get_branches,
 )
 
+from ditto.profiling import Profiler, ProfileReport
 from ditto.readers.reader import AbstractReader
+from ditto.enumerations import ValidationMode
 
 
 SEQUENCE_PAIRS = [SequencePair(1, 2), SequencePair(1, 3), SequencePair(2, 3)]
 
 
+def _initialize_validation_worker():
+    """Quantities are unpickled with the pint application registry, which has to be the
+    registry that defines the GDM units"""
+    pint.set_application_registry(ureg)
+
+
+def validate_components(
+    model_class: type[Component], components: list[tuple[str, dict]]
+) -> list[list[str]]:
+    """Validates dumped components of a single type and returns the validation error rows
+
+    Args:
+        model_class (type[Component]): Component class used to validate the records
+        components (list[tuple[str, dict]]): Component names and model dumps
+
+    Returns:
+        list[list[str]]: Rows for the validation error table
+    """
+
+    error_rows = []
+    for name, model_dict in components:
+        try:
+            model_class.model_validate(model_dict)
+        except ValidationError as e:
+            for error in e.errors():
+                error_rows.append(
+                    [
+                        name,
+                        model_class.__name__,
+                        error["loc"][0] if error["loc"] else "On model validation",
+                        error["type"],
+                        error["msg"],
+                    ]
+                )
+    return error_rows
+
+
 class Reader(AbstractReader):
     """Class interface for Opendss case file reader"""
 
-    validation_errors = []
-
     def __init__(
         self,
         Opendss_master_file: Path,
         crs: str | None = None,
         use_split_phase_representation: bool = True,
+        validation_mode: ValidationMode | str = ValidationMode.FULL,
+        validation_sample_size: int = 10,
+        validation_workers: int | None = None,
+        stream_time_series: bool = False,
+        time_series_directory: Path | None = None,
+        time_series_storage_type: TimeSeriesStorageType | str = TimeSeriesStorageType.ARROW,
+        cache_directory: Path | None = None,
+        cache_max_size_mb: float | None = None,
+        topology_only: bool = False,
+        trace_memory: bool = False,
     ) -> None:
         """Constructor for the Opendss reader
 
         Args:
             Opendss_master_file (Path): Path to the Opendss master file
             crs (str | None, optional): Coordinate reference system name. Defaults to None.
+            validation_mode (ValidationMode | str, optional): How built components are validated.
+                `full` validates every component as it is added, `sampled` validates the first
+                `validation_sample_size` components of each type, `deferred` validates every
+                component in a single batch once the system is built and `off` skips validation.
+                Defaults to ValidationMode.FULL.
+            validation_sample_size (int, optional): Components validated per type in `sampled` mode. Defaults to 10.
+            validation_workers (int | None, optional): Worker processes used in `deferred` mode. Validation
+                runs in the current process if None or 1. Defaults to None.
+            stream_time_series (bool, optional): Write each LoadShape profile to the time series storage
+                as soon as it is built and release it, instead of keeping all profiles in memory during
+                the read. Defaults to False.
+            time_series_directory (Path | None, optional): Directory for the on-disk time series storage.
+                A temporary directory is used if None. Defaults to None.
+            time_series_storage_type (TimeSeriesStorageType | str, optional): Time series storage backend.
+                The Arrow backend stores series on disk and reads them through memory maps.
+                Defaults to TimeSeriesStorageType.ARROW.
+            cache_directory (Path | None, optional): Directory of the parsed system cache. Systems are cached
+                by a content fingerprint of the master file, every file it references and the ditto and GDM
+                versions; on a cache hit the system is loaded without running Opendss. Caching is
+                disabled if None. Defaults to None.
+            cache_max_size_mb (float | None, optional): Maximum size of the cache in MB, least recently
+                used systems are evicted first. Unbounded if None. Defaults to None.
+            topology_only (bool, optional): Skip the power flow solution. Only the bus base voltages are
+                calculated (`calcvoltagebases`), if the model scripts do not calculate them already. Controls
+                do not run, so regulator taps keep their scripted positions. Solve commands in the model
+                scripts still run. Defaults to False.
+            trace_memory (bool, optional): Trace the peak memory of every read stage in the profiling report.
+                Slows down the read considerably. Defaults to False.
         """
 
-        self.system = DistributionSystem(auto_add_composed_components=True)
+        self.system = DistributionSystem(
+            auto_add_composed_components=True,
+            time_series_directory=time_series_directory,
+            time_series_storage_type=TimeSeriesStorageType(time_series_storage_type),
+        )
         self.Opendss_master_file = Path(Opendss_master_file)
         self.crs = crs
-        self._read(use_split_phase_representation)
+        self.validation_mode = ValidationMode(validation_mode)
+        self.validation_sample_size = validation_sample_size
+        self.validation_workers = validation_workers
+        self.validation_errors: list[list[str]] = []
+        self._validated_counts: dict[type, int] = defaultdict(int)
+        self._deferred_components: list[Component] = []
+        self.stream_time_series = stream_time_series
+        self.time_series_directory = time_series_directory
+        self.cache = (
+            ParseCache(cache_directory, cache_max_size_mb) if cache_directory is not None else None
+        )
+        self.cache_hit = False
+        self.topology_only = topology_only
+        self.profiler = Profiler("opendss reader", trace_memory=trace_memory)
+        if self.cache is None:
+            self._read(use_split_phase_representation)
+        else:
+            self._read_cached(use_split_phase_representation)
 
     def _add_components(self, components: list[Component]):
         """Internal method to add components to the system."""
 
         if components:
-            for component in components:
-                try:
-                    component.__class__.model_validate(component.model_dump())
-                except ValidationError as e:
-                    for error in e.errors():
-                        self.validation_errors.append(
-                            [
-                                component.name,
-                                component.__class__.__name__,
-                                error["loc"][0] if error["loc"] else "On model validation",
-                                error["type"],
-                                error["msg"],
-                            ]
-                        )
-
-            self.system.add_components(*components)
+            components = list(components)
+            self.profiler.add_count(len(components))
+            if self.validation_mode == ValidationMode.FULL:
+                with self.profiler.stage("validation"):
+                    self._validate_components(components)
+            elif self.validation_mode == ValidationMode.SAMPLED:
+                sampled_components = []
+                for component in components:
+                    if self._validated_counts[component.__class__] < self.validation_sample_size:
+                        self._validated_counts[component.__class__] += 1
+                        sampled_components.append(component)
+                with self.profiler.stage("validation"):
+                    self._validate_components(sampled_components)
+            elif self.validation_mode == ValidationMode.DEFERRED:
+                self._deferred_components.extend(components)
+
+            with self.profiler.stage("add_to_system"):
+                self.system.add_components(*components)
+
+    def _validate_components(self, components: list[Component]):
+        """Internal method to validate components and collect validation errors."""
+
+        for component in components:
+            self.validation_errors.extend(
+                validate_components(
+                    component.__class__, [(component.name, component.model_dump())]
+                )
+            )
+
+    def _validate_deferred_components(self):
+        """Internal method to validate all components queued in deferred mode in one batch."""
+
+        batches = defaultdict(list)
+        for component in self._deferred_components:
+            batches[component.__class__].append((component.name, component.model_dump()))
+        self._deferred_components = []
+
+        if self.validation_workers is None or self.validation_workers <= 1:
+            results = [
+                validate_components(model_class, records)
+                for model_class, records in batches.items()
+            ]
+        else:
+            # the OpenDSS engine is not fork safe, workers are started with a fresh interpreter
+            with ProcessPoolExecutor(
+                max_workers=self.validation_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_validation_worker,
+            ) as executor:
+                results = list(executor.map(validate_components, batches.keys(), batches.values()))
+        for error_rows in results:
+            self.validation_errors.extend(error_rows)
+
+    def _read_cached(self, use_split_phase_representation: bool = True):
+        """Loads the system from the parse cache, reads and caches the model on a cache miss"""
+
+        if not self.Opendss_master_file.exists():
+            msg = f"File not found: {self.Opendss_master_file}"
+            raise FileNotFoundError(msg)
+
+        cache_key = compute_input_fingerprint(
+            self.Opendss_master_file,
+            {
+                "crs": self.crs,
+                "use_split_phase_representation": use_split_phase_representation,
+                "topology_only": self.topology_only,
+                # systems read with partial or no validation must not be served to validated reads
+                "validation_mode": self.validation_mode.value,
+                "validation_sample_size": self.validation_sample_size,
+            },
+        )
+        system = self.cache.get(cache_key, time_series_directory=self.time_series_directory)
+        if system is None:
+            logger.debug(f"Parse cache miss for {self.Opendss_master_file}")
+            self._read(use_split_phase_representation)
+            self.cache.put(cache_key, self.system)
+        else:
+            logger.info(f"Loaded {self.Opendss_master_file} from the parse cache")
+            self.system = system
+            self.cache_hit = True
 
     def _read(self, use_split_phase_representation: bool = True):
         """Takes the master file path and returns instance of OpendssParser
@@ -90,59 +260,138 @@ class Reader(AbstractReader):
             msg = f"File not found: {self.Opendss_master_file}"
             raise FileNotFoundError(msg)
 
-        odd.Text.Command("Clear")
-        odd.Basic.ClearAll()
-        odd.Text.Command(f'Redirect "{self.Opendss_master_file}"')
-        odd.Text.Command("Solve")
+        with self.profiler.stage("compile"):
+            odd.Text.Command("Clear")
+            odd.Basic.ClearAll()
+            odd.Text.Command(f'Redirect "{self.Opendss_master_file}"')
         logger.debug(f"Model loaded from {self.Opendss_master_file}.")
 
-        odd.Solution.Solve()
-
-        self._add_components(get_buses(self.crs))
-        self._add_components(get_voltage_sources(self.system))
-        self._add_components(get_capacitors(self.system))
-        self._add_components(get_loads(self.system))
-        self._add_components(get_pvsystems(self.system))
-        (
-            distribution_transformer_equipment_catalog,
-            winding_equipment_catalog,
-        ) = get_transformer_equipments(self.system)
-        self._add_components(distribution_transformer_equipment_catalog.values())
-        self._add_components(
-            get_transformers(
-                self.system, distribution_transformer_equipment_catalog, winding_equipment_catalog
-            )
-        )
-        self._add_components(get_conductors_equipment())
-        self._add_components(get_cables_equipment())
-        matrix_branch_equipments_catalog, thermal_limit_catalog = get_matrix_branch_equipments()
-        for catalog in matrix_branch_equipments_catalog:
-            self._add_components(matrix_branch_equipments_catalog[catalog].values())
-
-        geometry_branch_equipment_catalog, mapped_geometry = get_geometry_branch_equipments(
-            self.system
-        )
-        self._add_components(geometry_branch_equipment_catalog.values())
-        branches = get_branches(
-            self.system,
-            mapped_geometry,
-            geometry_branch_equipment_catalog,
-            matrix_branch_equipments_catalog,
-            thermal_limit_catalog,
-        )
-        self._add_components(branches)
+        if self.topology_only:
+            with self.profiler.stage("voltage_bases"):
+                self._calculate_voltage_bases()
+        else:
+            with self.profiler.stage("solve"):
+                odd.Text.Command("Solve")
+                odd.Solution.Solve()
+
+        with self.profiler.stage("extract"):
+            self._extract_components()
 
         logger.debug("parsing complete...")
         logger.debug(f"\n{self.system.info()}")
-        logger.debug("Building graph...")
-        graph = self.system.get_undirected_graph()
-        logger.debug(graph)
-        logger.debug("Graph build complete...")
-        logger.debug("Updating graph to fix split phase representation...")
-        update_split_phase_nodes(graph, self.system)
-        logger.debug("System update complete...")
+        with self.profiler.stage("split_phase"):
+            logger.debug("Building graph...")
+            with self.profiler.stage("get_undirected_graph"):
+                graph = self.system.get_undirected_graph()
+            logger.debug(graph)
+            logger.debug("Graph build complete...")
+            logger.debug("Updating graph to fix split phase representation...")
+            with self.profiler.stage("update_split_phase_nodes"):
+                update_split_phase_nodes(graph, self.system)
+            logger.debug("System update complete...")
+        with self.profiler.stage("validation"):
+            if self.validation_mode == ValidationMode.DEFERRED:
+                logger.debug("Validating components...")
+                self._validate_deferred_components()
+        logger.info(
+            "Read phase timings: "
+            + ", ".join(f"{phase}={elapsed:.2f}s" for phase, elapsed in self.read_timings.items())
+        )
         self._validate_model()
 
+    def _calculate_voltage_bases(self):
+        """Builds the bus list and calculates the bus base voltages without a power flow solution,
+        unless the model scripts already did"""
+
+        if not odd.Circuit.NumBuses():
+            odd.Text.Command("MakeBusList")
+        for i in range(odd.Circuit.NumBuses()):
+            odd.Circuit.SetActiveBusi(i)
+            if odd.Bus.kVBase():
+                return
+        odd.Text.Command("CalcVoltageBases")
+
+    def _extract_components(self):
+        """Extracts the components of the loaded Opendss model and adds them to the system"""
+
+        profile_catalog = {}
+        with self.profiler.stage("get_buses"):
+            self._add_components(get_buses(self.crs))
+        with self.profiler.stage("get_voltage_sources"):
+            self._add_components(
+                get_voltage_sources(self.system, profile_catalog, self.stream_time_series)
+            )
+        with self.profiler.stage("get_capacitors"):
+            self._add_components(get_capacitors(self.system))
+        with self.profiler.stage("get_loads"):
+            self._add_components(get_loads(self.system, profile_catalog, self.stream_time_series))
+        with self.profiler.stage("get_pvsystems"):
+            self._add_components(
+                get_pvsystems(self.system, profile_catalog, self.stream_time_series)
+            )
+        with self.profiler.stage("get_transformer_equipments"):
+            (
+                distribution_transformer_equipment_catalog,
+                winding_equipment_catalog,
+            ) = get_transformer_equipments(self.system)
+            self._add_components(distribution_transformer_equipment_catalog.values())
+        with self.profiler.stage("get_transformers"):
+            self._add_components(
+                get_transformers(
+                    self.system,
+                    distribution_transformer_equipment_catalog,
+                    winding_equipment_catalog,
+                )
+            )
+        with self.profiler.stage("get_conductors_equipment"):
+            self._add_components(get_conductors_equipment())
+        with self.profiler.stage("get_cables_equipment"):
+            self._add_components(get_cables_equipment())
+        with self.profiler.stage("get_matrix_branch_equipments"):
+            protection_devices = get_protection_devices()
+            (
+                matrix_branch_equipments_catalog,
+                thermal_limit_catalog,
+                line_equipments,
+            ) = get_matrix_branch_equipments(protection_devices)
+            for catalog in matrix_branch_equipments_catalog:
+                self._add_components(matrix_branch_equipments_catalog[catalog].values())
+
+        with self.profiler.stage("get_geometry_branch_equipments"):
+            conductor_index = build_component_index(
+                self.system, [BareConductorEquipment, ConcentricCableEquipment]
+            )
+            geometry_branch_equipment_catalog, mapped_geometry = get_geometry_branch_equipments(
+                self.system, conductor_index
+            )
+            self._add_components(geometry_branch_equipment_catalog.values())
+        with self.profiler.stage("get_branches"):
+            branches = get_branches(
+                self.system,
+                mapped_geometry,
+                geometry_branch_equipment_catalog,
+                matrix_branch_equipments_catalog,
+                thermal_limit_catalog,
+                line_equipments,
+                protection_devices,
+            )
+            self._add_components(branches)
+
+    @property
+    def read_timings(self) -> dict[str, float]:
+        """Wall time in seconds of each phase of the read"""
+        return self.profiler.get_timings()
+
+    def get_profile_report(self) -> ProfileReport:
+        """Returns the profiling report of the read, with wall time, CPU time, element counts and
+        (if traced) peak memory of each stage
+
+        Returns:
+            ProfileReport: Profiling report
+        """
+
+        return self.profiler.get_report()
+
     def get_system(self) -> DistributionSystem:
         """Returns an instance of DistributionSystem
 
@@ -0,0 +1,577 @@
+from tempfile import TemporaryDirectory
+from contextlib import chdir
+from xml.sax.saxutils import escape, quoteattr
+from typing import Callable, TextIO
+from pathlib import Path
+from uuid import NAMESPACE_URL, uuid5
+import xml.etree.ElementTree as ET
+import shutil
+import random
+import math
+import re
+
+import opendssdirect as odd
+from loguru import logger
+
+from ditto.enumerations import OpenDSSFileTypes
+
+
+TILE_PREFIX = "copy_{}__"
+
+# Readers whose input format the synthetic model generator can write
+SYNTHETIC_READERS = ["opendss", "cim_iec_61968_13"]
+
+# Opendss classes shared by all tiles, libraries of the feeder elements and the circuit source
+OPENDSS_SHARED_CLASSES = {
+    "circuit",
+    "vsource",
+    "linecode",
+    "linegeometry",
+    "linespacing",
+    "wiredata",
+    "cndata",
+    "tsdata",
+    "xfmrcode",
+    "loadshape",
+    "growthshape",
+    "tshape",
+    "priceshape",
+    "xycurve",
+    "tcc_curve",
+    "spectrum",
+}
+
+OPENDSS_BUS_PROPERTIES = {"bus", "bus1", "bus2", "buses"}
+
+OPENDSS_ELEMENT_PROPERTIES = {
+    "element",
+    "monitoredobj",
+    "switchedobj",
+    "transformer",
+    "capacitor",
+    "elementlist",
+    "pvsystemlist",
+    "storagelist",
+}
+
+# perturbed properties, the same factor is applied to all properties of an element
+OPENDSS_PERTURBED_PROPERTIES = {"kw", "kvar", "kva", "xfkva", "pmpp", "length"}
+
+OPENDSS_NEW_PATTERN = re.compile(r'^new\s+(?:object\s*=\s*)?"?([^".\s]+)\.([^"\s]+)"?', re.I)
+
+OPENDSS_PROPERTY_PATTERN = re.compile(
+    r"(?<=\s)([^\s=]+)=(\[[^\]]*\]|\([^)]*\)|\"[^\"]*\"|'[^']*'|\S+)"
+)
+
+OPENDSS_NAME_PATTERN = re.compile(r"[^\s,\[\]()\"']+")
+
+RDF_NAMESPACE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+
+# CIM classes shared by all tiles, containers, catalogs and reference data
+CIM_SHARED_CLASSES = {
+    "IEC61970CIMVersion",
+    "CoordinateSystem",
+    "GeographicalRegion",
+    "SubGeographicalRegion",
+    "Substation",
+    "Feeder",
+    "TopologicalIsland",
+    "BaseVoltage",
+    "OperationalLimitType",
+    "PerLengthPhaseImpedance",
+    "PerLengthSequenceImpedance",
+    "PhaseImpedanceData",
+    "LoadResponseCharacteristic",
+    "OverheadWireInfo",
+    "ConcentricNeutralCableInfo",
+    "TapeShieldCableInfo",
+    "WireSpacingInfo",
+    "WirePosition",
+    "TransformerTankInfo",
+    "TransformerEndInfo",
+    "PowerTransformerInfo",
+    "ShortCircuitTest",
+    "NoLoadTest",
+    "OpenCircuitTest",
+    "EnergySource",
+}
+
+CIM_PERTURBED_PROPERTIES = {
+    "Conductor.length",
+    "EnergyConsumer.p",
+    "EnergyConsumer.q",
+    "EnergyConsumerPhase.p",
+    "EnergyConsumerPhase.q",
+}
+
+
+def get_tile_count(
+    seed_bus_count: int, copies: int | None = None, target_buses: int | None = None
+) -> int:
+    """Returns the number of tiles of a synthetic model
+
+    Args:
+        seed_bus_count (int): Number of buses of the seed feeder, including the shared source bus
+        copies (int | None, optional): Number of tiles, takes precedence over the target size.
+        target_buses (int | None, optional): Approximate number of buses of the synthetic model
+
+    Returns:
+        int: Number of tiles
+    """
+
+    if copies is not None:
+        if copies < 1:
+            msg = f"The number of copies must be positive, got {copies}"
+            raise ValueError(msg)
+        return copies
+    if target_buses is None:
+        msg = "Either the number of copies or the target number of buses is required"
+        raise ValueError(msg)
+    return max(1, math.ceil((target_buses - 1) / max(seed_bus_count - 1, 1)))
+
+
+def _perturb(value: str, factor: float) -> str:
+    try:
+        return f"{float(value) * factor:.6g}"
+    except ValueError:
+        return value
+
+
+def _get_grid_offset(tile: int, copies: int, width: float, height: float) -> tuple[float, float]:
+    """Returns the coordinate offset of a tile, tiles are laid out on a square grid"""
+
+    columns = math.ceil(math.sqrt(copies))
+    return (tile % columns) * width * 1.1, (tile // columns) * height * 1.1
+
+
+class _OpendssTiler:
+    """Rewrites elements of a normalized Opendss deck for a tile"""
+
+    def __init__(self, source_bus: str, tiled_names: set[str], perturbation: float) -> None:
+        self.source_bus = source_bus
+        self.tiled_names = tiled_names
+        self.perturbation = perturbation
+
+    def rename_bus(self, bus: str, prefix: str) -> str:
+        if bus.split(".")[0].lower() == self.source_bus:
+            return bus
+        return prefix + bus
+
+    def rename_element(self, element: str, prefix: str) -> str:
+        class_name, _, name = element.rpartition(".")
+        if element.lower() not in self.tiled_names and name.lower() not in self.tiled_names:
+            return element
+        return f"{class_name}.{prefix}{name}" if class_name else prefix + name
+
+    def tile_line(self, line: str, prefix: str, rng: random.Random) -> str:
+        """Returns the element definition with prefixed names, buses and element references"""
+
+        factor = 1 + rng.uniform(-self.perturbation, self.perturbation)
+
+        def replace_property(match: re.Match) -> str:
+            name, value = match.group(1), match.group(2)
+            key = name.lower()
+            if key in OPENDSS_BUS_PROPERTIES:
+                value = OPENDSS_NAME_PATTERN.sub(
+                    lambda m: self.rename_bus(m.group(0), prefix), value
+                )
+            elif key in OPENDSS_ELEMENT_PROPERTIES:
+                value = OPENDSS_NAME_PATTERN.sub(
+                    lambda m: self.rename_element(m.group(0), prefix), value
+                )
+            elif key in OPENDSS_PERTURBED_PROPERTIES:
+                value = _perturb(value, factor)
+            return f"{name}={value}"
+
+        head = OPENDSS_NEW_PATTERN.match(line)
+        body = OPENDSS_PROPERTY_PATTERN.sub(replace_property, line[head.end() :])
+        return f'New "{head.group(1)}.{prefix}{head.group(2)}"{body}'
+
+
+def _save_opendss_circuit(master_file: Path, save_directory: Path) -> tuple[str, int]:
+    """Compiles the seed model and saves it as a flat deck with one element per line
+
+    Returns:
+        tuple[str, int]: Source bus and number of buses of the seed model
+    """
+
+    # Opendss changes the working directory when compiling and saving, it is restored on exit
+    with chdir(Path.cwd()):
+        odd.Text.Command("Clear")
+        odd.Basic.ClearAll()
+        odd.Text.Command(f'Redirect "{master_file.resolve()}"')
+        if not odd.Circuit.NumBuses():
+            odd.Text.Command("MakeBusList")
+        odd.Vsources.First()
+        source_bus = odd.CktElement.BusNames()[0].split(".")[0].lower()
+        bus_count = odd.Circuit.NumBuses()
+        odd.Text.Command(f'Save Circuit Dir="{save_directory}"')
+    return source_bus, bus_count
+
+
+def _get_redirected_files(master_file: Path) -> list[Path]:
+    files = []
+    for line in master_file.read_text().splitlines():
+        tokens = line.split("!")[0].split(maxsplit=1)
+        if len(tokens) == 2 and tokens[0].lower() in ("redirect", "buscoords", "latlongcoords"):
+            files.append(master_file.parent / tokens[1].strip().strip("\"'"))
+    return files
+
+
+def _write_opendss_tiles(
+    dss_file: Path,
+    output_file: Path,
+    tiler: _OpendssTiler,
+    copies: int,
+    seed: int,
+):
+    """Writes the shared lines of a deck file once and its feeder elements for every tile"""
+
+    shared_lines, tiled_lines = [], []
+    for line in dss_file.read_text().splitlines():
+        match = OPENDSS_NEW_PATTERN.match(line)
+        if match and match.group(1).lower() not in OPENDSS_SHARED_CLASSES:
+            tiled_lines.append(line)
+        else:
+            shared_lines.append(line)
+
+    with open(output_file, "w") as f:
+        f.writelines(line + "\n" for line in shared_lines)
+        f.writelines(line + "\n" for line in tiled_lines)
+        for tile in range(1, copies):
+            rng = random.Random(f"{seed}:{dss_file.name}:{tile}")
+            prefix = TILE_PREFIX.format(tile)
+            f.writelines(tiler.tile_line(line, prefix, rng) + "\n" for line in tiled_lines)
+
+
+def _write_opendss_coordinates(
+    coordinate_file: Path, output_file: Path, source_bus: str, copies: int
+):
+    """Writes the bus coordinates of every tile, tiles are placed side by side"""
+
+    coordinates = []
+    for line in coordinate_file.read_text().splitlines():
+        tokens = [token for token in re.split(r"[\s,]+", line.strip()) if token]
+        if len(tokens) >= 3:
+            coordinates.append((tokens[0], float(tokens[1]), float(tokens[2])))
+    if not coordinates:
+        shutil.copyfile(coordinate_file, output_file)
+        return
+
+    xs, ys = [c[1] for c in coordinates], [c[2] for c in coordinates]
+    width, height = (max(xs) - min(xs)) or 1.0, (max(ys) - min(ys)) or 1.0
+    with open(output_file, "w") as f:
+        for tile in range(copies):
+            dx, dy = _get_grid_offset(tile, copies, width, height)
+            prefix = TILE_PREFIX.format(tile) if tile else ""
+            for bus, x, y in coordinates:
+                if tile and bus.lower() == source_bus:
+                    continue
+                f.write(f"{prefix}{bus}, {x + dx:.8g}, {y + dy:.8g}\n")
+
+
+def generate_opendss_model(
+    master_file: Path | str,
+    output_directory: Path | str,
+    copies: int | None = None,
+    target_buses: int | None = None,
+    seed: int = 0,
+    perturbation: float = 0.1,
+) -> Path:
+    """Generates a large Opendss model by tiling a seed feeder
+
+    The seed model is compiled and saved by Opendss as a flat deck. Every tile gets a copy of all
+    feeder elements, prefixed with `copy_<n>__`, and is connected to the source bus of the seed.
+    Libraries such as line codes, geometries, wire data and load shapes are shared. Loads and
+    line lengths of the tiles are scaled by random factors and the bus coordinates of every tile
+    are offset, the first tile is the unchanged seed feeder. The same seed generates the same
+    model.
+
+    Args:
+        master_file (Path | str): Path to the Opendss master file of the seed feeder
+        output_directory (Path | str): Folder for the generated model
+        copies (int | None, optional): Number of tiles, takes precedence over the target size.
+        target_buses (int | None, optional): Approximate number of buses of the generated model
+        seed (int, optional): Random seed of the perturbations. Defaults to 0.
+        perturbation (float, optional): Maximum relative change of the perturbed properties. Defaults to 0.1.
+
+    Returns:
+        Path: Path to the master file of the generated model
+    """
+
+    master_file = Path(master_file)
+    output_directory = Path(output_directory).resolve()
+    with TemporaryDirectory() as tmp_directory:
+        saved_directory = Path(tmp_directory).resolve() / "seed"
+        source_bus, bus_count = _save_opendss_circuit(master_file, saved_directory)
+        copies = get_tile_count(bus_count, copies, target_buses)
+        shutil.copytree(saved_directory, output_directory, dirs_exist_ok=True)
+
+        saved_master_file = saved_directory / OpenDSSFileTypes.MASTER_FILE.value
+        dss_files = _get_redirected_files(saved_master_file)
+        tiled_names = set()
+        for dss_file in dss_files:
+            for line in dss_file.read_text().splitlines():
+                match = OPENDSS_NEW_PATTERN.match(line)
+                if match and match.group(1).lower() not in OPENDSS_SHARED_CLASSES:
+                    tiled_names.add(f"{match.group(1)}.{match.group(2)}".lower())
+                    tiled_names.add(match.group(2).lower())
+
+        tiler = _OpendssTiler(source_bus, tiled_names, perturbation)
+        for dss_file in dss_files:
+            output_file = output_directory / dss_file.relative_to(saved_directory)
+            if dss_file.name == OpenDSSFileTypes.COORDINATE_FILE.value:
+                _write_opendss_coordinates(dss_file, output_file, source_bus, copies)
+            else:
+                _write_opendss_tiles(dss_file, output_file, tiler, copies, seed)
+
+    # the saved deck only sets the voltage bases, the buses get their base when calculated
+    output_master_file = output_directory / OpenDSSFileTypes.MASTER_FILE.value
+    with open(output_master_file, "a") as f:
+        f.write("CalcVoltageBases\n")
+
+    logger.info(
+        f"Generated {copies} tiles of {master_file} with "
+        f"{1 + copies * (bus_count - 1)} buses in {output_directory}"
+    )
+    return output_master_file
+
+
+def _get_cim_id(element: ET.Element) -> str | None:
+    about = element.get(f"{{{RDF_NAMESPACE}}}about")
+    if about is not None:
+        return about
+    rdf_id = element.get(f"{{{RDF_NAMESPACE}}}ID")
+    return None if rdf_id is None else f"#{rdf_id}"
+
+
+def _get_local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _get_cim_references(element: ET.Element) -> dict[str, list[str]]:
+    references = {}
+    for child in element:
+        resource = child.get(f"{{{RDF_NAMESPACE}}}resource")
+        if resource is not None:
+            references.setdefault(_get_local_name(child.tag), []).append(resource)
+    return references
+
+
+def _get_cim_properties(element: ET.Element) -> dict[str, str]:
+    return {_get_local_name(child.tag): child.text for child in element if child.text}
+
+
+def _get_shared_cim_ids(elements: list[ET.Element]) -> set[str]:
+    """Returns the ids of the shared objects, the shared classes and the terminals and
+    connectivity nodes of the sources"""
+
+    shared_ids = {
+        _get_cim_id(element)
+        for element in elements
+        if _get_local_name(element.tag) in CIM_SHARED_CLASSES
+    }
+    sources = {
+        _get_cim_id(element)
+        for element in elements
+        if _get_local_name(element.tag) == "EnergySource"
+    }
+    source_nodes = set()
+    for element in elements:
+        references = _get_cim_references(element)
+        if set(references.get("Terminal.ConductingEquipment", [])) & sources:
+            shared_ids.add(_get_cim_id(element))
+            source_nodes.update(references.get("Terminal.ConnectivityNode", []))
+    for element in elements:
+        element_id = _get_cim_id(element)
+        if element_id in source_nodes:
+            shared_ids.add(element_id)
+            shared_ids.update(
+                _get_cim_references(element).get("ConnectivityNode.TopologicalNode", [])
+            )
+    return shared_ids
+
+
+def _get_tile_cim_id(element_id: str, tile: int, seed: int) -> str:
+    tile_uuid = str(uuid5(NAMESPACE_URL, f"{seed}:{tile}:{element_id}")).upper()
+    if element_id.startswith("#"):
+        return f"#_{tile_uuid}"
+    return f"urn:uuid:{tile_uuid}"
+
+
+class _CimWriter:
+    """Streams RDF/XML elements with the namespace prefixes of the seed file"""
+
+    def __init__(self, f: TextIO, namespaces: dict[str, str]) -> None:
+        self.f = f
+        self.prefixes = {uri: prefix for prefix, uri in namespaces.items()}
+
+    def qname(self, tag: str) -> str:
+        if tag.startswith("{"):
+            uri, local_name = tag[1:].split("}", 1)
+            return f"{self.prefixes[uri]}:{local_name}"
+        return tag
+
+    def write(self, element: ET.Element, indent: str = ""):
+        attributes = "".join(
+            f" {self.qname(key)}={quoteattr(value)}" for key, value in element.attrib.items()
+        )
+        tag = self.qname(element.tag)
+        if len(element):
+            self.f.write(f"{indent}<{tag}{attributes}>\n")
+            for child in element:
+                self.write(child, indent + "  ")
+            self.f.write(f"{indent}</{tag}>\n")
+        elif element.text and element.text.strip():
+            self.f.write(f"{indent}<{tag}{attributes}>{escape(element.text)}</{tag}>\n")
+        else:
+            self.f.write(f"{indent}<{tag}{attributes}/>\n")
+
+
+def _tile_cim_text(
+    property_name: str, text: str, tile: int, factor: float, offset: tuple[float, float]
+) -> str:
+    if property_name == "IdentifiedObject.name":
+        return TILE_PREFIX.format(tile) + text
+    if property_name in CIM_PERTURBED_PROPERTIES:
+        return _perturb(text, factor)
+    if property_name == "PositionPoint.xPosition":
+        return f"{float(text) + offset[0]:.8g}"
+    if property_name == "PositionPoint.yPosition":
+        return f"{float(text) + offset[1]:.8g}"
+    return text
+
+
+def _tile_cim_element(
+    element: ET.Element,
+    tile: int,
+    rename: Callable[[str], str],
+    rng: random.Random,
+    offset: tuple[float, float],
+    perturbation: float,
+) -> ET.Element:
+    """Returns a copy of a CIM object for a tile with new ids, names and perturbed values"""
+
+    tiled = ET.Element(element.tag)
+    for key, value in element.attrib.items():
+        if key == f"{{{RDF_NAMESPACE}}}about":
+            value = rename(value)
+        elif key == f"{{{RDF_NAMESPACE}}}ID":
+            value = rename(f"#{value}")[1:]
+        tiled.set(key, value)
+
+    element_id = _get_cim_id(element)
+    factor = 1 + rng.uniform(-perturbation, perturbation)
+    for child in element:
+        tiled_child = ET.SubElement(tiled, child.tag, dict(child.attrib))
+        tiled_child.text = child.text
+        resource = child.get(f"{{{RDF_NAMESPACE}}}resource")
+        if resource is not None:
+            tiled_child.set(f"{{{RDF_NAMESPACE}}}resource", rename(resource))
+        elif _get_local_name(child.tag) == "IdentifiedObject.mRID":
+            tiled_child.text = rename(element_id).rsplit(":", 1)[-1].lstrip("#")
+        elif child.text is not None:
+            tiled_child.text = _tile_cim_text(
+                _get_local_name(child.tag), child.text, tile, factor, offset
+            )
+    return tiled
+
+
+def generate_cim_model(
+    cim_file: Path | str,
+    output_file: Path | str,
+    copies: int | None = None,
+    target_buses: int | None = None,
+    seed: int = 0,
+    perturbation: float = 0.1,
+) -> Path:
+    """Generates a large CIM model by tiling a seed feeder
+
+    Every tile gets a copy of the feeder objects with new mRIDs and names prefixed with
+    `copy_<n>__`, connected to the connectivity node of the energy source. Containers, catalogs
+    such as line impedances and transformer infos, and the source are shared. Loads and line
+    lengths of the tiles are scaled by random factors and the position points of every tile are
+    offset, the first tile is the unchanged seed feeder. The same seed generates the same model.
+
+    Args:
+        cim_file (Path | str): Path to the CIM XML file of the seed feeder
+        output_file (Path | str): Path of the generated CIM XML file
+        copies (int | None, optional): Number of tiles, takes precedence over the target size.
+        target_buses (int | None, optional): Approximate number of buses of the generated model
+        seed (int, optional): Random seed of the perturbations. Defaults to 0.
+        perturbation (float, optional): Maximum relative change of the perturbed properties. Defaults to 0.1.
+
+    Returns:
+        Path: Path to the generated CIM XML file
+    """
+
+    cim_file, output_file = Path(cim_file), Path(output_file)
+    namespaces = dict(namespace for _, namespace in ET.iterparse(cim_file, events=["start-ns"]))
+    root = ET.parse(cim_file).getroot()
+    elements = list(root)
+    bus_count = sum(1 for e in elements if _get_local_name(e.tag) == "ConnectivityNode")
+    copies = get_tile_count(bus_count, copies, target_buses)
+
+    shared_ids = _get_shared_cim_ids(elements)
+    tiled_elements = [e for e in elements if _get_cim_id(e) not in shared_ids]
+    tiled_ids = {_get_cim_id(e) for e in tiled_elements}
+
+    positions = [
+        _get_cim_properties(e) for e in elements if _get_local_name(e.tag) == "PositionPoint"
+    ]
+    xs = [float(p["PositionPoint.xPosition"]) for p in positions] or [0.0]
+    ys = [float(p["PositionPoint.yPosition"]) for p in positions] or [0.0]
+    width, height = (max(xs) - min(xs)) or 1.0, (max(ys) - min(ys)) or 1.0
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        writer = _CimWriter(f, namespaces)
+        declarations = "".join(
+            f" xmlns:{prefix}={quoteattr(uri)}" for prefix, uri in namespaces.items()
+        )
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        f.write(f"<{writer.qname(root.tag)}{declarations}>\n")
+        for element in elements:
+            writer.write(element)
+        for tile in range(1, copies):
+            rng = random.Random(f"{seed}:{tile}")
+            offset = _get_grid_offset(tile, copies, width, height)
+
+            def rename(element_id: str, tile: int = tile) -> str:
+                if element_id not in tiled_ids:
+                    return element_id
+                return _get_tile_cim_id(element_id, tile, seed)
+
+            for element in tiled_elements:
+                writer.write(_tile_cim_element(element, tile, rename, rng, offset, perturbation))
+        f.write(f"</{writer.qname(root.tag)}>\n")
+
+    logger.info(
+        f"Generated {copies} tiles of {cim_file} with "
+        f"{bus_count + (copies - 1) * (bus_count - 1)} buses in {output_file}"
+    )
+    return output_file
+
+
+def generate_synthetic_model(
+    reader: str, input_file: Path | str, output_directory: Path | str, **kwargs
+) -> Path:
+    """Generates a large model in the input format of a reader by tiling a seed feeder
+
+    Args:
+        reader (str): Reader package name of the seed feeder, opendss or cim_iec_61968_13
+        input_file (Path | str): Opendss master file or CIM XML file of the seed feeder
+        output_directory (Path | str): Folder for the generated model
+        kwargs: Keyword arguments passed to `generate_opendss_model` or `generate_cim_model`
+
+    Returns:
+        Path: Input file of the generated model for the reader
+    """
+
+    input_file, output_directory = Path(input_file), Path(output_directory)
+    if reader == "opendss":
+        return generate_opendss_model(input_file, output_directory, **kwargs)
+    if reader == "cim_iec_61968_13":
+        return generate_cim_model(input_file, output_directory / input_file.name, **kwargs)
+    msg = f"Synthetic models are not supported for the reader '{reader}'"
+    raise ValueError(msg)
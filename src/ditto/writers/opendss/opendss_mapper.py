@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from uuid import UUID
 
 from gdm.distribution import DistributionSystem
 from infrasys import Component
@@ -18,6 +19,9 @@ class OpenDSSMapper(ABC):
         "millimeter": "mm",
     }
     connection_map = {"STAR": "wye", "DELTA": "delta", "OPEN_DELTA": "delta", "OPEN_STAR": "wye"}
+    # LoadShape names of the components with profiles, keyed by component uuid. Set by the writer
+    # once the profiles are written, the time series are looked up per component otherwise.
+    profile_names: dict[UUID, str] | None = None
 
     def __init__(self, model: Component, system: DistributionSystem):
         self.model = model
@@ -70,6 +74,8 @@ class OpenDSSMapper(ABC):
             mapping_function()
 
     def get_profile_name(self, component):
+        if self.profile_names is not None:
+            return self.profile_names.get(component.uuid)
         profiles = self.system.list_time_series(component)
         profile_data = []
         for profile in profiles:
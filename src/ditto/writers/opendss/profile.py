@@ -1,11 +1,80 @@
+from pathlib import Path
+from typing import Iterator
 from uuid import UUID
 
 from ditto.writers.opendss.opendss_mapper import OpenDSSMapper
-from ditto.enumerations import OpenDSSFileTypes
+from ditto.enumerations import OpenDSSFileTypes, ProfileFormat
 
+from infrasys.time_series_metadata_store import TIME_SERIES_ASSOCIATIONS_TABLE
 from infrasys.time_series_manager import TimeSeriesMetadata
+from infrasys.time_series_models import TimeSeriesData
 from infrasys import Component, SingleTimeSeries, NonSequentialTimeSeries
 from gdm.distribution import DistributionSystem
+import numpy as np
+
+# folder of the profile data files, relative to the LoadShape file
+PROFILE_DIRECTORY = "profiles"
+
+# LoadShape array properties referencing a data file of each profile format
+PROFILE_FILE_PROPERTIES = {
+    ProfileFormat.CSV: "CSVFile",
+    ProfileFormat.SNG: "SngFile",
+    ProfileFormat.DBL: "DblFile",
+}
+
+
+def iter_profile_groups(
+    system: DistributionSystem, time_series_type: type[TimeSeriesData]
+) -> Iterator[tuple[list[UUID], list[dict]]]:
+    """Yields the components with profiles grouped by their profile datasets
+
+    The time series metadata store is queried once for all components. Components attached to
+    the same time series metadata, e.g. loads sharing a load shape, form a group and every time
+    series is read once. Groups are yielded in the order their profiles were attached.
+
+    Args:
+        system (DistributionSystem): System with the profiles
+        time_series_type (type[TimeSeriesData]): Type of the profiles
+
+    Yields:
+        tuple[list[UUID], list[dict]]: Component uuids and profile datasets (see ProfileMapper)
+            of each group
+    """
+
+    store = system.time_series.metadata_store
+    rows = store.sql(
+        f"SELECT owner_uuid, time_series_uuid, metadata_uuid FROM {TIME_SERIES_ASSOCIATIONS_TABLE} "
+        "WHERE time_series_type = ? AND owner_category = 'Component' ORDER BY id",
+        (time_series_type.__name__,),
+    )
+    metadata_by_uuid: dict[str, TimeSeriesMetadata] = {}
+    for time_series_uuid in dict.fromkeys(row[1] for row in rows):
+        for metadata in store.list_metadata_with_time_series_uuid(UUID(time_series_uuid)):
+            metadata_by_uuid[str(metadata.uuid)] = metadata
+
+    owner_metadata: dict[str, list[str]] = {}
+    for owner_uuid, _, metadata_uuid in rows:
+        owner_metadata.setdefault(owner_uuid, []).append(metadata_uuid)
+    groups: dict[tuple[str, ...], list[UUID]] = {}
+    for owner_uuid, metadata_uuids in owner_metadata.items():
+        groups.setdefault(tuple(metadata_uuids), []).append(UUID(owner_uuid))
+
+    time_series: dict[UUID, TimeSeriesData] = {}
+    for metadata_uuids, owners in groups.items():
+        group_metadata = [metadata_by_uuid[metadata_uuid] for metadata_uuid in metadata_uuids]
+        profile_datasets = []
+        for metadata in group_metadata:
+            if metadata.time_series_uuid not in time_series:
+                time_series[metadata.time_series_uuid] = (
+                    system.time_series.storage.get_time_series(metadata)
+                )
+            profile_datasets.append(
+                {
+                    "profile": time_series[metadata.time_series_uuid],
+                    "metadata": [m for m in group_metadata if m.name == metadata.name],
+                }
+            )
+        yield owners, profile_datasets
 
 
 class ProfileMapper(OpenDSSMapper):
@@ -13,8 +82,17 @@ class ProfileMapper(OpenDSSMapper):
     altdss_name = None  ## Defined in the init function
     altdss_composition_name = "LoadShape"
 
-    def __init__(self, component: Component, profile_datasets: dict, system: DistributionSystem):
+    def __init__(
+        self,
+        component: Component,
+        profile_datasets: dict,
+        system: DistributionSystem,
+        profile_format: ProfileFormat = ProfileFormat.TEXT,
+    ):
         super().__init__(component, system)
+        self.profile_format = ProfileFormat(profile_format)
+        # data of the multipliers written to files, keyed by path relative to the LoadShape file
+        self.profile_files: dict[str, np.ndarray] = {}
 
         self.component: Component = component
         self.profile_datasets = profile_datasets
@@ -43,6 +121,17 @@ class ProfileMapper(OpenDSSMapper):
                 if m.time_series_uuid == profile_uuid:
                     return m
 
+    def _get_multipliers(self, profile: TimeSeriesData) -> list[float] | dict[str, str]:
+        """Returns the samples of a profile, or a reference to the data file of the profile
+        if profiles are not written inline. Data files are named after the time series."""
+
+        data = profile.data.magnitude
+        if self.profile_format == ProfileFormat.TEXT:
+            return data.tolist()
+        file_path = f"{PROFILE_DIRECTORY}/{profile.uuid}.{self.profile_format.value}"
+        self.profile_files[file_path] = data
+        return {PROFILE_FILE_PROPERTIES[self.profile_format]: file_path}
+
     def map_timestamps(self):
         t0 = self.model.timestamps[0]
         self.opendss_dict["Hour"] = [
@@ -66,14 +155,37 @@ class ProfileMapper(OpenDSSMapper):
         ):
             for profile in self.profile_datasets:
                 metadata = self._get_profile_metadata(profile["profile"].uuid)
-                data = profile["profile"].data.magnitude.tolist()
+                data = self._get_multipliers(profile["profile"])
                 self.opendss_dict[metadata.features["profile_type"]] = data
                 self.opendss_dict["UseActual"] = self.metadata[0].features["use_actual"]
         else:
-            self.opendss_dict["PMult"] = self.model.data.magnitude.tolist()
+            self.opendss_dict["PMult"] = self._get_multipliers(self.model)
 
     def map_resolution(self):
         self.opendss_dict["Interval"] = self.model.resolution.total_seconds() / 3600
 
-    def map_initial_timestamp(self):
-        ...
+    def map_initial_timestamp(self): ...
+
+
+def write_profile_file(file_path: Path, data: np.ndarray, profile_format: ProfileFormat):
+    """Writes the samples of a profile to a data file referenced by a LoadShape
+
+    Binary files are written from the array buffer, as little endian 32 bit (sng) or 64 bit (dbl)
+    floats. CSV files have a single column without header and no trailing newline.
+
+    Args:
+        file_path (Path): Path of the data file
+        data (np.ndarray): Profile samples
+        profile_format (ProfileFormat): Format of the data file
+    """
+
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    if profile_format == ProfileFormat.SNG:
+        np.asarray(data, dtype="<f4").tofile(file_path)
+    elif profile_format == ProfileFormat.DBL:
+        np.asarray(data, dtype="<f8").tofile(file_path)
+    elif profile_format == ProfileFormat.CSV:
+        file_path.write_text("\n".join(map(str, np.asarray(data, dtype=float).tolist())))
+    else:
+        msg = f"Profiles in {profile_format} format are written inline"
+        raise ValueError(msg)
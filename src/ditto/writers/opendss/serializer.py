@@ -0,0 +1,142 @@
+from functools import lru_cache, partial
+from typing import Annotated, Any, Callable, Union, get_args, get_origin
+from enum import Enum
+import types
+
+from altdss_schema import altdss_models
+from pydantic import AliasChoices, RootModel, TypeAdapter
+
+
+def _to_float_list(value: Any) -> list[float]:
+    return [float(item) for item in value]
+
+
+def _to_array_or_file(value: Any) -> list[float] | dict:
+    """Converts arrays to floats, arrays read from files are passed as their file reference,
+    e.g. `{"SngFile": path}`. The AltDSS model validator rejects file references."""
+
+    if isinstance(value, dict):
+        return value
+    return _to_float_list(value)
+
+
+def _to_str_list(value: Any, validate: Callable[[Any], Any]) -> list[str]:
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return value
+    return validate(value)
+
+
+def _is_str_type(annotation: Any) -> bool:
+    """Returns True for strings and root models of strings, e.g. bus connections"""
+
+    inner = _unwrap(annotation)[0]
+    if isinstance(inner, type) and issubclass(inner, RootModel):
+        inner = _unwrap(inner.model_fields["root"].annotation)[0]
+    return inner is str
+
+
+def _unwrap(annotation: Any) -> tuple[Any, bool]:
+    """Removes `Annotated` metadata and `Optional`, returns the inner type and if None is allowed"""
+
+    optional = False
+    while True:
+        origin = get_origin(annotation)
+        if origin is Annotated:
+            annotation = get_args(annotation)[0]
+        elif origin in (Union, types.UnionType) and type(None) in get_args(annotation):
+            args = [arg for arg in get_args(annotation) if arg is not type(None)]
+            optional = True
+            if len(args) != 1:
+                return Union[tuple(args)], optional
+            annotation = args[0]
+        else:
+            return annotation, optional
+
+
+def _get_converter(annotation: Any) -> tuple[type | None, Callable[[Any], Any]]:
+    """Returns the type of the field value after validation and a function converting raw
+    values to it, the converter is only called for values of another type
+
+    Numbers, strings, enums, arrays (or their file references) and lists of them are converted
+    directly, every other type goes through a pydantic adapter of the field type, without the
+    model level validators.
+    """
+
+    inner = _unwrap(annotation)[0]
+    item = _unwrap(get_args(inner)[0])[0] if get_origin(inner) is list else None
+    adapter = TypeAdapter(annotation)
+
+    def validate(value):
+        return adapter.dump_python(adapter.validate_python(value), exclude_unset=True)
+
+    if inner in (float, int):
+        return inner, inner
+    if inner is altdss_models.ArrayOrFilePath:
+        return None, _to_array_or_file
+    if isinstance(inner, type) and issubclass(inner, Enum):
+        return inner, inner
+    if _is_str_type(inner):
+        return str, validate
+    if item is float:
+        return None, _to_float_list
+    if item is not None and _is_str_type(item):
+        return None, partial(_to_str_list, validate=validate)
+    return None, validate
+
+
+@lru_cache(maxsize=None)
+def get_field_converters(
+    altdss_name: str,
+) -> dict[str, tuple[str, type | None, Callable[[Any], Any]]]:
+    """Returns the converters of the fields of an AltDSS class, keyed by field name and aliases
+
+    Args:
+        altdss_name (str): Name of the AltDSS class
+
+    Returns:
+        dict[str, tuple[str, type | None, Callable[[Any], Any]]]: Field name, value type and
+            converter of each input key
+    """
+
+    converters = {}
+    for field_name, field in getattr(altdss_models, altdss_name).model_fields.items():
+        converter = (field_name, *_get_converter(field.annotation))
+        keys = [field_name]
+        if isinstance(field.validation_alias, AliasChoices):
+            keys.extend(field.validation_alias.choices)
+        elif isinstance(field.validation_alias, str):
+            keys.append(field.validation_alias)
+        for key in keys:
+            converters.setdefault(key, converter)
+    return converters
+
+
+def dumps_dss(altdss_name: str, altdss_composition_name: str | None, opendss_dict: dict) -> str:
+    """Returns the DSS command of an object without validating the AltDSS model
+
+    The fields are converted to the types of the AltDSS model and written by the DSS dump
+    function of the AltDSS class, the text is identical to dumping the validated model for valid
+    input. Unknown keys are ignored like extra fields of the AltDSS models.
+
+    Args:
+        altdss_name (str): Name of the AltDSS class of the object
+        altdss_composition_name (str | None): Name of the AltDSS class composing the object
+        opendss_dict (dict): Object properties populated by a mapper
+
+    Returns:
+        str: DSS command
+    """
+
+    converters = get_field_converters(altdss_name)
+    fields = {}
+    for key, value in opendss_dict.items():
+        converter = converters.get(key)
+        if converter is None:
+            continue
+        field_name, value_type, convert = converter
+        if value is None or type(value) is value_type:
+            fields[field_name] = value
+        else:
+            fields[field_name] = convert(value)
+    dump_class = getattr(altdss_models, altdss_composition_name or altdss_name)
+    return dump_class.dict_dumps_dss(fields)
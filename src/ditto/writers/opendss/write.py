@@ -1,7 +1,14 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import chdir
+from tempfile import TemporaryDirectory
+from dataclasses import dataclass
 from collections import defaultdict
 from io import TextIOWrapper
+from itertools import repeat
 from pathlib import Path
-from typing import Any
+from typing import Any, Hashable, Iterator
+from uuid import UUID
+import multiprocessing
 
 from infrasys import NonSequentialTimeSeries, SingleTimeSeries
 from altdss_schema import altdss_models
@@ -17,29 +24,327 @@ from gdm.distribution.equipment import (
     ConcentricCableEquipment,
     BareConductorEquipment,
 )
+from gdm.distribution import DistributionSystem
 from loguru import logger
 
 from ditto.writers.abstract_writer import AbstractWriter
-from ditto.enumerations import OpenDSSFileTypes
+from ditto.writers.opendss.serializer import dumps_dss
+from ditto.writers.opendss.profile import iter_profile_groups, write_profile_file
+from ditto.writers.output_buffer import OutputBuffer
+from ditto.profiling import Profiler, ProfileReport
+from ditto.enumerations import OpenDSSFileTypes, ProfileFormat
 import ditto.writers.opendss as opendss_mapper
 
+# number of components of a single type mapped by a worker task of the parallel writer
+MAPPING_CHUNK_SIZE = 2000
+
+# system loaded once by every worker process of the parallel writer, the LoadShape names of its
+# components and the emission cache of the equipment and controllers mapped by the worker
+_worker_system: DistributionSystem | None = None
+_worker_profile_names: dict[UUID, str] | None = None
+_worker_emission_cache: dict[Hashable, tuple[str, str]] = {}
+
+
+@dataclass(slots=True)
+class MappedComponent:
+    """DSS text of a component, its equipment and its controller with their output files.
+    Equipment and controllers are identified by their emission cache keys, their output is
+    deduplicated by text."""
+
+    substation: str
+    feeder: str
+    opendss_file: str
+    dss_string: str
+    equipment_id: Hashable | None = None
+    equipment_file: str | None = None
+    equipment_dss_string: str | None = None
+    controller_id: Hashable | None = None
+    controller_file: str | None = None
+    controller_dss_string: str | None = None
+
+
+def get_dss_string(model_map: Any, strict: bool = False) -> str:
+    """Returns the DSS command of a populated mapper
+
+    Args:
+        model_map (Any): Mapper with a populated opendss dictionary, e.g. DistributionBusMapper
+        strict (bool, optional): Validate the object with its AltDSS model. Defaults to False.
+
+    Returns:
+        str: DSS command
+    """
+
+    if not strict:
+        return dumps_dss(
+            model_map.altdss_name, model_map.altdss_composition_name, model_map.opendss_dict
+        )
+    altdss_class = getattr(altdss_models, model_map.altdss_name)
+    # Example altdss_class is Bus
+    altdss_object = altdss_class.model_validate(model_map.opendss_dict)
+    if model_map.altdss_composition_name is not None:
+        altdss_composition_class = getattr(altdss_models, model_map.altdss_composition_name)
+
+        altdss_composition_object = altdss_composition_class(altdss_object)
+        dss_string = altdss_composition_object.dumps_dss()
+    else:
+        dss_string = altdss_object.dumps_dss()
+    return dss_string
+
+
+def _map_emission(
+    key: Hashable,
+    emission_cache: dict[Hashable, tuple[str, str]],
+    mapper: type,
+    mapper_args: tuple,
+    profiler: Profiler,
+    strict: bool,
+) -> tuple[str, str]:
+    """Returns the output file and DSS command of an equipment or controller, every cache key
+    is mapped and serialized once"""
+
+    emission = emission_cache.get(key)
+    if emission is None:
+        with profiler.stage("map"):
+            model_map = mapper(*mapper_args)
+            model_map.populate_opendss_dictionary()
+        with profiler.stage("serialize"):
+            emission = (model_map.opendss_file, get_dss_string(model_map, strict))
+        emission_cache[key] = emission
+    return emission
+
+
+def map_component(
+    mapper: type,
+    model: DistributionComponentBase,
+    system: DistributionSystem,
+    profiler: Profiler,
+    strict: bool = False,
+    emission_cache: dict[Hashable, tuple[str, str]] | None = None,
+    profile_names: dict[UUID, str] | None = None,
+) -> MappedComponent:
+    """Maps a component, its equipment and its controllers to DSS commands
+
+    Equipment is cached by its uuid, controllers by their uuid and the name of the controlled
+    component, which is part of the controller command. Equipment shared by many components,
+    e.g. line codes, is mapped and serialized once per cache.
+
+    Args:
+        mapper (type): Mapper class of the component, e.g. DistributionBusMapper
+        model (DistributionComponentBase): Component to map
+        system (DistributionSystem): System of the component
+        profiler (Profiler): Profiler recording the map and serialize stages
+        strict (bool, optional): Validate every object with its AltDSS model. Defaults to False.
+        emission_cache (dict[Hashable, tuple[str, str]] | None, optional): Output files and DSS
+            commands of the mapped equipment and controllers. Defaults to None (not cached).
+        profile_names (dict[UUID, str] | None, optional): LoadShape names of the components with
+            profiles. Defaults to None (looked up in the system).
+
+    Returns:
+        MappedComponent: DSS commands and output files
+    """
+
+    if emission_cache is None:
+        emission_cache = {}
+    with profiler.stage("map"):
+        model_map = mapper(model, system)
+        if profile_names is not None:
+            model_map.profile_names = profile_names
+        model_map.populate_opendss_dictionary()
+    with profiler.stage("serialize"):
+        dss_string = get_dss_string(model_map, strict)
+    if dss_string.startswith("new Vsource"):
+        dss_string = dss_string.replace("new Vsource", "Clear\n\nNew Circuit")
+    mapped_component = MappedComponent(
+        model_map.substation, model_map.feeder, model_map.opendss_file, dss_string
+    )
+
+    if hasattr(model, "equipment"):
+        equipment_mapper_name = model.equipment.__class__.__name__ + "Mapper"
+        if not hasattr(opendss_mapper, equipment_mapper_name):
+            logger.warning(f"Equipment Mapper {equipment_mapper_name} not found. Skipping")
+        else:
+            mapped_component.equipment_id = model.equipment.uuid
+            (
+                mapped_component.equipment_file,
+                mapped_component.equipment_dss_string,
+            ) = _map_emission(
+                mapped_component.equipment_id,
+                emission_cache,
+                getattr(opendss_mapper, equipment_mapper_name),
+                (model.equipment, system),
+                profiler,
+                strict,
+            )
+
+    if hasattr(model, "controllers"):
+        for controller in model.controllers:
+            controller_mapper_name = controller.__class__.__name__ + "Mapper"
+            if not hasattr(opendss_mapper, controller_mapper_name):
+                logger.warning(f"Equipment Mapper {controller_mapper_name} not found. Skipping")
+            else:
+                mapped_component.controller_id = (controller.uuid, model.name)
+                (
+                    mapped_component.controller_file,
+                    mapped_component.controller_dss_string,
+                ) = _map_emission(
+                    mapped_component.controller_id,
+                    emission_cache,
+                    getattr(opendss_mapper, controller_mapper_name),
+                    (controller, model.name, system),
+                    profiler,
+                    strict,
+                )
+    return mapped_component
+
+
+def _initialize_mapping_worker(json_file: Path, profile_names: dict[UUID, str]):
+    """Loads the serialized system once per worker process"""
+
+    global _worker_system, _worker_profile_names
+    _worker_system = DistributionSystem.from_json(json_file)
+    _worker_profile_names = profile_names
+    _worker_emission_cache.clear()
+
+
+def map_components(
+    component_type: type[DistributionComponentBase], uuids: list[UUID], strict: bool = False
+) -> list[MappedComponent]:
+    """Maps components of a single type of the worker system. Used as the worker function of
+    the parallel writer, the worker profiles are discarded.
+
+    Args:
+        component_type (type[DistributionComponentBase]): Type of the components
+        uuids (list[UUID]): UUIDs of the components to map
+        strict (bool, optional): Validate every object with its AltDSS model. Defaults to False.
+
+    Returns:
+        list[MappedComponent]: Mapped components in the order of the uuids
+    """
+
+    mapper = getattr(opendss_mapper, component_type.__name__ + "Mapper")
+    profiler = Profiler("mapping worker")
+    return [
+        map_component(
+            mapper,
+            _worker_system.get_component_by_uuid(uuid),
+            _worker_system,
+            profiler,
+            strict,
+            _worker_emission_cache,
+            _worker_profile_names,
+        )
+        for uuid in uuids
+    ]
+
 
 class Writer(AbstractWriter):
     files = []
 
+    def __init__(
+        self,
+        system: DistributionSystem,
+        trace_memory: bool = False,
+        strict: bool = False,
+        workers: int | None = None,
+    ):
+        """
+        Args:
+            system (DistributionSystem): System to write
+            trace_memory (bool, optional): Trace the peak memory of the profiled stages. Defaults to False.
+            strict (bool, optional): Validate every object with its AltDSS model before writing it.
+                The default fast path writes the same text without validation. Defaults to False.
+            workers (int | None, optional): Number of worker processes mapping the components.
+                Components are mapped in the writer process if None or 1. Defaults to None.
+        """
+        super().__init__(system)
+        self.strict = strict
+        self.workers = workers
+        self.profiler = Profiler("opendss writer", trace_memory=trace_memory)
+
+    def get_profile_report(self) -> ProfileReport:
+        """Returns the profiling report of the writes, with wall time, CPU time, element counts
+        and (if traced) peak memory of each stage
+
+        Returns:
+            ProfileReport: Profiling report
+        """
+
+        return self.profiler.get_report()
+
     def _get_dss_string(self, model_map: Any) -> str:
         # Example model_map is instance of DistributionBusMapper
-        altdss_class = getattr(altdss_models, model_map.altdss_name)
-        # Example altdss_class is Bus
-        altdss_object = altdss_class.model_validate(model_map.opendss_dict)
-        if model_map.altdss_composition_name is not None:
-            altdss_composition_class = getattr(altdss_models, model_map.altdss_composition_name)
-
-            altdss_composition_object = altdss_composition_class(altdss_object)
-            dss_string = altdss_composition_object.dumps_dss()
-        else:
-            dss_string = altdss_object.dumps_dss()
-        return dss_string
+        return get_dss_string(model_map, self.strict)
+
+    def _get_mapped_models(self, component_type: type) -> Iterator[DistributionComponentBase]:
+        """Yields the components of a type that are written, i.e. components and conductors"""
+
+        for model in self.system.get_components(component_type):
+            # Example model is instance of DistributionBus
+            if isinstance(model, DistributionComponentBase) or isinstance(
+                model, (BareConductorEquipment, ConcentricCableEquipment)
+            ):
+                yield model
+
+    def _map_serial(
+        self,
+        mapper: type,
+        component_type: type,
+        emission_cache: dict[Hashable, tuple[str, str]],
+        profile_names: dict[UUID, str],
+    ) -> Iterator[MappedComponent]:
+        """Maps the components of a type in the writer process"""
+
+        for model in self._get_mapped_models(component_type):
+            yield map_component(
+                mapper,
+                model,
+                self.system,
+                self.profiler,
+                self.strict,
+                emission_cache,
+                profile_names,
+            )
+
+    def _map_parallel(
+        self, component_types: list[type], profile_names: dict[UUID, str]
+    ) -> dict[type, list[MappedComponent]]:
+        """Maps the components in worker processes
+
+        The system is serialized once and loaded by every worker. Components are sent to the
+        workers as chunks of uuids of a single type, the mapped chunks are returned in the order
+        of the components in the system so the merged output is identical to a serial write.
+        """
+
+        chunks = []
+        for component_type in component_types:
+            if not hasattr(opendss_mapper, component_type.__name__ + "Mapper"):
+                continue
+            uuids = [model.uuid for model in self._get_mapped_models(component_type)]
+            for i in range(0, len(uuids), MAPPING_CHUNK_SIZE):
+                chunks.append((component_type, uuids[i : i + MAPPING_CHUNK_SIZE]))
+
+        mapped_components = defaultdict(list)
+        with TemporaryDirectory() as tmp_directory:
+            json_file = Path(tmp_directory) / "system.json"
+            with self.profiler.stage("serialize_system"):
+                self.system.to_json(json_file)
+            # the OpenDSS engine is not fork safe, workers are started with a fresh interpreter
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_mapping_worker,
+                initargs=(json_file, profile_names),
+            ) as executor:
+                results = executor.map(
+                    map_components,
+                    [component_type for component_type, _ in chunks],
+                    [uuids for _, uuids in chunks],
+                    repeat(self.strict),
+                )
+                for (component_type, _), records in zip(chunks, results):
+                    self.profiler.add_count(len(records))
+                    mapped_components[component_type].extend(records)
+        return mapped_components
 
     def prepare_folder(self, output_path):
         directory = Path(output_path)
@@ -61,25 +366,47 @@ class Writer(AbstractWriter):
         separate_substations: bool = True,
         separate_feeders: bool = True,
         profile_type: type[NonSequentialTimeSeries | SingleTimeSeries] = SingleTimeSeries,
+        profile_format: ProfileFormat = ProfileFormat.TEXT,
     ):
         self.profile_type = profile_type
+        self.profile_format = ProfileFormat(profile_format)
+        if self.strict and self.profile_format != ProfileFormat.TEXT:
+            msg = (
+                "AltDSS models do not validate LoadShapes read from files, profiles are written "
+                + f"inline in strict mode (got profile_format={self.profile_format.value})"
+            )
+            raise ValueError(msg)
         base_redirect = set()
         feeders_redirect = defaultdict(set)
         substations_redirect = defaultdict(set)
 
-        self.prepare_folder(output_path)
-        component_types = self.system.get_component_types()
+        with self.profiler.stage("prepare_folder"):
+            self.prepare_folder(output_path)
+        component_types = list(self.system.get_component_types())
 
+        # equipment and controllers are written once per substation and feeder
         seen_equipment = set()
         seen_controller = set()
+        emission_cache = {}
         seen_profile = set()
+        # component strings are buffered per file, files are appended to once per flush
+        output = OutputBuffer()
 
         output_redirect = Path("")
-        profiles = self._write_profiles(output_path, seen_profile, output_redirect, base_redirect)
+        with self.profiler.stage("write_profiles"):
+            profile_names = self._write_profiles(
+                output, output_path, seen_profile, output_redirect, base_redirect
+            )
+
+        mapped_components = None
+        if self.workers is not None and self.workers > 1:
+            with self.profiler.stage("map_parallel"):
+                mapped_components = self._map_parallel(component_types, profile_names)
+
+        # mapped components are merged in system order, equipment and controllers shared by
+        # components are deduplicated here
         for component_type in component_types:
             # Example component_type is DistributionBus
-            components = self.system.get_components(component_type)
-
             mapper_name = component_type.__name__ + "Mapper"
             # Example mapper_name is string DistributionBusMapper
             if not hasattr(opendss_mapper, mapper_name):
@@ -90,170 +417,145 @@ class Writer(AbstractWriter):
             mapper = getattr(opendss_mapper, mapper_name)
 
             # Example mapper is class DistributionBusMapper
-            for model in components:
-                # Example model is instance of DistributionBus
-                if not isinstance(model, DistributionComponentBase) and not (
-                    isinstance(model, BareConductorEquipment)
-                    or isinstance(model, ConcentricCableEquipment)
-                ):
-                    continue
-
-                model_map = mapper(model, self.system)
-                model_map.populate_opendss_dictionary()
-
-                dss_string = self._get_dss_string(model_map)
-                if dss_string.startswith("new Vsource"):
-                    dss_string = dss_string.replace("new Vsource", "Clear\n\nNew Circuit")
-                equipment_dss_string = None
-                equipment_map: list[Path] = None
-                controller_dss_string = None
-                controller_map: list[Path] = None
-
-                if hasattr(model, "equipment"):
-                    equipment_mapper_name = model.equipment.__class__.__name__ + "Mapper"
-                    if not hasattr(opendss_mapper, equipment_mapper_name):
-                        logger.warning(
-                            f"Equipment Mapper {equipment_mapper_name} not found. Skipping"
-                        )
-                    else:
-                        equipment_mapper = getattr(opendss_mapper, equipment_mapper_name)
-                        equipment_map = equipment_mapper(model.equipment, self.system)
-                        equipment_map.populate_opendss_dictionary()
-                        equipment_dss_string = self._get_dss_string(equipment_map)
-
-                if hasattr(model, "controllers"):
-                    for controller in model.controllers:
-                        controller_mapper_name = controller.__class__.__name__ + "Mapper"
-                        if not hasattr(opendss_mapper, controller_mapper_name):
-                            logger.warning(
-                                f"Equipment Mapper {controller_mapper_name} not found. Skipping"
-                            )
-                        else:
-                            controller_mapper = getattr(opendss_mapper, controller_mapper_name)
-                            controller_map = controller_mapper(controller, model.name, self.system)
-                            controller_map.populate_opendss_dictionary()
-                            controller_dss_string = self._get_dss_string(controller_map)
-
-                output_folder = output_path
-                self._build_directory_structure(
-                    separate_substations,
-                    separate_feeders,
-                    output_path,
-                    model_map,
-                    output_redirect,
-                    output_folder,
-                )
-
-                if equipment_dss_string is not None:
-                    feeder_substation_equipment = (
-                        model_map.substation + model_map.feeder + equipment_dss_string
-                    )
-                    if feeder_substation_equipment not in seen_equipment:
-                        seen_equipment.add(feeder_substation_equipment)
-                        with open(
-                            output_folder / equipment_map.opendss_file, "a", encoding="utf-8"
-                        ) as fp:
-                            fp.write(equipment_dss_string)
-
-                if controller_dss_string is not None:
-                    feeder_substation_controller = (
-                        model_map.substation + model_map.feeder + controller_dss_string
+            with self.profiler.stage(mapper_name):
+                if mapped_components is None:
+                    records = self._map_serial(
+                        mapper, component_type, emission_cache, profile_names
                     )
-                    if feeder_substation_controller not in seen_controller:
-                        seen_controller.add(feeder_substation_controller)
-                        with open(
-                            output_folder / controller_map.opendss_file, "a", encoding="utf-8"
-                        ) as fp:
-                            fp.write(controller_dss_string)
-
-                # TODO: Check that there aren't multiple voltage sources for the same master file
-                with open(output_folder / model_map.opendss_file, "a", encoding="utf-8") as fp:
-                    fp.write(dss_string)
-
-                if (
-                    model_map.opendss_file == OpenDSSFileTypes.MASTER_FILE.value
-                    or model_map.opendss_file == OpenDSSFileTypes.COORDINATE_FILE.value
-                ):
-                    continue
-
-                if separate_substations and separate_feeders:
-                    substations_redirect[model_map.substation].add(
-                        Path(model_map.feeder) / model_map.opendss_file
+                else:
+                    records = mapped_components.pop(component_type, [])
+                for record in records:
+                    self.profiler.add_count(1)
+
+                    output_folder = output_path
+                    self._build_directory_structure(
+                        separate_substations,
+                        separate_feeders,
+                        output_path,
+                        record,
+                        output_redirect,
+                        output_folder,
                     )
-                    if equipment_map is not None:
-                        substations_redirect[model_map.substation].add(
-                            Path(model_map.feeder) / equipment_map.opendss_file
-                        )
 
-                elif separate_substations:
-                    substations_redirect[model_map.substation].add(Path(model_map.opendss_file))
-                    if equipment_map is not None:
-                        substations_redirect[model_map.substation].add(
-                            Path(equipment_map.opendss_file)
+                    # equal equipment held by different objects is written once
+                    if record.equipment_dss_string is not None:
+                        feeder_substation_equipment = (
+                            record.substation,
+                            record.feeder,
+                            record.equipment_file,
+                            record.equipment_dss_string,
+                        )
+                        if feeder_substation_equipment not in seen_equipment:
+                            seen_equipment.add(feeder_substation_equipment)
+                            with self.profiler.stage("file_io"):
+                                output.write(
+                                    output_folder / record.equipment_file,
+                                    record.equipment_dss_string,
+                                )
+
+                    if record.controller_dss_string is not None:
+                        feeder_substation_controller = (
+                            record.substation,
+                            record.feeder,
+                            record.controller_file,
+                            record.controller_dss_string,
+                        )
+                        if feeder_substation_controller not in seen_controller:
+                            seen_controller.add(feeder_substation_controller)
+                            with self.profiler.stage("file_io"):
+                                output.write(
+                                    output_folder / record.controller_file,
+                                    record.controller_dss_string,
+                                )
+
+                    # TODO: Check that there aren't multiple voltage sources for the same master file
+                    with self.profiler.stage("file_io"):
+                        output.write(output_folder / record.opendss_file, record.dss_string)
+
+                    if (
+                        record.opendss_file == OpenDSSFileTypes.MASTER_FILE.value
+                        or record.opendss_file == OpenDSSFileTypes.COORDINATE_FILE.value
+                    ):
+                        continue
+
+                    if separate_substations and separate_feeders:
+                        substations_redirect[record.substation].add(
+                            Path(record.feeder) / record.opendss_file
                         )
-                        if profiles:
-                            substations_redirect
-
-                if separate_feeders:
-                    combined_feeder_sub = Path(model_map.substation) / Path(model_map.feeder)
-                    if combined_feeder_sub not in feeders_redirect:
-                        feeders_redirect[combined_feeder_sub] = set()
-                    feeders_redirect[combined_feeder_sub].add(Path(model_map.opendss_file))
-                    if equipment_map is not None:
-                        feeders_redirect[combined_feeder_sub].add(Path(equipment_map.opendss_file))
-
-                base_redirect.add(output_redirect / model_map.opendss_file)
-                if equipment_map is not None:
-                    base_redirect.add(output_redirect / equipment_map.opendss_file)
-                if controller_map is not None:
-                    base_redirect.add(output_redirect / controller_map.opendss_file)
-
-        self._write_base_master(base_redirect, output_folder)
-        self._write_substation_master(substations_redirect)
-        self._write_feeder_master(feeders_redirect)
+                        if record.equipment_file is not None:
+                            substations_redirect[record.substation].add(
+                                Path(record.feeder) / record.equipment_file
+                            )
 
-    def _write_profiles(
-        self, output_folder, seen_profile: set, output_redirect, base_redirect
-    ) -> dict[str, dict[str, list[str]]]:
-        all_profiles = []
-        profile_type = None
-        for component in self.system.iter_all_components():
-            profiles = self.system.list_time_series(component, time_series_type=self.profile_type)
-            profile_data = []
-            for profile in profiles:
-                if profile_type is None:
-                    profile_type = profile.__class__
-
-                if not issubclass(profile.__class__, profile_type):
-                    msg = (
-                        f"Profile {profile} is not of type {profile_type}. OpenDSS conversion "
-                        + "requires all profiles to be of the same type. Please check your data model."
-                    )
-                    raise ValueError(msg)
+                    elif separate_substations:
+                        substations_redirect[record.substation].add(Path(record.opendss_file))
+                        if record.equipment_file is not None:
+                            substations_redirect[record.substation].add(
+                                Path(record.equipment_file)
+                            )
+                            if profile_names:
+                                substations_redirect
+
+                    if separate_feeders:
+                        combined_feeder_sub = Path(record.substation) / Path(record.feeder)
+                        if combined_feeder_sub not in feeders_redirect:
+                            feeders_redirect[combined_feeder_sub] = set()
+                        feeders_redirect[combined_feeder_sub].add(Path(record.opendss_file))
+                        if record.equipment_file is not None:
+                            feeders_redirect[combined_feeder_sub].add(Path(record.equipment_file))
+
+                    base_redirect.add(output_redirect / record.opendss_file)
+                    if record.equipment_file is not None:
+                        base_redirect.add(output_redirect / record.equipment_file)
+                    if record.controller_file is not None:
+                        base_redirect.add(output_redirect / record.controller_file)
+
+        with self.profiler.stage("flush_output"):
+            output.flush()
+        with self.profiler.stage("write_masters"):
+            self._write_base_master(base_redirect, output_folder)
+            self._write_substation_master(substations_redirect, output_path)
+            self._write_feeder_master(feeders_redirect, output_path)
 
-                profile_data.append(
-                    {
-                        "profile": profile,
-                        "metadata": self.system.list_time_series_metadata(component, profile.name),
-                    }
-                )
-            if profile_data:
-                profile_map = opendss_mapper.ProfileMapper(component, profile_data, self.system)
-                profile_map.populate_opendss_dictionary()
+    def _write_profiles(
+        self,
+        output: OutputBuffer,
+        output_folder,
+        seen_profile: set,
+        output_redirect,
+        base_redirect,
+    ) -> dict[UUID, str]:
+        """Writes a LoadShape per group of components sharing profiles and returns the LoadShape
+        names of the components, used by the mappers for the `Yearly` references
+
+        Profiles are written inline, or to a data file per time series if `profile_format` is a
+        file format. LoadShapes reference the files relative to the LoadShape file, which is
+        also the folder the files are resolved from while the LoadShapes are serialized.
+        """
+
+        profile_names = {}
+        profile_files = set()
+        for owners, profile_data in iter_profile_groups(self.system, self.profile_type):
+            component = self.system.get_component_by_uuid(owners[0])
+            profile_map = opendss_mapper.ProfileMapper(
+                component, profile_data, self.system, self.profile_format
+            )
+            profile_map.populate_opendss_dictionary()
+            for file_path, data in profile_map.profile_files.items():
+                if file_path not in profile_files:
+                    profile_files.add(file_path)
+                    write_profile_file(Path(output_folder, file_path), data, self.profile_format)
+            with chdir(output_folder):
                 model_text = self._get_dss_string(profile_map)
-                all_profiles.append(model_text)
-                profile_id = profile_map.substation + profile_map.feeder + model_text
-                if profile_id not in seen_profile:
-                    seen_profile.add(profile_id)
-                    with open(
-                        output_folder / profile_map.opendss_file, "a", encoding="utf-8"
-                    ) as fp:
-                        fp.write(model_text)
+            self.profiler.add_count(len(owners))
+            profile_id = profile_map.substation + profile_map.feeder + model_text
+            if profile_id not in seen_profile:
+                seen_profile.add(profile_id)
+                output.write(output_folder / profile_map.opendss_file, model_text)
+            base_redirect.add(output_redirect / profile_map.opendss_file)
+            profile_names.update(dict.fromkeys(owners, profile_map.profile_name))
 
-                if profile_map is not None:
-                    base_redirect.add(output_redirect / profile_map.opendss_file)
-
-        return all_profiles
+        return profile_names
 
     def _build_directory_structure(
         self,
@@ -264,6 +566,7 @@ class Writer(AbstractWriter):
         output_redirect,
         output_folder,
     ):
+        # Example model_map is instance of DistributionBusMapper or MappedComponent
         if separate_substations:
             output_folder = Path(output_path, model_map.substation)
             output_redirect = Path(model_map.substation)
@@ -333,24 +636,31 @@ class Writer(AbstractWriter):
 
         # base_master.write(f"BusCoords {filename}\n")
 
-    def _write_substation_master(self, substations_redirect):
+    def _write_substation_master(self, substations_redirect, output_path):
         for substation in substations_redirect:
-            if (Path(substation) / OpenDSSFileTypes.MASTER_FILE.value).is_file():
+            substation_path = Path(output_path, substation)
+            # the base master already redirects the files of the output folder
+            if substation_path == Path(output_path):
+                continue
+            if (substation_path / OpenDSSFileTypes.MASTER_FILE.value).is_file():
                 with open(
-                    Path(substation) / OpenDSSFileTypes.MASTER_FILE.value, "a"
+                    substation_path / OpenDSSFileTypes.MASTER_FILE.value, "a"
                 ) as substation_master:
                     # TODO: provide ordering so LineCodes before Lines
                     for dss_file in substations_redirect[substation]:
-                        if (Path(substation).parent / dss_file).exists():
+                        if Path(output_path, Path(substation).parent, dss_file).exists():
                             substation_master.write("redirect " + str(dss_file))
                             substation_master.write("\n")
 
-    def _write_feeder_master(self, feeders_redirect):
+    def _write_feeder_master(self, feeders_redirect, output_path):
         for feeder in feeders_redirect:
-            if (Path(feeder) / OpenDSSFileTypes.MASTER_FILE.value).is_file():
-                with open(Path(feeder) / OpenDSSFileTypes.MASTER_FILE.value, "a") as feeder_master:
+            feeder_path = Path(output_path, feeder)
+            if feeder_path == Path(output_path):
+                continue
+            if (feeder_path / OpenDSSFileTypes.MASTER_FILE.value).is_file():
+                with open(feeder_path / OpenDSSFileTypes.MASTER_FILE.value, "a") as feeder_master:
                     # TODO: provide ordering so LineCodes before Lines
                     for dss_file in feeders_redirect[feeder]:
-                        if (Path(feeder).parent / dss_file).exists():
+                        if Path(output_path, Path(feeder).parent, dss_file).exists():
                             feeder_master.write("redirect " + str(dss_file))
                             feeder_master.write("\n")
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+
+class OutputBuffer:
+    """Buffers the text written to output files and appends it to the files in batches
+
+    Writers emit one string per component, opening the output file for every string dominates
+    the write time of large systems. The buffer keeps the text of every file in memory, in write
+    order, and appends it to the file with a single open once flushed. Buffers are flushed when
+    the buffered text exceeds `max_size` characters and when the context manager exits. Files
+    are flushed in the order they were first written to, the output is identical to appending
+    every string directly.
+    """
+
+    def __init__(self, max_size: int = 64 * 1024**2, encoding: str = "utf-8") -> None:
+        """
+        Args:
+            max_size (int, optional): Number of buffered characters that triggers a flush. Defaults to 64M.
+            encoding (str, optional): Encoding of the output files. Defaults to "utf-8".
+        """
+        self.max_size = max_size
+        self.encoding = encoding
+        self._buffers: dict[Path, list[str]] = {}
+        self._size = 0
+
+    def __enter__(self) -> "OutputBuffer":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.flush()
+
+    def write(self, file_path: Path | str, text: str):
+        """Appends text to the buffer of a file
+
+        Args:
+            file_path (Path | str): Output file, text is appended to existing files
+            text (str): Text to write
+        """
+
+        self._buffers.setdefault(Path(file_path), []).append(text)
+        self._size += len(text)
+        if self._size > self.max_size:
+            self.flush()
+
+    def flush(self):
+        """Appends the buffered text to the output files and clears the buffers"""
+
+        buffers, self._buffers, self._size = self._buffers, {}, 0
+        for file_path, texts in buffers.items():
+            with open(file_path, "a", encoding=self.encoding) as f:
+                f.write("".join(texts))
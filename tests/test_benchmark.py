@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import pytest
+
+from gdm.distribution.components import (
+    DistributionVoltageSource,
+    DistributionTransformer,
+    DistributionLoad,
+    DistributionBus,
+)
+
+from ditto.benchmark import (
+    BenchmarkReport,
+    BenchmarkCase,
+    StageResult,
+    CaseResult,
+    get_bundled_cases,
+    replicate_system,
+    run_case,
+)
+from ditto.readers.opendss.reader import Reader
+
+data_directory = Path(__file__).parent / "data"
+
+
+def test_bundled_cases():
+    cases = {case.name: case for case in get_bundled_cases(data_directory)}
+    assert {"ieee13", "ckt24", "ckt7", "P4U", "SFO"} <= set(cases)
+    assert cases["cim_IEEE13Nodeckt_CIM100x"].reader == "cim_iec_61968_13"
+
+
+def test_replicate_system():
+    opendss_file = data_directory / "opendss_circuit_models" / "ieee13" / "Master.dss"
+    system = Reader(opendss_file).get_system()
+    replicated_system = replicate_system(system, 3)
+    n_buses = len(list(system.get_components(DistributionBus)))
+    n_loads = len(list(system.get_components(DistributionLoad)))
+    assert len(list(replicated_system.get_components(DistributionVoltageSource))) == 1
+    assert len(list(replicated_system.get_components(DistributionBus))) == 3 * n_buses - 2
+    assert len(list(replicated_system.get_components(DistributionLoad))) == 3 * n_loads
+    source_bus = replicated_system.get_source_bus()
+    assert len(
+        replicated_system.get_bus_connected_components(source_bus.name, DistributionTransformer)
+    ) == 3 * len(system.get_bus_connected_components(source_bus.name, DistributionTransformer))
+
+
+def test_run_case():
+    case = BenchmarkCase(
+        name="ieee13",
+        reader="opendss",
+        input_file=data_directory / "opendss_circuit_models" / "ieee13" / "Master.dss",
+    )
+    result = run_case(case)
+    assert not result.errors
+    assert set(result.stages) == {"read", "serialize", "deserialize", "write", "read_back"}
+    assert result.roundtrip_time > 0
+
+
+def _get_report(case: BenchmarkCase, wall_time: float, peak_memory_mb: float):
+    return CaseResult(
+        case=case,
+        stages={
+            "write": StageResult(wall_time=wall_time, cpu_time=0, peak_memory_mb=peak_memory_mb)
+        },
+    )
+
+
+def test_benchmark_report():
+    case = BenchmarkCase(name="feeder", reader="opendss", input_file="Master.dss")
+    baseline = BenchmarkReport(results=[_get_report(case, 1.0, 100.0)])
+    report = BenchmarkReport(results=[_get_report(case, 1.2, 200.0)])
+    regressions = report.compare(baseline, threshold=0.25)
+    assert [(r.stage, r.metric) for r in regressions] == [("write", "peak_memory_mb")]
+    assert regressions[0].ratio == 2.0
+    assert not report.compare(baseline, threshold=1.5)
+
+    scaling_report = BenchmarkReport(
+        results=[
+            _get_report(case.model_copy(update={"copies": n}), n**2, 100.0) for n in (1, 2, 4)
+        ]
+    )
+    assert scaling_report.get_scaling_exponents()[("feeder", "write")] == pytest.approx(2.0)
+
+
+def test_run_synthetic_case():
+    case = BenchmarkCase(
+        name="ieee13",
+        reader="opendss",
+        input_file=data_directory / "opendss_circuit_models" / "ieee13" / "Master.dss",
+        copies=2,
+        synthetic=True,
+    )
+    result = run_case(case)
+    assert case.label == "ieee13_synthetic_x2"
+    assert not result.errors
+    assert {"generate", "read", "write", "read_back"} <= set(result.stages)
@@ -1,11 +1,19 @@
 from pathlib import Path
 
+from gdm.distribution.components import (
+    MatrixImpedanceBranch,
+    DistributionLoad,
+    DistributionBus,
+)
 import opendssdirect as odd
 from loguru import logger
+import pandas as pd
 import numpy as np
+import pytest
 
 from ditto.readers.cim_iec_61968_13.reader import Reader
 from ditto.writers.opendss.write import Writer
+from ditto.enumerations import CimQueryBackend
 
 
 def get_model_voltage_drop(model_name: str):
@@ -61,17 +69,73 @@ def get_metrics(dss_model_path: Path | str):
     return base_metrics
 
 
-def test_query_aclinesegment(ieee13_node_xml_file, fixed_tmp_path):
+@pytest.mark.parametrize("query_backend", [CimQueryBackend.SPARQL, CimQueryBackend.COLUMNAR])
+def test_query_aclinesegment(ieee13_node_xml_file, tmp_path, query_backend):
     ieee13_node_dss_file = (
         Path(__file__).parent.parent / "data" / "opendss_circuit_models" / "ieee13" / "Master.dss"
     )
     pre_converion_metrics = get_metrics(ieee13_node_dss_file)
-    cim_reader = Reader(ieee13_node_xml_file)
+    cim_reader = Reader(ieee13_node_xml_file, query_backend=query_backend)
     cim_reader.read()
     system = cim_reader.get_system()
     writer = Writer(system)
-    writer.write(output_path=fixed_tmp_path, separate_substations=False, separate_feeders=False)
-    post_converion_metrics = get_metrics(fixed_tmp_path / "Master.dss")
+    writer.write(output_path=tmp_path, separate_substations=False, separate_feeders=False)
+    post_converion_metrics = get_metrics(tmp_path / "Master.dss")
     assert np.allclose(
         pre_converion_metrics, post_converion_metrics, rtol=0.1, atol=0.1
     ), "Round trip coversion exceeds error tolerance"
+
+
+def test_set_bus_phases(ieee13_node_xml_file):
+    datasets = {
+        DistributionBus: pd.DataFrame({"bus": ["b1", "b2", "b3", "b4"]}),
+        MatrixImpedanceBranch: pd.DataFrame(
+            {"bus_1": ["b1", "b2"], "bus_2": ["b2", "b3"], "phases_1": ["C,A", "B"]}
+        ),
+        DistributionLoad: pd.DataFrame({"bus": ["b3", "b2"], "phase": ["B,N", None]}),
+    }
+    bus_df = Reader(ieee13_node_xml_file, query_backend="columnar")._set_bus_phases(datasets)
+    assert bus_df["phase"].to_list() == ["A,C", "A,B,C", "B", "A,B,C"]
+    assert DistributionBus not in datasets
+
+
+def test_build_xfmr_dataset(ieee13_node_xml_file):
+    xfmr_data = pd.DataFrame(
+        {
+            "xfmr": ["t1", "t1", "t1", "t1", "t2", "t2"],
+            "winding": ["1", "1", "2", "2", "1", "2"],
+            "bus": ["a", "b", "a", "b", "c", "d"],
+            "conn": ["D", "D", "Y", "Y", "Y", "Y"],
+            "xfmr_end": ["t1_1", "t1_1", "t1_2", "t1_2", "t2_1", "t2_2"],
+        }
+    )
+    winding_df = pd.DataFrame(
+        {
+            "winding": ["z1", "z2"],
+            "r0": [0.1, 0.2],
+            "r1": [0.1, 0.2],
+            "x0": [1.0, 2.0],
+            "x1": [1.0, 2.0],
+            "xfmr_end_1": ["t2_1", "t1_1"],
+            "xfmr_end_2": ["t2_2", "t1_2"],
+        }
+    )
+    reader = Reader(ieee13_node_xml_file, query_backend="columnar")
+    xfmr_dataset = reader._build_xfmr_dataset(xfmr_data, winding_df)
+    assert xfmr_dataset.columns[:6].to_list() == [
+        "wdg_1_conn",
+        "wdg_1_xfmr_end",
+        "wdg_2_conn",
+        "wdg_2_xfmr_end",
+        "bus_1",
+        "bus_2",
+    ]
+    assert xfmr_dataset["xfmr"].to_list() == ["t1", "t2"]
+    assert xfmr_dataset["wdg_1_conn"].to_list() == ["D", "Y"]
+    assert xfmr_dataset[["bus_1", "bus_2"]].values.tolist() == [["a", "b"], ["c", "d"]]
+    assert xfmr_dataset["winding"].to_list() == ["z2", "z1"]
+    assert xfmr_dataset["r0"].to_list() == [0.2, 0.1]
+
+    regulator_dataset = reader._build_xfmr_dataset(xfmr_data)
+    assert "r0" not in regulator_dataset.columns
+    assert len(regulator_dataset) == 2
@@ -0,0 +1,137 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import sys
+
+from rdflib.namespace import RDF
+from rdflib import Graph
+import pandas as pd
+import pytest
+
+from ditto.readers.cim_iec_61968_13.queries import (
+    query_distribution_regulators,
+    query_regulator_controllers,
+    query_transformer_windings,
+    query_load_break_switches,
+    query_power_transformers,
+    query_distribution_buses,
+    query_line_segments,
+    query_line_codes,
+    query_capacitors,
+    query_source,
+    query_loads,
+)
+from ditto.readers.cim_iec_61968_13.planner import QueryPlanner
+from ditto.readers.cim_iec_61968_13.tables import (
+    QUERY_PROPERTIES,
+    QUERY_CLASSES,
+    CimTables,
+)
+
+
+def test_streamed_graph_keeps_query_triples(ieee13_node_xml_file):
+    graph = Graph()
+    graph.parse(ieee13_node_xml_file, format="xml")
+    tables = CimTables.from_xml(ieee13_node_xml_file)
+    streamed_graph = tables.to_graph()
+
+    cim = tables.cim_namespace
+    expected = {
+        (s, p, o)
+        for s, p, o in graph
+        if p != RDF.type and str(p).removeprefix(cim) in QUERY_PROPERTIES
+    }
+    typed_subjects = {s for s, _, _ in expected} | {
+        s for s, o in graph.subject_objects(RDF.type) if str(o).removeprefix(cim) in QUERY_CLASSES
+    }
+    expected.update((s, RDF.type, o) for s in typed_subjects for o in graph.objects(s, RDF.type))
+    assert set(streamed_graph) == expected
+    assert len(streamed_graph) < len(graph)
+
+    terminals = tables.tables["Terminal"]
+    assert terminals.index.is_unique
+    assert {"Terminal.ConnectivityNode", "Terminal.ConductingEquipment"} <= set(terminals.columns)
+    assert "Terminal.sequenceNumber" not in terminals.columns
+
+    for query in [query_line_segments, query_loads]:
+        pd.testing.assert_frame_equal(query(streamed_graph), query(graph))
+
+
+def _sort_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Sorts rows by their string values, some query columns hold lists"""
+
+    order = df.astype(str).reset_index(drop=True).sort_values(list(df.columns)).index
+    return df.iloc[order].reset_index(drop=True)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        query_distribution_regulators,
+        query_regulator_controllers,
+        query_transformer_windings,
+        query_load_break_switches,
+        query_power_transformers,
+        query_distribution_buses,
+        query_line_segments,
+        query_line_codes,
+        query_capacitors,
+        query_source,
+        query_loads,
+    ],
+)
+def test_columnar_queries(ieee13_node_xml_file, query):
+    graph = Graph()
+    graph.parse(ieee13_node_xml_file, format="xml")
+    tables = CimTables.from_xml(ieee13_node_xml_file)
+
+    expected = query(graph)
+    result = query(tables)
+    assert list(result.columns) == list(expected.columns)
+    assert sorted(result.index) == sorted(expected.index)
+    pd.testing.assert_frame_equal(_sort_rows(result), _sort_rows(expected))
+
+
+def test_columnar_queries_missing_property():
+    # the loads of this export have no EnergyConsumer.LoadResponse property
+    cim_file = (
+        Path(__file__).parents[1]
+        / "data"
+        / "opendss_circuit_models"
+        / "ckt7"
+        / "IEEE13Nodeckt_CIM100x.xml"
+    )
+    tables = CimTables.from_xml(cim_file)
+    assert tables.get_property("EnergyConsumer.LoadResponse").empty
+    graph = Graph()
+    graph.parse(cim_file, format="xml")
+
+    result = query_loads(tables)
+    assert result.empty
+    assert list(result.columns) == list(query_loads(graph).columns)
+
+
+@pytest.mark.parametrize("workers, platform", [(None, "linux"), (2, "linux"), (2, "darwin")])
+def test_query_planner(ieee13_node_xml_file, monkeypatch, workers, platform):
+    monkeypatch.setattr(sys, "platform", platform)
+    tables = CimTables.from_xml(ieee13_node_xml_file)
+    queries = {
+        "distribution_buses": query_distribution_buses,
+        "line_segments": query_line_segments,
+        "loads": query_loads,
+    }
+    planner = QueryPlanner(tables, workers)
+    with planner._get_executor() as executor:
+        # forked workers are only used on Linux, threads elsewhere
+        assert isinstance(executor, ProcessPoolExecutor) == (platform == "linux")
+    results = planner.run(queries)
+
+    assert list(results) == list(queries)
+    for name, query in queries.items():
+        pd.testing.assert_frame_equal(results[name], query(tables))
+
+    stages = {stage.name: stage for stage in planner.profiler.get_report().stages}
+    assert list(stages) == list(queries)
+    for name, stage in stages.items():
+        assert stage.calls == 1
+        assert stage.count == len(results[name])
+        assert stage.wall_time > 0
@@ -1,3 +1,6 @@
+from pathlib import Path
+import json
+
 from typer.testing import CliRunner
 
 from ditto import cli
@@ -26,3 +29,100 @@ def test_convert_missing_args():
     # calling convert without required options should fail
     result = runner.invoke(cli.app, ["convert"])
     assert result.exit_code != 0
+
+
+def test_batch_read(tmp_path: Path):
+    opendss_file = (
+        Path(__file__).parent / "data" / "opendss_circuit_models" / "ieee13" / "Master.dss"
+    )
+    runner = CliRunner()
+    result = runner.invoke(
+        cli.app,
+        [
+            "batch-read",
+            "--input",
+            str(opendss_file),
+            "--output",
+            str(tmp_path),
+            "--workers",
+            "1",
+            "--merge",
+            str(tmp_path / "merged.json"),
+        ],
+    )
+    assert result.exit_code == 0
+    assert "ieee13\tok" in result.stdout
+    assert (tmp_path / "ieee13.json").exists()
+    assert (tmp_path / "merged.json").exists()
+
+
+def test_convert_cim_columnar(tmp_path: Path):
+    cim_file = Path(__file__).parent / "data" / "cim_iec_61968_13" / "IEEE13Nodeckt_CIM100x.XML"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli.app,
+        [
+            "convert",
+            "--reader",
+            "cim_iec_61968_13",
+            "--writer",
+            "opendss",
+            "--input",
+            str(cim_file),
+            "--output",
+            str(tmp_path),
+            "--query-backend",
+            "columnar",
+            "--query-workers",
+            "2",
+            "--profile-output",
+            str(tmp_path / "profile.json"),
+        ],
+    )
+    assert result.exit_code == 0
+    assert (tmp_path / "Master.dss").exists()
+    reader_report = json.loads((tmp_path / "profile.json").read_text())[0]
+    assert [stage["name"] for stage in reader_report["stages"]] == ["parse", "queries"]
+
+
+def test_benchmark_case_selection(monkeypatch):
+    def get_selected_cases(*options: str) -> list[tuple[str, int]]:
+        selected = []
+
+        def run_benchmarks(cases, **kwargs):
+            selected.extend((c.name, c.copies) for c in cases)
+            raise RuntimeError("stop after the case selection")
+
+        monkeypatch.setattr("ditto.benchmark.run_benchmarks", run_benchmarks)
+        result = CliRunner().invoke(cli.app, ["benchmark", "--copies", "2", *options])
+        assert isinstance(result.exception, RuntimeError)
+        return selected
+
+    assert get_selected_cases("--case", "P4U") == [("P4U", 1)]
+    assert get_selected_cases("--case", "P4U", "--scale-case", "ieee13") == [
+        ("P4U", 1),
+        ("ieee13", 2),
+    ]
+    assert ("ieee13", 2) in get_selected_cases()
+
+
+def test_generate_unsupported_reader(tmp_path: Path):
+    opendss_file = (
+        Path(__file__).parent / "data" / "opendss_circuit_models" / "ieee13" / "Master.dss"
+    )
+    result = CliRunner().invoke(
+        cli.app,
+        [
+            "generate",
+            "--reader",
+            "gdm",
+            "--input",
+            str(opendss_file),
+            "--output",
+            str(tmp_path),
+            "--copies",
+            "2",
+        ],
+    )
+    assert result.exit_code == 2
+    assert not list(tmp_path.iterdir())
@@ -1,10 +1,15 @@
 """Module for testing parsers."""
 
+from collections import Counter
 from pathlib import Path
 
+from gdm.distribution.components import DistributionBus, DistributionLoad
 import pytest
 
+from ditto.readers.opendss.cache import ParseCache, get_input_files
+from ditto.readers.opendss.batch import BatchReader
 from ditto.readers.opendss.reader import Reader
+from ditto.enumerations import ValidationMode
 
 
 base_path = Path(__file__).parents[1]
@@ -26,4 +31,191 @@ def test_serialize_opendss_model(opendss_file: Path, fixed_tmp_path):
     assert json_path.exists(), "Failed to export the json file"
 
 
+@pytest.mark.parametrize(
+    "validation_mode, validation_workers",
+    [
+        (ValidationMode.SAMPLED, None),
+        (ValidationMode.DEFERRED, None),
+        (ValidationMode.DEFERRED, 2),
+        (ValidationMode.OFF, None),
+    ],
+)
+def test_reader_validation_modes(validation_mode, validation_workers):
+    opendss_file = opendss_circuit_models / "ieee13" / "Master.dss"
+    system = Reader(opendss_file).get_system()
+    parser = Reader(
+        opendss_file,
+        validation_mode=validation_mode,
+        validation_sample_size=2,
+        validation_workers=validation_workers,
+    )
+    assert not parser._deferred_components
+    assert not parser.validation_errors
+    assert Counter(type(c) for c in parser.get_system().iter_all_components()) == Counter(
+        type(c) for c in system.iter_all_components()
+    )
+
+
+INVALID_CIRCUIT = """
+    clear
+    new Circuit.test bus1=bus_1 BasekV=12.47 pu=1.0
+    new line.line_1 bus1=bus_1 bus2=bus_2 phases=3 length=1
+    new load.load_1 bus1=bus_2 phases=3 kv=12.47 kw=10 kvar=2
+    new capacitor.cap_1 bus1=bus_2 phases=3 kv=12.47 kvar=-100
+    set voltagebases=[12.47]
+    calcvoltagebases
+"""
+
+
+@pytest.mark.parametrize(
+    "validation_mode, validation_workers",
+    [
+        (ValidationMode.SAMPLED, None),
+        (ValidationMode.DEFERRED, None),
+        (ValidationMode.DEFERRED, 2),
+    ],
+)
+def test_reader_validation_errors(
+    tmp_path: Path, monkeypatch, validation_mode, validation_workers
+):
+    opendss_file = tmp_path / "Master.dss"
+    opendss_file.write_text(INVALID_CIRCUIT)
+    with pytest.raises(Exception, match="Validations errors"):
+        Reader(
+            opendss_file, validation_mode=validation_mode, validation_workers=validation_workers
+        )
+
+    # collect the errors without raising to compare them with full validation
+    monkeypatch.setattr(Reader, "_validate_model", lambda self: None)
+    expected = Reader(opendss_file).validation_errors
+    assert expected
+    assert all(row[:2] == ["cap_1", "DistributionCapacitor"] for row in expected)
+    parser = Reader(
+        opendss_file, validation_mode=validation_mode, validation_workers=validation_workers
+    )
+    assert sorted(parser.validation_errors) == sorted(expected)
+
+
+LOADSHAPE_CIRCUIT = """
+    clear
+    new Circuit.test bus1=bus_1 BasekV=12.47 pu=1.0
+    new LoadShape.shape_1 npts=4 sinterval=900 mult=[0.2 0.4 0.8 1.0] qmult=[0.1 0.2 0.3 0.4]
+    new line.line_1 bus1=bus_1 bus2=bus_2 phases=3 length=1
+    new load.load_1 bus1=bus_2 phases=3 kv=12.47 kw=10 kvar=2 yearly=shape_1 daily=shape_1
+    new load.load_2 bus1=bus_2 phases=3 kv=12.47 kw=20 kvar=3 yearly=shape_1
+    set voltagebases=[12.47]
+    calcvoltagebases
+"""
+
+
+def test_reader_topology_only(tmp_path: Path):
+    opendss_file = tmp_path / "Master.dss"
+    opendss_file.write_text(LOADSHAPE_CIRCUIT.replace("    calcvoltagebases\n", ""))
+    parser = Reader(opendss_file, topology_only=True)
+    assert set(parser.read_timings) == {
+        "compile",
+        "voltage_bases",
+        "extract",
+        "split_phase",
+        "validation",
+    }
+    system = parser.get_system()
+    assert len(list(system.get_components(DistributionLoad))) == 2
+    for bus in system.get_components(DistributionBus):
+        assert bus.rated_voltage.to("kilovolt").magnitude == pytest.approx(12.47 / 3**0.5)
+
+
+def test_reader_streamed_time_series(tmp_path: Path):
+    opendss_file = tmp_path / "Master.dss"
+    opendss_file.write_text(LOADSHAPE_CIRCUIT)
+    time_series_directory = tmp_path / "time_series"
+    time_series_directory.mkdir()
+    parser = Reader(
+        opendss_file, stream_time_series=True, time_series_directory=time_series_directory
+    )
+    system = parser.get_system()
+    loads = list(system.get_components(DistributionLoad))
+    assert len(loads) == 2
+    for load in loads:
+        metadata = system.list_time_series_metadata(load)
+        assert {m.features["profile_type"] for m in metadata} == {"PMult", "QMult"}
+        assert all(m.length == 4 for m in metadata)
+    assert len(list(time_series_directory.rglob("*.arrow"))) == 2
+
+
+def test_reader_parse_cache(tmp_path: Path):
+    opendss_file = tmp_path / "Master.dss"
+    master, loads = LOADSHAPE_CIRCUIT.split("    new load.load_1")
+    opendss_file.write_text(master + "    redirect Loads.dss\n")
+    loads_file = tmp_path / "Loads.dss"
+    loads_file.write_text("new load.load_1" + loads)
+    cache_directory = tmp_path / "cache"
+
+    parser = Reader(opendss_file, cache_directory=cache_directory)
+    assert not parser.cache_hit
+    assert loads_file.resolve() in get_input_files(opendss_file)
+    cached_parser = Reader(opendss_file, cache_directory=cache_directory)
+    assert cached_parser.cache_hit
+    parser = Reader(opendss_file, cache_directory=cache_directory, validation_mode="off")
+    assert not parser.cache_hit
+    system = cached_parser.get_system()
+    assert {load.name for load in system.get_components(DistributionLoad)} == {
+        "load_1",
+        "load_2",
+    }
+    assert all(
+        len(system.list_time_series_metadata(load)) == 2
+        for load in system.get_components(DistributionLoad)
+    )
+
+    loads_file.write_text(loads_file.read_text().replace("kw=20", "kw=25"))
+    parser = Reader(opendss_file, cache_directory=cache_directory, cache_max_size_mb=0)
+    assert not parser.cache_hit
+    assert not ParseCache(cache_directory).size_mb()
+
+
+def test_batch_reader(tmp_path: Path):
+    for feeder_name in ["feeder_1", "feeder_2"]:
+        (tmp_path / feeder_name).mkdir()
+        (tmp_path / feeder_name / "Master.dss").write_text(LOADSHAPE_CIRCUIT)
+    parser = BatchReader(
+        str(tmp_path / "*" / "Master.dss"), workers=2, export_directory=tmp_path / "gdm"
+    )
+    assert not parser.errors
+    assert set(parser.timings) == {"feeder_1", "feeder_2"}
+    assert (tmp_path / "gdm" / "feeder_1.json").exists()
+    feeder_system = parser.get_systems()["feeder_2"]
+    system = parser.get_system()
+    # clashing components are copied, the feeder systems are left unchanged
+    assert {load.name for load in feeder_system.get_components(DistributionLoad)} == {
+        "load_1",
+        "load_2",
+    }
+    loads = list(system.get_components(DistributionLoad))
+    assert {load.name for load in loads} == {
+        "load_1",
+        "load_2",
+        "feeder_2__load_1",
+        "feeder_2__load_2",
+    }
+    for load in loads:
+        metadata = system.list_time_series_metadata(load)
+        assert {m.features["profile_type"] for m in metadata} == {"PMult", "QMult"}
+
+
+INVALID_CAPACITOR = "    new capacitor.cap_1 bus1=bus_2 phases=3 kv=12.47 kvar=-100\n"
+
+
+def test_batch_reader_invalid_feeder(tmp_path: Path):
+    for feeder_name in ["feeder_1", "feeder_2", "feeder_3"]:
+        (tmp_path / feeder_name).mkdir()
+        (tmp_path / feeder_name / "Master.dss").write_text(LOADSHAPE_CIRCUIT)
+    with open(tmp_path / "feeder_1" / "Master.dss", "a") as f:
+        f.write(INVALID_CAPACITOR)
+    # a single worker reads every feeder, errors of the first feeder must not leak
+    parser = BatchReader(str(tmp_path / "*" / "Master.dss"), workers=1)
+    assert list(parser.errors) == ["feeder_1"]
+    assert set(parser.get_systems()) == {"feeder_2", "feeder_3"}
+
+
 JSON_CASEFILES = (Path(__file__).parent.parent / "data" / "opendss_circuit_models").rglob("*.json")
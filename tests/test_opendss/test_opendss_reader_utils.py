@@ -1,6 +1,25 @@
-from infrasys import Component
-
-from ditto.readers.opendss.common import hash_model, get_equipment_from_catalog
+from gdm.distribution.equipment import MatrixImpedanceBranchEquipment
+from gdm.quantities import ResistancePULength
+from datetime import timedelta
+import subprocess
+import sys
+import os
+from infrasys import Component, System
+from opendssdirect import dss
+import numpy as np
+
+from ditto.readers.opendss.components.loadshapes import (
+    ObjectsWithProfile,
+    LOADSHAPE_DATA,
+    build_profiles,
+)
+from ditto.readers.opendss.common import (
+    get_equipment_from_catalog,
+    build_component_index,
+    ModelFingerprint,
+    query_class_data,
+    hash_model,
+)
 
 
 class MockComponent1(Component):
@@ -16,6 +35,15 @@ class MockComponent3(Component):
     field_1: list[MockComponent1]
 
 
+class MockComponent4(Component):
+    field_1: ResistancePULength
+
+
+class MockComponent5(Component):
+    field_1: float
+    field_2: set[str]
+
+
 def test_model_hash():
     model_1 = MockComponent1(field_1="test", field_2=0, name="test_1")
     model_2 = MockComponent1(field_1="test", field_2=0, name="test_2")
@@ -39,6 +67,48 @@ def test_model_hash():
     assert hash_model(model_5) != hash_model(model_6_a)
 
 
+def test_model_fingerprint():
+    fingerprint = ModelFingerprint()
+    r_matrix = np.array([[0.1, 0.01], [0.01, 0.1]])
+    model_1 = MockComponent4(field_1=ResistancePULength(r_matrix, "ohm/km"), name="test_1")
+    model_2 = MockComponent4(
+        field_1=ResistancePULength(r_matrix * (1 + 1e-15), "ohm/km"), name="test_2"
+    )
+    model_3 = MockComponent4(field_1=ResistancePULength(r_matrix, "ohm/m"), name="test_3")
+
+    assert fingerprint(model_1) == fingerprint(model_2)
+    assert fingerprint(model_1) != fingerprint(model_3)
+    assert id(model_1) in fingerprint._cache
+
+    model_1_id = id(model_1)
+    del model_1
+    assert model_1_id not in fingerprint._cache
+
+    model_4 = MockComponent5(field_1=0.3, field_2={"a", "b", "c"}, name="test_4")
+    model_5 = MockComponent5(field_1=0.1 + 0.2, field_2={"c", "b", "a"}, name="test_5")
+    model_6 = MockComponent5(field_1=0.31, field_2={"a", "b", "c"}, name="test_6")
+    assert fingerprint(model_4) == fingerprint(model_5)
+    assert fingerprint(model_4) != fingerprint(model_6)
+
+
+def test_model_fingerprint_is_stable():
+    code = (
+        "from gdm.distribution.equipment import MatrixImpedanceBranchEquipment\n"
+        "from ditto.readers.opendss.common import ModelFingerprint\n"
+        "print(ModelFingerprint()(MatrixImpedanceBranchEquipment.example()))"
+    )
+    digest = ModelFingerprint()(MatrixImpedanceBranchEquipment.example())
+    for seed in ["1", "2"]:
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert int(result.stdout.split()[-1]) == digest
+
+
 def test_model_from_catalog():
     catalog = {}
 
@@ -50,3 +120,57 @@ def test_model_from_catalog():
 
     assert len(catalog) == 1
     assert model_a == model_b
+
+
+def test_build_component_index():
+    system = System(auto_add_composed_components=True)
+    model_1 = MockComponent1(field_1="test", field_2=0, name="shared")
+    model_2 = MockComponent1(field_1="test", field_2=1, name="test_2")
+    model_3 = MockComponent2(field_1=model_2, name="shared")
+    system.add_components(model_1, model_3)
+
+    index = build_component_index(system, [MockComponent1, MockComponent2])
+    assert index == {"shared": model_1, "test_2": model_2}
+
+    index = build_component_index(system, [MockComponent2, MockComponent1])
+    assert index["shared"] is model_3
+
+
+def test_query_class_data():
+    dss(
+        """
+        clear
+        new Circuit.test bus1=bus_1 BasekV=12.47 pu=1.0
+        new xfmrcode.xc_1 windings=2 kvs=[12.47 0.48] kvas=[50 50] %rs=[0.5 0.6]
+        new xfmrcode.xc_2 windings=3 kvs=[7.2 0.12 0.12] kvas=[25 25 25]
+        """
+    )
+    xfmr_data = query_class_data("XfmrCode")
+    assert list(xfmr_data.index) == ["xc_1", "xc_2"]
+    assert xfmr_data.at["xc_1", "kvs"] == [12.47, 0.48]
+    assert xfmr_data.at["xc_1", "%rs"] == [0.5, 0.6]
+    assert len(xfmr_data.at["xc_2", "kvas"]) == 3
+    assert query_class_data("WireData").empty
+
+
+def test_shared_profile_catalog():
+    dss(
+        """
+        clear
+        new Circuit.test bus1=bus_1 BasekV=12.47 pu=1.0
+        new LoadShape.shape_1 npts=4 sinterval=900 mult=[0.2 0.4 0.8 1.0] qmult=[0.1 0.2 0.3 0.4]
+        """
+    )
+    profile_catalog = {}
+    load_profiles = build_profiles(["shape_1"], ObjectsWithProfile.LOAD, profile_catalog)
+    pv_profiles = build_profiles(["shape_1", ""], ObjectsWithProfile.PV_SYSTEM, profile_catalog)
+
+    assert set(load_profiles["shape_1"]) == {"PMult", "QMult"}
+    assert set(pv_profiles) == {"shape_1"}
+    assert len(profile_catalog[LOADSHAPE_DATA]) == 2
+
+    load_ts = load_profiles["shape_1"]["PMult"]["data"]
+    pv_ts = pv_profiles["shape_1"]["PMult"]["data"]
+    assert load_ts.resolution == pv_ts.resolution == timedelta(minutes=15)
+    assert load_ts.length == pv_ts.length == 4
+    assert load_ts.name == "active_power" and pv_ts.name == "irradiance"
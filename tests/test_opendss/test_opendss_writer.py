@@ -1,5 +1,7 @@
 """Module for testing writers."""
 
+from uuid import uuid4
+
 from gdm.distribution import DistributionSystem
 from gdm.distribution.components import (
     DistributionVoltageSource,
@@ -14,6 +16,8 @@ from gdm.distribution.components import (
 import pytest
 
 from ditto.writers.opendss.write import Writer
+from ditto.enumerations import OpenDSSFileTypes
+from ditto.writers.output_buffer import OutputBuffer
 
 MODULES = [
     DistributionVoltageSource,
@@ -44,3 +48,101 @@ def test_all_types(fixed_tmp_path):
         system.add_component(component.example())
     writer = Writer(system)
     writer.write(output_path=fixed_tmp_path, separate_substations=True, separate_feeders=True)
+
+
+def test_strict_writer_output(tmp_path):
+    system = DistributionSystem(name="test full system", auto_add_composed_components=True)
+    for component in MODULES:
+        system.add_component(component.example())
+    for strict in (True, False):
+        output_path = tmp_path / f"strict_{strict}"
+        output_path.mkdir()
+        Writer(system, strict=strict).write(
+            output_path=output_path, separate_substations=False, separate_feeders=False
+        )
+    strict_files = sorted((tmp_path / "strict_True").glob("*.dss"))
+    assert strict_files
+    for strict_file in strict_files:
+        fast_file = tmp_path / "strict_False" / strict_file.name
+        assert fast_file.read_text() == strict_file.read_text()
+
+
+def test_parallel_writer_output(tmp_path):
+    system = DistributionSystem(name="test full system", auto_add_composed_components=True)
+    for component in MODULES:
+        system.add_component(component.example())
+    for workers in (None, 2):
+        output_path = tmp_path / f"workers_{workers}"
+        output_path.mkdir()
+        Writer(system, workers=workers).write(
+            output_path=output_path, separate_substations=False, separate_feeders=False
+        )
+    serial_files = sorted((tmp_path / "workers_None").glob("*.dss"))
+    assert serial_files
+    for serial_file in serial_files:
+        parallel_file = tmp_path / "workers_2" / serial_file.name
+        assert parallel_file.read_text() == serial_file.read_text()
+
+
+def test_shared_equipment_mapped_once(tmp_path):
+    system = DistributionSystem(name="test shared equipment", auto_add_composed_components=True)
+    branch = MatrixImpedanceBranch.example()
+    other_branch = branch.model_copy(update={"name": "other_branch", "uuid": uuid4()})
+    system.add_components(branch, other_branch)
+    writer = Writer(system)
+    writer.write(output_path=tmp_path, separate_substations=False, separate_feeders=False)
+
+    line_codes = (tmp_path / OpenDSSFileTypes.LINECODES_FILE.value).read_text()
+    assert line_codes.count(branch.equipment.name) == 1
+    report = writer.get_profile_report()
+    branch_stage = next(s for s in report.stages if s.name == "MatrixImpedanceBranchMapper")
+    map_stage = next(s for s in branch_stage.stages if s.name == "map")
+    # two branches and their shared equipment
+    assert map_stage.calls == 3
+
+
+def test_separate_masters(simple_distribution_system, tmp_path, monkeypatch):
+    writer = Writer(simple_distribution_system)
+    for output_path in (tmp_path / "outside", tmp_path / "inside"):
+        output_path.mkdir()
+        if output_path.name == "inside":
+            monkeypatch.chdir(output_path)
+        writer.write(output_path=output_path, separate_substations=True, separate_feeders=True)
+
+    masters = {}
+    for output_path in (tmp_path / "outside", tmp_path / "inside"):
+        masters[output_path.name] = {
+            master_file.relative_to(output_path): master_file.read_text()
+            for master_file in output_path.rglob(OpenDSSFileTypes.MASTER_FILE.value)
+        }
+    # the masters do not depend on the working directory
+    assert masters["outside"] == masters["inside"]
+    for master in masters["outside"].values():
+        redirects = [line for line in master.splitlines() if line.startswith("redirect")]
+        assert redirects
+        assert len(redirects) == len(set(redirects))
+
+
+def test_equal_equipment_written_once(simple_distribution_system, tmp_path):
+    writer = Writer(simple_distribution_system)
+    writer.write(output_path=tmp_path, separate_substations=False, separate_feeders=False)
+
+    line_codes = (tmp_path / OpenDSSFileTypes.LINECODES_FILE.value).read_text().splitlines()
+    definitions = [line for line in line_codes if line.lower().startswith("new linecode")]
+    assert definitions
+    assert len(definitions) == len(set(definitions))
+
+
+def test_output_buffer(tmp_path):
+    first_file, second_file = tmp_path / "first.dss", tmp_path / "second.dss"
+    first_file.write_text("existing\n")
+    with OutputBuffer(max_size=10) as output:
+        output.write(first_file, "a\n")
+        output.write(second_file, "b\n")
+        assert not second_file.exists()
+        output.write(first_file, "long line\n")
+        # the size threshold flushes every buffer
+        assert second_file.read_text() == "b\n"
+        output.write(second_file, "c\n")
+    assert first_file.read_text() == "existing\na\nlong line\n"
+    assert second_file.read_text() == "b\nc\n"
@@ -3,9 +3,12 @@ import os
 
 from infrasys import NonSequentialTimeSeries
 from gdm.distribution import DistributionSystem
+import opendssdirect as odd
 from loguru import logger
+import pytest
 
 from ditto.writers.opendss.write import Writer
+from ditto.enumerations import ProfileFormat
 
 
 def test_export_opends_model_with_profiles(
@@ -57,3 +60,58 @@ def test_export_opends_model_with_discontineous_profiles(
     with open(fixed_tmp_path / "Master.dss", "r", encoding="utf-8") as file:
         content = file.read()
         return "redirect LoadShape.dss" in content
+
+
+def test_shared_profiles_written_once(
+    distribution_system_with_single_timeseries: DistributionSystem, tmp_path
+):
+    writer = Writer(distribution_system_with_single_timeseries)
+    writer.write(tmp_path, separate_substations=False, separate_feeders=False)
+
+    load_shapes = (tmp_path / "LoadShape.dss").read_text().splitlines()
+    assert [line.split()[1] for line in load_shapes] == [
+        "LoadShape.load_profile_kw",
+        "LoadShape.pv_profile",
+    ]
+    assert "QMult=" in load_shapes[0]
+    loads = (tmp_path / "Loads.dss").read_text().splitlines()
+    assert loads
+    assert all("Yearly=load_profile_kw" in line for line in loads)
+    solar = (tmp_path / "Solar.dss").read_text().splitlines()
+    assert all("Yearly=pv_profile" in line for line in solar)
+
+
+def _get_load_shapes(load_shape_file) -> dict[str, tuple[list[float], list[float]]]:
+    odd.Text.Command("clear")
+    odd.Text.Command("new Circuit.load_shapes")
+    odd.Text.Command(f"redirect {load_shape_file}")
+    load_shapes = {}
+    for name in odd.LoadShape.AllNames():
+        odd.LoadShape.Name(name)
+        load_shapes[name] = (list(odd.LoadShape.PMult()), list(odd.LoadShape.QMult()))
+    return load_shapes
+
+
+@pytest.mark.parametrize(
+    "profile_format", [ProfileFormat.CSV, ProfileFormat.SNG, ProfileFormat.DBL]
+)
+def test_export_profile_files(
+    distribution_system_with_single_timeseries: DistributionSystem, profile_format, tmp_path
+):
+    for output_format in (ProfileFormat.TEXT, profile_format):
+        output_path = tmp_path / output_format.value
+        output_path.mkdir()
+        Writer(distribution_system_with_single_timeseries).write(
+            output_path,
+            separate_substations=False,
+            separate_feeders=False,
+            profile_format=output_format,
+        )
+
+    load_shape_file = tmp_path / profile_format.value / "LoadShape.dss"
+    assert "Mult=[" not in load_shape_file.read_text()
+    # one file per time series, shared by the loads
+    assert len(list((tmp_path / profile_format.value / "profiles").iterdir())) == 3
+    assert _get_load_shapes(load_shape_file) == _get_load_shapes(
+        tmp_path / ProfileFormat.TEXT.value / "LoadShape.dss"
+    )
@@ -0,0 +1,54 @@
+from pathlib import Path
+import json
+
+from ditto.readers.opendss.reader import Reader
+from ditto.profiling import Profiler, get_peak_rss_mb
+
+
+def test_profiler(tmp_path: Path):
+    profiler = Profiler("test", trace_memory=True)
+    for _ in range(2):
+        with profiler.stage("outer"):
+            profiler.add_count(3)
+            with profiler.stage("inner"):
+                data = [0] * 1_000_000
+            del data
+
+    report = profiler.get_report()
+    assert [stage.name for stage in report.stages] == ["outer"]
+    outer = report.stages[0]
+    assert outer.calls == 2
+    assert outer.count == 6
+    assert outer.stages[0].name == "inner"
+    assert outer.stages[0].calls == 2
+    assert outer.stages[0].memory_peak_mb >= 8
+    assert outer.memory_peak_mb >= outer.stages[0].memory_peak_mb
+    assert outer.wall_time >= outer.stages[0].wall_time
+
+    json_file = tmp_path / "profile.json"
+    report.to_json(json_file)
+    assert json.loads(json_file.read_text())["stages"][0]["stages"][0]["name"] == "inner"
+
+
+def test_reader_profile_report():
+    opendss_file = (
+        Path(__file__).parent / "data" / "opendss_circuit_models" / "ieee13" / "Master.dss"
+    )
+    report = Reader(opendss_file).get_profile_report()
+    stages = {stage.name: stage for stage in report.stages}
+    assert list(stages) == ["compile", "solve", "extract", "split_phase", "validation"]
+    extract_stages = {stage.name: stage for stage in stages["extract"].stages}
+    assert extract_stages["get_buses"].count == 16
+    assert extract_stages["get_loads"].count > 0
+    assert stages["extract"].stages[0].memory_peak_mb is None
+
+
+def test_peak_rss_units(monkeypatch):
+    class Usage:
+        ru_maxrss = 2_000_000
+
+    monkeypatch.setattr("ditto.profiling.resource.getrusage", lambda _: Usage())
+    monkeypatch.setattr("sys.platform", "linux")
+    assert get_peak_rss_mb() == 2000
+    monkeypatch.setattr("sys.platform", "darwin")
+    assert get_peak_rss_mb() == 2
@@ -0,0 +1,65 @@
+from pathlib import Path
+import xml.etree.ElementTree as ET
+
+from gdm.distribution.components import DistributionBus, DistributionLoad
+import pytest
+
+from ditto.synthetic import (
+    RDF_NAMESPACE,
+    generate_opendss_model,
+    generate_cim_model,
+    get_tile_count,
+)
+from ditto.readers.opendss.reader import Reader
+
+data_directory = Path(__file__).parent / "data"
+opendss_file = data_directory / "opendss_circuit_models" / "ieee13" / "Master.dss"
+cim_file = data_directory / "cim_iec_61968_13" / "IEEE13Nodeckt_CIM100x.XML"
+
+
+def test_tile_count():
+    assert get_tile_count(101, copies=3) == 3
+    assert get_tile_count(101, target_buses=1_000_001) == 10_000
+    assert get_tile_count(101, target_buses=50) == 1
+    with pytest.raises(ValueError):
+        get_tile_count(101)
+
+
+def test_generate_opendss_model(tmp_path: Path):
+    master_file = generate_opendss_model(opendss_file, tmp_path / "a", copies=3, seed=1)
+    system = Reader(master_file).get_system()
+    seed_system = Reader(opendss_file).get_system()
+    n_buses = len(list(seed_system.get_components(DistributionBus)))
+    n_loads = len(list(seed_system.get_components(DistributionLoad)))
+    assert len(list(system.get_components(DistributionBus))) == 3 * n_buses - 2
+    assert len(list(system.get_components(DistributionLoad))) == 3 * n_loads
+
+    same_seed = generate_opendss_model(opendss_file, tmp_path / "b", copies=3, seed=1)
+    other_seed = generate_opendss_model(opendss_file, tmp_path / "c", copies=3, seed=2)
+    loads = (master_file.parent / "Load.dss").read_text()
+    assert loads == (same_seed.parent / "Load.dss").read_text()
+    assert loads != (other_seed.parent / "Load.dss").read_text()
+
+
+def test_generate_cim_model(tmp_path: Path):
+    output_file = generate_cim_model(cim_file, tmp_path / "model.xml", copies=3)
+    seed_elements = list(ET.parse(cim_file).getroot())
+    elements = list(ET.parse(output_file).getroot())
+
+    def count(elements, name):
+        return sum(1 for e in elements if e.tag.endswith(f"}}{name}"))
+
+    assert count(elements, "ConnectivityNode") == 3 * count(seed_elements, "ConnectivityNode") - 2
+    for name in ("EnergyConsumer", "ACLineSegment"):
+        assert count(elements, name) == 3 * count(seed_elements, name)
+    assert count(elements, "EnergySource") == count(seed_elements, "EnergySource")
+
+    ids = [e.get(f"{{{RDF_NAMESPACE}}}about") for e in elements]
+    assert len(ids) == len(set(ids))
+    resources = {
+        child.get(f"{{{RDF_NAMESPACE}}}resource")
+        for e in elements
+        for child in e
+        if child.get(f"{{{RDF_NAMESPACE}}}resource", "").startswith("urn:uuid:")
+    }
+    assert resources <= set(ids)